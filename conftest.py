@@ -0,0 +1,13 @@
+"""Shared test setup: no demo delays, no console output"""
+
+import pytest
+
+from demo_clock import set_time_scale
+from demo_events import use_renderer
+
+
+@pytest.fixture(autouse=True)
+def instant_demo_clock():
+    set_time_scale(0)
+    use_renderer("null")
+    yield
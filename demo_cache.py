@@ -0,0 +1,164 @@
+"""
+Tool Result Cache
+=================
+
+Async-aware memoization in front of the tool executor:
+1. Key = canonical hash of tool name + params (dict order does not matter)
+2. Entries expire after ttl_seconds; the least recently used entry is
+   evicted once max_entries is reached
+3. Concurrent identical calls are coalesced: one real call, many waiters
+4. Expired entries are kept (until evicted) as a stale fallback when the
+   real call fails - "Gather cached data if available"
+5. If the caller running the real call is cancelled (its own deadline,
+   an interrupt), the waiters from other sessions are not: they fall
+   through and one of them runs the call again
+
+Only successful results are cached.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+from demo_clock import clock
+
+
+def cache_key(tool_name: str, params: Dict[str, Any]) -> str:
+    """Stable hash of a tool call, independent of param ordering"""
+    canonical = json.dumps([tool_name, params], sort_keys=True,
+                           separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FetchAbandoned(Exception):
+    """Set on a coalesced call whose owner was cancelled"""
+
+
+class CacheEntry:
+    """A cached tool result and the time it was stored"""
+
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Dict[str, Any], stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class ToolResultCache:
+    """TTL + LRU cache of tool results with in-flight request coalescing"""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024,
+                 max_stale_seconds: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_stale_seconds = max_stale_seconds
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: str, max_age: Optional[float]) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if max_age is not None and clock.now() - entry.stored_at > max_age:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, tool_name: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fresh cached result, or None (does not touch the counters)"""
+        entry = self._lookup(cache_key(tool_name, params), self.ttl_seconds)
+        return entry.value if entry else None
+
+    def put(self, tool_name: str, params: Dict[str, Any], value: Dict[str, Any]):
+        self._store(cache_key(tool_name, params), value)
+
+    def _store(self, key: str, value: Dict[str, Any]):
+        self._entries[key] = CacheEntry(value, clock.now())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, tool_name: str, params: Dict[str, Any]):
+        self._entries.pop(cache_key(tool_name, params), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def call(self, tool_name: str, params: Dict[str, Any],
+                   fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Return a cached result or run ``fetch`` once for all concurrent callers"""
+        key = cache_key(tool_name, params)
+
+        entry = self._lookup(key, self.ttl_seconds)
+        if entry is not None:
+            self.hits += 1
+            return dict(entry.value, cached=True)
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return dict(await asyncio.shield(pending))
+            except FetchAbandoned:
+                return await self.call(tool_name, params, fetch)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fetch()
+            if result.get("success"):
+                self._store(key, result)
+            else:
+                result = self._stale_or(key, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Only the owner was cancelled; waiters run the call themselves
+            future.set_exception(FetchAbandoned(tool_name))
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark retrieved so the loop does not warn
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def _stale_or(self, key: str, failure: Dict[str, Any]) -> Dict[str, Any]:
+        entry = self._lookup(key, self.max_stale_seconds)
+        if entry is None:
+            return failure
+        self.stale_served += 1
+        return dict(entry.value, cached=True, stale=True,
+                    stale_age_seconds=clock.now() - entry.stored_at,
+                    masked_error=failure.get("error"),
+                    masked_error_code=failure.get("error_code"))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
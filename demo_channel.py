@@ -0,0 +1,512 @@
+"""
+Non-Blocking Human Response Channel
+===================================
+
+Awaitable human-in-loop interventions that never block the event loop:
+1. Each intervention request is backed by an asyncio future
+2. A pluggable responder (terminal, handler, file, local socket) resolves it
+3. The intervention timeout is enforced without blocking other sessions
+4. Optionally, every decision is appended to an InterventionJournal
+5. Optionally, a ResolutionPolicy answers known (tool, error_code)
+   signatures immediately and learns from the human answers to the rest
+
+One session waiting on a human costs nothing to the others.
+
+Terminal answers come from one shared stdin reader (StdinReader), never
+from a blocking input() in a worker thread: a prompt that times out
+leaves nothing behind that could swallow the answer to the next prompt
+or keep asyncio.run() waiting for Enter at shutdown.
+"""
+
+import asyncio
+import builtins
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from enum import Enum
+from typing import Dict, Any, Callable, List, Optional
+
+from demo_policy import failure_signature
+from demo_tracing import tracer
+
+
+def context_to_dict(context: Any) -> Dict[str, Any]:
+    """Convert an InterventionContext into a JSON-serializable dict"""
+    fields = ("intervention_type", "original_query", "failed_step", "error_message",
+              "current_plan", "completed_steps", "session_id")
+    data = {}
+    for name in fields:
+        value = getattr(context, name, None)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, Mapping) and not isinstance(value, dict):
+            value = dict(value)  # StepRecord
+        data[name] = value
+    return data
+
+
+class StdinReader:
+    """Line reader for a file descriptor that never blocks the event loop
+
+    Uses loop.add_reader() where the descriptor supports it and a single
+    daemon thread otherwise (regular files, Windows consoles). Lines are
+    buffered, so a cancelled read loses nothing and typed-ahead or piped
+    answers reach the following prompts in order.
+    """
+
+    def __init__(self, fd: Optional[int] = None):
+        self._fd = fd
+        self._lines: deque = deque()
+        self._partial = b""
+        self._eof = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def fd(self) -> int:
+        return self._fd if self._fd is not None else sys.stdin.fileno()
+
+    def _attach(self):
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._ready = asyncio.Event()
+        if self._thread is not None:
+            return
+        try:
+            loop.add_reader(self.fd, self._on_readable)
+        except (NotImplementedError, PermissionError, ValueError, OSError):
+            self._thread = threading.Thread(target=self._read_forever, name="stdin-reader", daemon=True)
+            self._thread.start()
+
+    def _feed(self, data: bytes):
+        if not data:
+            self._eof = True
+            if self._partial:
+                self._lines.append(self._partial.decode(errors="replace"))
+                self._partial = b""
+            return
+        self._partial += data
+        *lines, self._partial = self._partial.split(b"\n")
+        self._lines.extend(line.decode(errors="replace").rstrip("\r") for line in lines)
+
+    def _on_readable(self):
+        data = os.read(self.fd, 4096)
+        if not data:
+            self._loop.remove_reader(self.fd)
+        self._feed(data)
+        self._ready.set()
+
+    def _read_forever(self):
+        while not self._eof:
+            self._feed(os.read(self.fd, 4096))
+            loop, ready = self._loop, self._ready
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # That loop is closed; the next readline() picks the lines up
+
+    async def readline(self) -> str:
+        """Next line without its newline; EOFError at end of input"""
+        self._attach()
+        while not self._lines:
+            if self._eof:
+                raise EOFError
+            self._ready.clear()
+            await self._ready.wait()
+        return self._lines.popleft()
+
+
+stdin_lines = StdinReader()
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() that waits on the event loop, and can be cancelled"""
+    print(prompt, end="", flush=True)
+    return await stdin_lines.readline()
+
+
+class _HandlerCall:
+    """A synchronous handler running in its own thread, reading stdin via the loop"""
+
+    __slots__ = ("loop", "pending", "abandoned")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.pending = None
+        self.abandoned = False
+
+
+_handler_calls = threading.local()
+_builtin_input = builtins.input
+_input_lock = threading.Lock()
+_input_users = 0  # Open HandlerResponders; builtins.input is rerouted while any exist
+_original_input: Optional[Callable[..., str]] = None
+
+
+def _install_input():
+    global _input_users, _original_input
+    with _input_lock:
+        if _input_users == 0:
+            _original_input = builtins.input
+            builtins.input = _handler_input
+        _input_users += 1
+
+
+def _restore_input():
+    global _input_users, _original_input
+    with _input_lock:
+        _input_users -= 1
+        if _input_users == 0:
+            if builtins.input is _handler_input:
+                builtins.input = _original_input
+            _original_input = None
+
+
+def _handler_input(prompt: str = "") -> str:
+    """input() for handler threads: reads through stdin_lines, so it can be abandoned
+
+    Any other thread gets the input() that was installed before.
+    """
+    call = getattr(_handler_calls, "call", None)
+    if call is None:
+        return (_original_input or _builtin_input)(prompt)
+    if call.abandoned:
+        raise EOFError("intervention request was abandoned")
+    print(prompt, end="", flush=True)
+    answer: concurrent.futures.Future = concurrent.futures.Future()
+
+    def start():
+        if call.abandoned:
+            answer.set_exception(EOFError("intervention request was abandoned"))
+            return
+        call.pending = asyncio.ensure_future(stdin_lines.readline())
+        call.pending.add_done_callback(lambda task: _transfer(task, answer))
+
+    try:
+        call.loop.call_soon_threadsafe(start)
+    except RuntimeError:
+        raise EOFError("event loop closed") from None
+    return answer.result()
+
+
+def _transfer(task: asyncio.Task, answer: concurrent.futures.Future):
+    if task.cancelled():
+        answer.set_exception(EOFError("intervention request was abandoned"))
+    elif task.exception() is not None:
+        answer.set_exception(task.exception())
+    else:
+        answer.set_result(task.result())
+
+
+class InterventionRequest:
+    """A pending request for a human decision"""
+
+    __slots__ = ("request_id", "context", "created_at", "future")
+
+    def __init__(self, request_id: str, context: Any, future: asyncio.Future):
+        self.request_id = request_id
+        self.context = context
+        self.created_at = time.time()
+        self.future = future
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "created_at": self.created_at,
+            "context": context_to_dict(self.context)
+        }
+
+
+class Responder:
+    """Base class for anything that can answer an intervention request"""
+
+    async def respond(self, request: InterventionRequest) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class HandlerResponder(Responder):
+    """Runs a synchronous HumanInLoopHandler method in its own thread
+
+    The handler's input() calls read through stdin_lines; when the request
+    is cancelled (e.g. it timed out) a pending read is cancelled too and
+    the handler sees EOFError instead of holding on to stdin. input() is
+    rerouted only in handler threads, and only until close().
+    """
+
+    def __init__(self, handler: Any, method: str = "handle_tool_failure"):
+        self.handler = handler
+        self.method = method
+        self._lock = asyncio.Lock()
+        self._closed = False
+        _install_input()
+
+    def _run(self, call: _HandlerCall, context: Any, done: asyncio.Future):
+        _handler_calls.call = call
+        try:
+            outcome = (done.set_result, getattr(self.handler, self.method)(context))
+        except BaseException as exc:
+            outcome = (done.set_exception, exc)
+        finally:
+            _handler_calls.call = None
+
+        def deliver():
+            if not done.done():
+                outcome[0](outcome[1])
+        try:
+            call.loop.call_soon_threadsafe(deliver)
+        except RuntimeError:
+            pass  # Loop already closed; nobody is waiting
+
+    async def respond(self, request: InterventionRequest) -> Dict[str, Any]:
+        # The handler prompts on the terminal; one prompt at a time
+        async with self._lock:
+            with tracer.span(f"HumanInLoopHandler.{self.method}", "handler"):
+                loop = asyncio.get_running_loop()
+                call = _HandlerCall(loop)
+                done = loop.create_future()
+                # A daemon thread, not to_thread(): an abandoned handler must not delay shutdown
+                threading.Thread(target=self._run, args=(call, request.context, done),
+                                 name=f"handler-{request.request_id}", daemon=True).start()
+                try:
+                    return await done
+                except asyncio.CancelledError:
+                    call.abandoned = True
+                    if call.pending is not None:
+                        call.pending.cancel()
+                    raise
+
+    async def close(self):
+        if not self._closed:
+            self._closed = True
+            _restore_input()
+
+
+class TerminalResponder(Responder):
+    """Asks the operator on the terminal without blocking the event loop"""
+
+    ACTIONS = {"1": "alternative", "2": "skip", "3": "abort", "4": "retry"}
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    async def respond(self, request: InterventionRequest) -> Dict[str, Any]:
+        context = context_to_dict(request.context)
+        async with self._lock:
+            print(f"\n🚨 Intervention {request.request_id} (session {context['session_id']})")
+            print(f"Error: {context['error_message']}")
+            print("  1. Provide alternative approach")
+            print("  2. Skip this step and continue")
+            print("  3. Abort execution")
+            print("  4. Retry with modifications")
+            choice = (await ainput("\n👤 Your choice [1-4]: ")).strip()
+            action = self.ACTIONS.get(choice, "abort")
+
+            decision: Dict[str, Any] = {"action": action}
+            if action == "alternative":
+                decision["alternative_approach"] = (await ainput("💡 Alternative approach: ")).strip()
+            elif action == "retry":
+                decision["modifications"] = (await ainput("🔄 Modifications: ")).strip()
+            return decision
+
+
+class FileResponder(Responder):
+    """Exchanges requests and decisions as JSON files in a directory
+
+    Writes ``<request_id>.request.json`` and waits for an operator (or
+    another process) to drop ``<request_id>.response.json`` next to it.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 0.25):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, request_id: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{request_id}.{kind}.json")
+
+    async def respond(self, request: InterventionRequest) -> Dict[str, Any]:
+        request_path = self._path(request.request_id, "request")
+        response_path = self._path(request.request_id, "response")
+
+        with open(request_path, "w") as f:
+            json.dump(request.to_dict(), f, indent=2, default=str)
+
+        try:
+            while not os.path.exists(response_path):
+                await asyncio.sleep(self.poll_interval)
+            with open(response_path) as f:
+                return json.load(f)
+        finally:
+            for path in (request_path, response_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class SocketResponder(Responder):
+    """Serves pending requests to operators over a local TCP socket
+
+    An operator connects (e.g. ``nc 127.0.0.1 <port>``), receives every
+    pending request as a JSON line and answers with JSON lines of the form
+    ``{"request_id": ..., "action": ..., ...}``.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._requests: Dict[str, InterventionRequest] = {}
+        self._writers: List[asyncio.StreamWriter] = []
+
+    async def start(self) -> int:
+        """Start listening and return the bound port"""
+        if self._server is None:
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def _send(self, writer: asyncio.StreamWriter, payload: Dict[str, Any]):
+        writer.write((json.dumps(payload, default=str) + "\n").encode())
+        await writer.drain()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.append(writer)
+        try:
+            for request in list(self._requests.values()):
+                await self._send(writer, request.to_dict())
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    decision = json.loads(line)
+                except json.JSONDecodeError:
+                    await self._send(writer, {"error": "invalid JSON"})
+                    continue
+
+                future = self._pending.get(decision.pop("request_id", None))
+                if future is None or future.done():
+                    await self._send(writer, {"error": "unknown or resolved request_id"})
+                    continue
+                future.set_result(decision)
+        finally:
+            self._writers.remove(writer)
+            writer.close()
+
+    async def respond(self, request: InterventionRequest) -> Dict[str, Any]:
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request.request_id] = future
+        self._requests[request.request_id] = request
+
+        for writer in list(self._writers):
+            await self._send(writer, request.to_dict())
+
+        try:
+            return await future
+        finally:
+            self._pending.pop(request.request_id, None)
+            self._requests.pop(request.request_id, None)
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+class HumanChannel:
+    """Awaitable intervention API shared by all sessions on one event loop"""
+
+    def __init__(self, responder: Responder, timeout_seconds: float = 300,
+                 timeout_action: str = "abort", journal: Optional[Any] = None,
+                 policy: Optional[Any] = None):
+        self.responder = responder
+        self.journal = journal
+        self.policy = policy
+        self.timeout_seconds = timeout_seconds
+        self.timeout_action = timeout_action
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, InterventionRequest] = {}
+
+    def pending(self) -> List[InterventionRequest]:
+        """Requests still waiting on a human"""
+        return list(self._pending.values())
+
+    def resolve(self, request_id: str, decision: Dict[str, Any]) -> bool:
+        """Resolve a pending request directly (e.g. from another task)"""
+        request = self._pending.get(request_id)
+        if request is None or request.future.done():
+            return False
+        request.future.set_result(decision)
+        return True
+
+    async def _drive_responder(self, request: InterventionRequest):
+        try:
+            decision = await self.responder.respond(request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+            return
+        if not request.future.done():
+            request.future.set_result(decision)
+
+    async def _record(self, context: Any, decision: Dict[str, Any], wait_seconds: float) -> Dict[str, Any]:
+        if self.journal is None:
+            return decision
+        # Caller reports the outcome later via journal.amark_outcome(journal_id, ...)
+        return dict(decision, journal_id=await self.journal.arecord_context(
+            context, decision, wait_seconds=wait_seconds
+        ))
+
+    async def request_intervention(self, context: Any, timeout_seconds: Optional[float] = None,
+                                   error_code: Optional[str] = None) -> Dict[str, Any]:
+        """Wait for a human decision without blocking other sessions
+
+        With a policy, known failure signatures are answered at once
+        (the decision carries ``auto_resolved``) and never reach a human.
+        """
+        if self.policy is not None:
+            tool, error_code = failure_signature(context, error_code)
+            decision = self.policy.resolve(tool, error_code)
+            if decision is not None:
+                return await self._record(context, decision, wait_seconds=0.0)
+
+        session_id = getattr(context, "session_id", None) or "session"
+        started = time.monotonic()
+        request_id = f"{session_id}-{next(self._ids)}"
+        request = InterventionRequest(request_id, context, asyncio.get_running_loop().create_future())
+        self._pending[request_id] = request
+
+        with tracer.span("human_decision", "human", session=session_id):
+            responder_task = asyncio.create_task(self._drive_responder(request))
+            timeout = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+            try:
+                decision = await asyncio.wait_for(request.future, timeout=timeout)
+            except asyncio.TimeoutError:
+                decision = {"action": self.timeout_action, "timed_out": True}
+            finally:
+                responder_task.cancel()
+                self._pending.pop(request_id, None)
+
+        if self.policy is not None:
+            self.policy.observe(tool, error_code, decision)
+        return await self._record(context, decision, wait_seconds=time.monotonic() - started)
+
+    async def close(self):
+        await self.responder.close()
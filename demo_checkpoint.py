@@ -0,0 +1,153 @@
+"""
+Session Checkpoints
+===================
+
+Lets an in-flight session survive a process restart:
+1. A SessionCheckpoint holds what the session would otherwise keep in
+   local variables - its phase, plan, completed step results and the
+   pending (or decided) intervention - as plain JSON
+2. Large step outputs (NumPy arrays) travel next to it as one
+   compressed .npz blob
+3. CheckpointStore keeps the latest checkpoint per session in SQLite
+   (WAL); every save replaces the previous one in a single transaction,
+   so a crash leaves either the old or the new checkpoint, never half
+4. Sessions save at every step boundary and at every intervention
+   state change; a resumed session binds the stored step results
+   instead of re-running those tools (see ResultStore in demo_dag.py)
+
+    store = CheckpointStore("checkpoints.db")
+    store.save(checkpoint, arrays=pipeline.state())
+    checkpoint = store.load("demo-plan-failure-001")
+"""
+
+import io
+import json
+import sqlite3
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    session_id TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    phase TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    arrays BLOB
+);
+"""
+
+# Session phases, in order
+PHASES = ("executing", "awaiting_human", "recovering", "complete")
+
+
+def pack_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def unpack_arrays(blob: Optional[bytes]) -> Dict[str, np.ndarray]:
+    if not blob:
+        return {}
+    with np.load(io.BytesIO(blob), allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+class SessionCheckpoint:
+    """Serializable state of one session at a step boundary"""
+
+    __slots__ = ("session_id", "phase", "query", "plan", "results", "completed_steps",
+                 "intervention", "data", "updated_at")
+
+    def __init__(self, session_id: str, phase: str = "executing", query: str = "",
+                 plan: Optional[List[str]] = None, results: Optional[Dict[str, Dict[str, Any]]] = None,
+                 completed_steps: Optional[List[str]] = None,
+                 intervention: Optional[Dict[str, Any]] = None,
+                 data: Optional[Dict[str, Any]] = None, updated_at: Optional[float] = None):
+        self.session_id = session_id
+        self.phase = phase
+        self.query = query
+        self.plan = list(plan or [])
+        self.results = dict(results or {})  # ResultStore key -> step result
+        self.completed_steps = list(completed_steps or [])
+        self.intervention = intervention  # context, suggestions and, once made, the decision
+        self.data = dict(data or {})  # Anything else the session needs back
+        self.updated_at = updated_at
+
+    def reached(self, phase: str) -> bool:
+        """Whether the session got at least as far as ``phase``"""
+        return PHASES.index(self.phase) >= PHASES.index(phase)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionCheckpoint":
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+
+class CheckpointStore:
+    """Latest checkpoint per session, in SQLite"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self.saves = 0
+
+    def save(self, checkpoint: SessionCheckpoint, arrays: Optional[Dict[str, np.ndarray]] = None):
+        """Replace the session's checkpoint; arrays=None keeps the stored ones"""
+        if checkpoint.phase not in PHASES:
+            raise ValueError(f"Unknown session phase '{checkpoint.phase}'")
+        checkpoint.updated_at = time.time()
+        payload = json.dumps(checkpoint.to_dict(), default=str)
+        with self._db:
+            if arrays is None:
+                self._db.execute(
+                    "INSERT INTO checkpoints(session_id, ts, phase, payload) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET ts = excluded.ts, "
+                    "phase = excluded.phase, payload = excluded.payload",
+                    (checkpoint.session_id, checkpoint.updated_at, checkpoint.phase, payload)
+                )
+            else:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                    (checkpoint.session_id, checkpoint.updated_at, checkpoint.phase, payload,
+                     pack_arrays(arrays) if arrays else None)
+                )
+        self.saves += 1
+
+    def load(self, session_id: str) -> Optional[SessionCheckpoint]:
+        row = self._db.execute("SELECT payload FROM checkpoints WHERE session_id = ?",
+                               (session_id,)).fetchone()
+        return SessionCheckpoint.from_dict(json.loads(row[0])) if row else None
+
+    def arrays(self, session_id: str) -> Dict[str, np.ndarray]:
+        row = self._db.execute("SELECT arrays FROM checkpoints WHERE session_id = ?",
+                               (session_id,)).fetchone()
+        return unpack_arrays(row[0]) if row else {}
+
+    def sessions(self, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Checkpointed sessions, most recent first"""
+        sql = "SELECT session_id, phase, ts, length(payload) + ifnull(length(arrays), 0) FROM checkpoints"
+        params: tuple = ()
+        if phase is not None:
+            sql += " WHERE phase = ?"
+            params = (phase,)
+        rows = self._db.execute(sql + " ORDER BY ts DESC", params).fetchall()
+        return [{"session_id": sid, "phase": ph, "updated_at": ts, "bytes": size}
+                for sid, ph, ts, size in rows]
+
+    def delete(self, session_id: str) -> bool:
+        with self._db:
+            cursor = self._db.execute("DELETE FROM checkpoints WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0
+
+    def close(self):
+        self._db.close()
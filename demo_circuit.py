@@ -0,0 +1,95 @@
+"""
+Per-Tool Circuit Breaker
+========================
+
+Classic three-state breaker used by the tool executor to stop calling a
+failing tool and route straight to its fallback:
+
+    CLOSED    -> calls pass; consecutive failures are counted
+    OPEN      -> calls are rejected until reset_timeout has passed
+    HALF_OPEN -> a limited number of trial calls decide CLOSED vs OPEN
+
+The reset window is nominal seconds: it runs on the monotonic clock,
+scaled by DEMO_TIME_SCALE like every other delay (30s is 3 real seconds
+at scale 0.1 and elapses at once at scale 0), so it keeps moving while
+every call short-circuits. Pass ``clock`` (a callable returning
+seconds) to measure the window, unscaled, on another clock.
+"""
+
+from enum import Enum
+from typing import Callable, Dict, Any, Optional
+
+from demo_clock import clock as demo_clock
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Tracks failures of a single tool and decides whether to call it"""
+
+    __slots__ = ("failure_threshold", "reset_timeout", "half_open_max_calls",
+                 "_clock", "_scaled", "_state", "_failures", "_opened_at", "_trial_calls", "times_opened")
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Optional[Callable[[], float]] = None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock or demo_clock.now
+        self._scaled = clock is None
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self.times_opened = 0
+
+    def _window(self) -> float:
+        """reset_timeout in seconds of the breaker's clock"""
+        return demo_clock.scaled(self.reset_timeout) if self._scaled else self.reset_timeout
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._window():
+            self._state = CircuitState.HALF_OPEN
+            self._trial_calls = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """True if the tool may be called now"""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+            self._trial_calls += 1
+            return True
+        return False
+
+    def record_success(self):
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._trial_calls = 0
+
+    def record_failure(self):
+        if self._state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._trial_calls = 0
+        self.times_opened += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened
+        }
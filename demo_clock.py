@@ -0,0 +1,103 @@
+"""
+Demo Clock: Time Compression for Demo Drivers
+=============================================
+
+Every pause in the demo scripts goes through one shared clock so the
+same scenario can be recorded in real time or replayed instantly:
+
+    time_scale = 1.0  -> real time (screen recording)
+    time_scale = 0.0  -> no delays (CI, regression and load runs)
+
+The default scale comes from the DEMO_TIME_SCALE environment variable:
+
+    DEMO_TIME_SCALE=0 python3 youtube_demo_automated.py
+
+Durations reported by the demos (e.g. recovery time) are nominal seconds
+from a SessionTimer, which can continue from the value a checkpoint saved.
+A timer counts only the sleeps of the task that started it and of the
+tasks that task spawns afterwards, so concurrent sessions never add to
+each other's time (sleeps of parallel steps each count).
+"""
+
+import asyncio
+import os
+import time
+from contextvars import ContextVar
+from typing import Tuple
+
+
+class DemoClock:
+    """Scales every demo delay by a single time factor"""
+
+    def __init__(self, time_scale: float = 1.0):
+        self.time_scale = time_scale
+
+    @property
+    def time_scale(self) -> float:
+        return self._time_scale
+
+    @time_scale.setter
+    def time_scale(self, value: float):
+        if value < 0:
+            raise ValueError(f"time_scale must be >= 0, got {value}")
+        self._time_scale = float(value)
+
+    def scaled(self, seconds: float) -> float:
+        """Wall-clock duration of a nominal delay"""
+        return seconds * self._time_scale
+
+    async def sleep(self, seconds: float):
+        """Async pause; still yields to the event loop at scale 0"""
+        _count(seconds)
+        await asyncio.sleep(seconds * self._time_scale)
+
+    def sleep_sync(self, seconds: float):
+        """Blocking pause for code outside the event loop"""
+        _count(seconds)
+        delay = seconds * self._time_scale
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def now() -> float:
+        """Monotonic timestamp in real seconds"""
+        return time.perf_counter()
+
+
+class SessionTimer:
+    """Nominal seconds a session has run, continuable across restarts"""
+
+    __slots__ = ("_offset", "_slept")
+
+    def __init__(self, offset: float = 0.0):
+        self._offset = offset  # Elapsed seconds saved before a restart
+        self._slept = 0.0
+        _timers.set(_timers.get() + (self,))
+
+    def elapsed(self) -> float:
+        return self._offset + self._slept
+
+
+# Timers of the current session; tasks inherit them when spawned
+_timers: ContextVar[Tuple[SessionTimer, ...]] = ContextVar("demo_session_timers", default=())
+
+
+def _count(seconds: float):
+    for timer in _timers.get():
+        timer._slept += seconds
+
+
+def _default_time_scale() -> float:
+    try:
+        return max(0.0, float(os.environ.get("DEMO_TIME_SCALE", "1.0")))
+    except ValueError:
+        return 1.0
+
+
+# Shared clock used by all demo drivers
+clock = DemoClock(_default_time_scale())
+
+
+def set_time_scale(time_scale: float):
+    """Change the speed of every demo driver at once"""
+    clock.time_scale = time_scale
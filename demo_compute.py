@@ -0,0 +1,264 @@
+"""
+CPU-Bound Step Offload
+======================
+
+Keeps heavy CODE / CALCULATION / COMPUTATION steps off the event loop:
+1. Steps are dispatched by kind: I/O-bound tool calls stay on the loop,
+   CPU-bound step types go to a ProcessPoolExecutor
+2. The pool is warm: start() forks every worker up front, so the first
+   heavy step does not pay for process startup
+3. Large NumPy results come back through shared memory - the worker
+   writes the array into a SharedMemory block and returns only its
+   name, shape and dtype; the parent copies it out once and unlinks it.
+   Small results are pickled as usual
+4. workers=0 runs the kernels inline on the loop (the old behaviour),
+   for comparison and for environments without process support
+
+While a worker crunches numbers every other session's I/O keeps moving,
+and CPU-bound throughput scales with the number of cores.
+
+Run with: python3 demo_compute.py  (inline vs process pool, loop lag)
+"""
+
+import asyncio
+import concurrent.futures
+import math
+import os
+import random
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Any, Callable, Optional
+
+import numpy as np
+
+from demo_records import StepType
+
+
+CPU_BOUND_TYPES = frozenset({StepType.CODE.value, StepType.CALCULATION.value, StepType.COMPUTATION.value})
+
+DEFAULT_KERNEL_SIZE = 200_000  # Samples per simulated CPU-bound step
+SHARED_MEMORY_MIN_BYTES = 64 * 1024  # Smaller arrays are cheaper to pickle
+
+
+def is_cpu_bound(step: Any) -> bool:
+    """Whether a step (dict or StepRecord) should run in the process pool"""
+    return str(step.get("type", "")) in CPU_BOUND_TYPES
+
+
+# -- kernels ------------------------------------------------------------
+# Module-level functions, so workers can unpickle them by name
+
+def statistical_metrics(seed: int, size: int) -> Dict[str, Any]:
+    """Mean, deviation and extremes of a sample, in pure Python (holds the GIL)"""
+    rng = random.Random(seed)
+    mean = m2 = 0.0
+    low, high = math.inf, -math.inf
+    for n in range(1, size + 1):
+        x = rng.gauss(0.0, 1.0)
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        low, high = min(low, x), max(high, x)
+    std = math.sqrt(m2 / (size - 1)) if size > 1 else 0.0
+    return {"summary": f"{size} samples, mean {mean:+.3f}, std {std:.3f}",
+            "mean": mean, "std": std, "min": low, "max": high}
+
+
+def correlation_matrix(seed: int, size: int) -> Dict[str, Any]:
+    """Pairwise correlation of 256 synthetic series (a 512 KiB result)"""
+    series = 256
+    values = np.random.default_rng(seed).normal(size=(series, max(2, size // series)))
+    matrix = np.corrcoef(values)
+    off_diagonal = np.abs(matrix[~np.eye(series, dtype=bool)])
+    return {"summary": f"{series}x{series} correlations, mean |r| {off_diagonal.mean():.3f}",
+            "matrix": matrix}
+
+
+COMPUTE_KERNELS: Dict[str, Callable[[int, int], Dict[str, Any]]] = {
+    "statistical_analysis": correlation_matrix,
+    "math_calculator": statistical_metrics,
+    "time_series_forecasting": statistical_metrics,
+    "data_processing": statistical_metrics,
+}
+
+
+# -- shared-memory result transfer ----------------------------------------
+
+class SharedArray:
+    """Picklable handle to an array left in shared memory by a worker"""
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name: str, shape: tuple, dtype: str):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def load(self) -> np.ndarray:
+        """Copy the array out and free the shared block"""
+        block = shared_memory.SharedMemory(name=self.name)
+        try:
+            return np.ndarray(self.shape, self.dtype, buffer=block.buf).copy()
+        finally:
+            block.close()
+            block.unlink()
+
+    def discard(self):
+        block = shared_memory.SharedMemory(name=self.name)
+        block.close()
+        block.unlink()
+
+
+def _share(array: np.ndarray) -> SharedArray:
+    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    try:
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        return SharedArray(block.name, array.shape, array.dtype.str)
+    finally:
+        block.close()
+
+
+def _run_kernel(kernel: Callable[[int, int], Dict[str, Any]], seed: int, size: int,
+                min_shared_bytes: int) -> Dict[str, Any]:
+    """Worker side: run the kernel, move large arrays into shared memory"""
+    output = kernel(seed, size)
+    return {key: _share(value) if isinstance(value, np.ndarray) and value.nbytes >= min_shared_bytes
+            else value for key, value in output.items()}
+
+
+def _attach(output: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value.load() if isinstance(value, SharedArray) else value
+            for key, value in output.items()}
+
+
+def _discard(future: concurrent.futures.Future):
+    """Free the shared blocks of a result nobody is waiting for anymore"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    for value in future.result().values():
+        if isinstance(value, SharedArray):
+            value.discard()
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+class ComputePool:
+    """Warm process pool for CPU-bound steps"""
+
+    def __init__(self, workers: Optional[int] = None, min_shared_bytes: int = SHARED_MEMORY_MIN_BYTES):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.min_shared_bytes = min_shared_bytes
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self.steps = 0
+        self.shared_bytes = 0
+        self.busy_seconds = 0.0
+
+    async def start(self) -> "ComputePool":
+        """Fork every worker now instead of on the first heavy step"""
+        if self.workers and self._executor is None:
+            # Workers must report shared blocks to our resource tracker, not their own
+            resource_tracker.ensure_running()
+            self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up)
+                                   for _ in range(self.workers)))
+        return self
+
+    async def run(self, kernel: Callable[[int, int], Dict[str, Any]], seed: int, size: int) -> Dict[str, Any]:
+        """Run one kernel in a worker (inline when workers=0)"""
+        start = time.perf_counter()
+        if not self.workers:
+            output = kernel(seed, size)
+        else:
+            await self.start()
+            future = self._executor.submit(_run_kernel, kernel, seed, size, self.min_shared_bytes)
+            try:
+                shared = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                future.add_done_callback(_discard)
+                raise
+            self.shared_bytes += sum(int(np.prod(value.shape)) * np.dtype(value.dtype).itemsize
+                                     for value in shared.values() if isinstance(value, SharedArray))
+            output = _attach(shared)
+        self.steps += 1
+        self.busy_seconds += time.perf_counter() - start
+        return output
+
+    async def run_step(self, tool_name: str, step: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the kernel for a step's tool, seeded by the step itself"""
+        kernel = COMPUTE_KERNELS.get(tool_name, statistical_metrics)
+        seed = zlib.crc32(f"{tool_name}:{step.get('description', '')}".encode())
+        return await self.run(kernel, seed, step.get("size", DEFAULT_KERNEL_SIZE))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "steps": self.steps,
+                "shared_bytes": self.shared_bytes, "busy_seconds": round(self.busy_seconds, 3)}
+
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Worst delay of a timer that should fire every ``interval`` seconds"""
+    worst = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - expected)
+    return worst
+
+
+async def _mixed_load(workers: int, sessions: int) -> Dict[str, Any]:
+    """Each session: an I/O tool call, a heavy CALCULATION step, another I/O call"""
+    from demo_events import use_renderer
+    from demo_executor import ConcurrentToolExecutor
+
+    use_renderer("null")
+    compute = await ComputePool(workers=workers).start()
+    executor = ConcurrentToolExecutor(tool_latency=0.02, max_concurrency_per_tool=sessions, compute=compute)
+    calls = {
+        f"session-{i:02d}": [
+            ("web_search_api", {"query": f"dataset {i}", "type": "TOOL_CALL"}),
+            ("statistical_analysis", {"description": f"Calculate metrics for dataset {i}",
+                                      "type": "CALCULATION", "size": 400_000}),
+            ("math_calculator", {"description": f"Execute Python code on dataset {i}", "type": "CODE"}),
+            ("web_search_api", {"query": f"report {i}", "type": "TOOL_CALL"}),
+        ]
+        for i in range(sessions)
+    }
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_loop_lag(stop))
+    start = time.perf_counter()
+    await executor.run_sessions(calls)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    compute.shutdown()
+    return {"elapsed": elapsed, "lag": await lag, "cpu_steps": compute.steps,
+            "shared_bytes": compute.shared_bytes}
+
+
+async def main():
+    sessions = 8
+    workers = max(2, os.cpu_count() or 1)
+    inline = await _mixed_load(0, sessions)
+    pooled = await _mixed_load(workers, sessions)
+
+    print(f"\n{'='*60}")
+    print(f"🧮 {sessions} SESSIONS, {inline['cpu_steps']} CPU-BOUND STEPS ({os.cpu_count()} cores)")
+    print(f"{'='*60}")
+    for label, run in (("Inline on the loop", inline), (f"Process pool ({workers})", pooled)):
+        print(f"{label:22} {run['elapsed']:5.2f}s wall, "
+              f"{run['cpu_steps'] / run['elapsed']:5.1f} CPU steps/s, "
+              f"worst loop lag {run['lag'] * 1000:7.1f} ms")
+    print(f"Shared-memory transfer: {pooled['shared_bytes'] / 2**20:.1f} MiB of results")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+"""
+Dependency-Aware Plan Scheduler
+===============================
+
+Plans declare dependencies between steps and independent steps run
+concurrently:
+
+    weather ─┐
+             ├─> correlation ─> significance ─> report
+    stocks  ─┘
+
+Each step dict may carry:
+- "id": node name (default "step<N>", 1-based position in the plan)
+- "depends_on": ids that must succeed first. A step without the key
+  depends on the previous step, so plain lists still run in order;
+  "depends_on": [] makes it a root.
+
+A started node sees its dependencies' results, in depends_on order, as
+``node.inputs``.
+
+When a node fails, only its downstream subtree is cancelled (each
+cancelled node records the failed node in ``cancelled_by``); unrelated
+branches keep running.
+
+ResultStore keeps successful step outputs keyed by step identity (type,
+tool, details, params), so a replacement plan that repeats a step binds
+to its earlier output instead of executing it again.
+"""
+
+import asyncio
+from enum import Enum
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+from demo_cache import cache_key
+
+
+class NodeStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class PlanNode:
+    """One step of a plan plus its scheduling state"""
+
+    __slots__ = ("id", "step_num", "step", "depends_on", "dependents", "status",
+                 "result", "inputs", "cancelled_by")
+
+    def __init__(self, node_id: str, step_num: int, step: Dict[str, Any], depends_on: List[str]):
+        self.id = node_id
+        self.step_num = step_num
+        self.step = step
+        self.depends_on = depends_on
+        self.dependents: List[str] = []
+        self.status = NodeStatus.PENDING
+        self.result: Optional[Dict[str, Any]] = None
+        self.inputs: List[Dict[str, Any]] = []
+        self.cancelled_by: Optional["PlanNode"] = None
+
+
+def step_id(step: Dict[str, Any], position: int) -> str:
+    """Node id of a step at a 0-based plan position"""
+    return step.get("id") or f"step{position + 1}"
+
+
+def build_graph(steps: List[Dict[str, Any]]) -> Dict[str, PlanNode]:
+    """Create plan nodes in plan order; raises ValueError on bad graphs"""
+    nodes: Dict[str, PlanNode] = {}
+    previous: Optional[str] = None
+    for position, step in enumerate(steps):
+        node_id = step_id(step, position)
+        if node_id in nodes:
+            raise ValueError(f"Duplicate step id '{node_id}'")
+        if "depends_on" in step:
+            depends_on = list(step["depends_on"])
+        else:
+            depends_on = [previous] if previous else []
+        nodes[node_id] = PlanNode(node_id, position + 1, step, depends_on)
+        previous = node_id
+
+    for node in nodes.values():
+        for dependency in node.depends_on:
+            if dependency not in nodes:
+                raise ValueError(f"Step '{node.id}' depends on unknown step '{dependency}'")
+            nodes[dependency].dependents.append(node.id)
+
+    # Kahn's algorithm: every node must be reachable from a root
+    remaining = {node_id: len(node.depends_on) for node_id, node in nodes.items()}
+    ready = [node_id for node_id, count in remaining.items() if count == 0]
+    visited = 0
+    while ready:
+        node_id = ready.pop()
+        visited += 1
+        for dependent in nodes[node_id].dependents:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+    if visited != len(nodes):
+        cyclic = sorted(node_id for node_id, count in remaining.items() if count > 0)
+        raise ValueError(f"Plan has a dependency cycle through {cyclic}")
+    return nodes
+
+
+class ResultStore:
+    """Successful step outputs keyed by step identity"""
+
+    IDENTITY_FIELDS = ("type", "tool", "details", "params")
+
+    def __init__(self):
+        self._results: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def key(cls, step: Dict[str, Any]) -> str:
+        """Identity of the work a step does, ignoring ids and narration"""
+        return cache_key("step", {field: step.get(field) for field in cls.IDENTITY_FIELDS})
+
+    def get(self, step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._results.get(self.key(step))
+
+    def put(self, step: Dict[str, Any], result: Dict[str, Any]):
+        self._results[self.key(step)] = result
+
+    def __contains__(self, step: Dict[str, Any]) -> bool:
+        return self.key(step) in self._results
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self):
+        self._results.clear()
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Stored results by key, e.g. for a session checkpoint"""
+        return dict(self._results)
+
+    def update(self, results: Dict[str, Dict[str, Any]]):
+        """Add results saved with to_dict()"""
+        self._results.update(results)
+
+
+StepRunner = Callable[[PlanNode], Awaitable[Dict[str, Any]]]
+CancelHook = Callable[[PlanNode], None]
+
+
+class PlanScheduler:
+    """Runs plan nodes as soon as all of their dependencies succeed"""
+
+    def __init__(self, max_parallel: Optional[int] = None):
+        self.max_parallel = max_parallel
+
+    async def run(self, steps: List[Dict[str, Any]], run_step: StepRunner,
+                  on_cancel: Optional[CancelHook] = None) -> Dict[str, PlanNode]:
+        """Execute the plan; returns every node with its final status"""
+        nodes = build_graph(steps)
+        waiting = {node_id: len(node.depends_on) for node_id, node in nodes.items()}
+        ready = [node for node in nodes.values() if not node.depends_on]
+        running: Dict[asyncio.Task, PlanNode] = {}
+
+        try:
+            while ready or running:
+                while ready and (self.max_parallel is None or len(running) < self.max_parallel):
+                    node = ready.pop(0)
+                    node.status = NodeStatus.RUNNING
+                    node.inputs = [nodes[dependency].result for dependency in node.depends_on]
+                    running[asyncio.ensure_future(run_step(node))] = node
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: running[t].step_num):
+                    node = running.pop(task)
+                    node.result = task.result()
+                    if node.result.get("success"):
+                        node.status = NodeStatus.SUCCEEDED
+                        for dependent in node.dependents:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0 and nodes[dependent].status is NodeStatus.PENDING:
+                                ready.append(nodes[dependent])
+                    else:
+                        node.status = NodeStatus.FAILED
+                        self._cancel_subtree(nodes, node, on_cancel)
+                ready.sort(key=lambda n: n.step_num)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return nodes
+
+    @staticmethod
+    def _cancel_subtree(nodes: Dict[str, PlanNode], failed: PlanNode,
+                        on_cancel: Optional[CancelHook]):
+        cancelled: List[PlanNode] = []
+        stack = list(failed.dependents)
+        while stack:
+            node = nodes[stack.pop()]
+            if node.status is not NodeStatus.PENDING:
+                continue
+            node.status = NodeStatus.CANCELLED
+            node.cancelled_by = failed
+            cancelled.append(node)
+            stack.extend(node.dependents)
+
+        if on_cancel is not None:
+            for node in sorted(cancelled, key=lambda n: n.step_num):
+                on_cancel(node)
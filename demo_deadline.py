@@ -0,0 +1,81 @@
+"""
+Deadlines
+=========
+
+Timeouts that propagate from a session or plan down to each tool call:
+1. deadline(seconds) opens a scope; a nested scope can only tighten the
+   deadline around it, never extend it
+2. The deadline lives in a context variable, so tasks spawned inside a
+   scope (parallel plan steps, fallbacks, retries) inherit it
+3. Only the leaves that actually wait (a tool call, a step body, a
+   human delay) enforce it, with ``async with bounded():`` - an
+   asyncio.timeout_at() on the tightest deadline in effect. The wait is
+   cancelled and TimeoutError raised; callers record it as TIMEOUT
+
+    with deadline(120):                  # whole session
+        with deadline(TIMEOUT_PER_STEP):  # one step
+            async with bounded():
+                await call_tool()
+
+Durations are nominal demo seconds scaled by the demo clock. At
+DEMO_TIME_SCALE=0 nothing takes nominal time, so deadlines apply
+unscaled and only catch calls that truly hang.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from demo_clock import clock
+
+
+TIMEOUT_PER_STEP = 30.0  # Seconds per step execution (see README configuration)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def wall_seconds(seconds: float) -> float:
+    """Wall-clock length of a nominal timeout"""
+    return clock.scaled(seconds) if clock.time_scale > 0 else seconds
+
+
+def current() -> Optional[float]:
+    """Event loop time of the tightest deadline in effect, if any"""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Wall seconds left before the current deadline, if any"""
+    when = _deadline.get()
+    if when is None:
+        return None
+    return max(0.0, when - asyncio.get_running_loop().time())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Tighten the deadline for the enclosed code; None leaves it as is"""
+    outer = _deadline.get()
+    if seconds is None:
+        yield outer
+        return
+    when = asyncio.get_running_loop().time() + wall_seconds(seconds)
+    if outer is not None and outer <= when:
+        yield outer
+        return
+    token = _deadline.set(when)
+    try:
+        yield when
+    finally:
+        _deadline.reset(token)
+
+
+def bounded() -> asyncio.Timeout:
+    """asyncio.timeout_at() for the current deadline (unbounded if none)"""
+    return asyncio.timeout_at(_deadline.get())
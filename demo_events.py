@@ -0,0 +1,297 @@
+"""
+Demo Event Stream
+=================
+
+Typed events for every stage of the demos (tool execution, step
+execution, interventions, human decisions, plan replacement). Renderers
+subscribe to the shared bus:
+
+    console -> the emoji output used for recording (default)
+    jsonl   -> one JSON object per event, machine-readable
+    null    -> nothing; emit() returns after a single check
+
+Pick one with DEMO_RENDERER=console|jsonl|null.
+"""
+
+import json
+import os
+import sys
+import time
+from enum import Enum
+from typing import Dict, Any, List, Optional, TextIO
+
+from demo_tracing import tracer
+
+
+class EventKind(str, Enum):
+    """Every event type emitted by the demos"""
+    BANNER = "banner"
+    SECTION = "section"
+    TOOL_STARTED = "tool_started"
+    TOOL_PROGRESS = "tool_progress"
+    TOOL_SUCCEEDED = "tool_succeeded"
+    TOOL_FAILED = "tool_failed"
+    TOOL_RETRYING = "tool_retrying"
+    FALLBACK_ROUTED = "fallback_routed"
+    STEP_STARTED = "step_started"
+    STEP_PROGRESS = "step_progress"
+    STEP_COMPLETED = "step_completed"
+    STEP_FAILED = "step_failed"
+    STEP_CANCELLED = "step_cancelled"
+    STEP_REUSED = "step_reused"
+    INTERVENTION_REQUESTED = "intervention_requested"
+    PLAN_STATUS = "plan_status"
+    SUGGESTION_OFFERED = "suggestion_offered"
+    ACTIONS_OFFERED = "actions_offered"
+    HUMAN_DECIDING = "human_deciding"
+    HUMAN_DECIDED = "human_decided"
+    PLAN_REPLACED = "plan_replaced"
+    RECOVERY_STARTED = "recovery_started"
+    RECOVERY_STEP = "recovery_step"
+
+
+class Event:
+    """A single stage event"""
+
+    __slots__ = ("kind", "session_id", "timestamp", "data")
+
+    def __init__(self, kind: EventKind, session_id: Optional[str], data: Dict[str, Any]):
+        self.kind = kind
+        self.session_id = session_id
+        self.timestamp = time.time()
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind.value, "ts": self.timestamp,
+                "session_id": self.session_id, **self.data}
+
+
+class Renderer:
+    """Base class for event subscribers"""
+
+    def handle(self, event: Event):
+        raise NotImplementedError
+
+
+class NullRenderer(Renderer):
+    """Discards events; the bus never even dispatches to it"""
+
+    def handle(self, event: Event):
+        pass
+
+
+class JsonLinesRenderer(Renderer):
+    """Writes one JSON object per event"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+
+    def handle(self, event: Event):
+        self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+
+class ConsoleRenderer(Renderer):
+    """Renders events as the emoji console output used in the videos"""
+
+    def __init__(self):
+        self._progress_line = False
+
+    def _clear_progress(self):
+        if self._progress_line:
+            print(" " * 50, end='\r')  # Clear line
+            self._progress_line = False
+
+    def handle(self, event: Event):
+        method = getattr(self, f"_render_{event.kind.value}", None)
+        if method is not None:
+            method(dict(event.data, session_id=event.session_id))
+
+    def _render_banner(self, d: Dict[str, Any]):
+        border = "🎬 " * 30
+        print(f"\n{border}")
+        print(f"{d['title'].center(180)}")
+        print(f"{border}\n")
+
+    def _render_section(self, d: Dict[str, Any]):
+        print(f"\n{'='*60}")
+        print(f"📋 {d['name']}")
+        print(f"{'='*60}\n")
+
+    def _render_tool_started(self, d: Dict[str, Any]):
+        print(f"\n{'='*60}")
+        print(f"🔧 EXECUTING TOOL: {d['tool']}")
+        print(f"{'='*60}")
+        if d.get("params") is not None:
+            print(f"Parameters: {d['params']}")
+
+    def _render_tool_progress(self, d: Dict[str, Any]):
+        print(f"{'.'* d['tick']} Processing", end='\r')
+        self._progress_line = True
+
+    def _render_tool_succeeded(self, d: Dict[str, Any]):
+        self._clear_progress()
+        print("✅ TOOL EXECUTION SUCCESSFUL!")
+        print(f"Result: {d['result']}")
+
+    def _render_tool_failed(self, d: Dict[str, Any]):
+        self._clear_progress()
+        print("❌ TOOL EXECUTION FAILED!")
+        print(f"Error: {d['error']}")
+        print(f"Error Code: {d['error_code']}")
+
+    def _render_tool_retrying(self, d: Dict[str, Any]):
+        print(f"\n🔁 Retrying {d['tool']} in {d['delay']:.1f}s "
+              f"(attempt {d['attempt']}/{d['max_retries']}, {d['error_code']})")
+
+    def _render_fallback_routed(self, d: Dict[str, Any]):
+        print(f"\n🔀 Routing {d['tool']} → {d['fallback']} ({d['reason']})")
+
+    def _render_step_started(self, d: Dict[str, Any]):
+        print(f"\n{'='*60}")
+        print(f"⚙️  EXECUTING STEP {d['step_num']}: {d['description']}")
+        print(f"{'='*60}")
+        print(f"Type: {d['type']}")
+        print(f"Details: {d.get('details') or 'N/A'}")
+
+    def _render_step_progress(self, d: Dict[str, Any]):
+        print(f"{'.'* d['tick']} Processing", end='\r')
+        self._progress_line = True
+
+    def _render_step_completed(self, d: Dict[str, Any]):
+        self._clear_progress()
+        print(f"✅ Step {d['step_num']} COMPLETED")
+        if d.get("output"):
+            print(f"Output: {d['output']}")
+
+    def _render_step_failed(self, d: Dict[str, Any]):
+        self._clear_progress()
+        print(f"❌ Step {d['step_num']} FAILED")
+        print(f"Reason: {d['reason']}")
+
+    def _render_step_cancelled(self, d: Dict[str, Any]):
+        print(f"\n⏭️  Step {d['step_num']} CANCELLED: {d['description']}")
+        print(f"Reason: depends on failed step {d['failed_step_num']}")
+
+    def _render_step_reused(self, d: Dict[str, Any]):
+        print(f"\n♻️  Step {d['step_num']} REUSED: {d['description']}")
+        print(f"Result: {d['result']}")
+
+    def _render_intervention_requested(self, d: Dict[str, Any]):
+        print("\n" + "🚨 "*30)
+        if d["intervention_type"] == "plan_failure":
+            print("PLAN FAILURE - HUMAN INTERVENTION REQUIRED".center(180))
+            print("🚨 "*30)
+            print(f"\nSession ID: {d['session_id']}")
+            print(f"Original Query: {d['query']}")
+            print(f"Failure Reason: {d['error']}")
+        else:
+            print("TOOL FAILURE - HUMAN INTERVENTION REQUIRED".center(180))
+            print("🚨 "*30)
+            print(f"\nSession ID: {d['session_id']}")
+            print(f"Original Query: {d['query']}")
+            print(f"Failed Step: {d['failed_step']}")
+            print(f"Error: {d['error']}")
+
+    def _render_plan_status(self, d: Dict[str, Any]):
+        current_plan, completed_steps = d["current_plan"], d["completed_steps"]
+        print("\n📋 CURRENT PLAN (FAILED):")
+        for i, step in enumerate(current_plan, 1):
+            status = "✅" if i <= len(completed_steps) else "❌"
+            print(f"  {status} Step {i}: {step}")
+
+        print(f"\n✅ COMPLETED STEPS: {len(completed_steps)}/{len(current_plan)}")
+        for step in completed_steps[-3:]:
+            print(f"  • {step}")
+
+    def _render_suggestion_offered(self, d: Dict[str, Any]):
+        if d["index"] == 1:
+            print(f"\n💡 {d.get('heading', 'SUGGESTED ALTERNATIVES')}:")
+        history = f"  ({d['history']})" if d.get("history") else ""
+        print(f"  {d['index']}. {d['text']}{history}")
+
+    def _render_actions_offered(self, d: Dict[str, Any]):
+        print("\n📝 AVAILABLE ACTIONS:")
+        for i, action in enumerate(d["actions"], 1):
+            print(f"  {i}. {action}")
+
+    def _render_human_deciding(self, d: Dict[str, Any]):
+        print("\n" + "👤 "*30)
+        print("HUMAN DECISION PROCESS".center(180))
+        print("👤 "*30)
+        print(f"\n⏰ {d.get('message', 'Analyzing options...')}")
+
+    def _render_human_decided(self, d: Dict[str, Any]):
+        print(f"\n✅ Human Selected: Option {d['choice']}")
+        print(f"💭 {d.get('label', 'Rationale')}: {d['rationale']}")
+
+    def _render_plan_replaced(self, d: Dict[str, Any]):
+        print("\n📋 NEW EXECUTION PLAN:")
+        for i, step in enumerate(d["new_plan"], 1):
+            print(f"  {i}. {step}")
+
+    def _render_recovery_started(self, d: Dict[str, Any]):
+        print("\n" + "🔄 "*30)
+        print(d["title"].center(180))
+        print("🔄 "*30)
+
+    def _render_recovery_step(self, d: Dict[str, Any]):
+        print(f"\n⚙️  {d['text']}")
+
+
+RENDERERS = {
+    "console": ConsoleRenderer,
+    "jsonl": JsonLinesRenderer,
+    "null": NullRenderer,
+}
+
+
+class EventBus:
+    """Fan-out of events to subscribed renderers"""
+
+    def __init__(self):
+        self._subscribers: List[Renderer] = []
+        self.enabled = False
+
+    def subscribe(self, renderer: Renderer):
+        if isinstance(renderer, NullRenderer):
+            return
+        self._subscribers.append(renderer)
+        self.enabled = True
+
+    def unsubscribe(self, renderer: Renderer):
+        if renderer in self._subscribers:
+            self._subscribers.remove(renderer)
+        self.enabled = bool(self._subscribers)
+
+    def clear(self):
+        self._subscribers.clear()
+        self.enabled = False
+
+    def emit(self, kind: EventKind, session_id: Optional[str] = None, **data):
+        """Publish an event; a no-op when nothing is subscribed"""
+        if not self.enabled:
+            return
+        event = Event(kind, session_id, data)
+        with tracer.span(kind.value, "render"):
+            for renderer in self._subscribers:
+                renderer.handle(event)
+
+
+def use_renderer(name: str) -> Renderer:
+    """Replace the shared bus subscribers with a single named renderer"""
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer '{name}', expected one of {sorted(RENDERERS)}")
+    renderer = RENDERERS[name]()
+    bus.clear()
+    bus.subscribe(renderer)
+    return renderer
+
+
+def _default_renderer() -> str:
+    name = os.environ.get("DEMO_RENDERER", "console")
+    return name if name in RENDERERS else "console"
+
+
+# Shared bus used by all demo drivers
+bus = EventBus()
+use_renderer(_default_renderer())
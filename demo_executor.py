@@ -0,0 +1,400 @@
+"""
+Concurrent Tool Execution Engine
+================================
+
+Runs many demo sessions against simulated tools on a single event loop:
+1. Each tool call borrows a client from that tool's service pool
+   (demo_services.py), which bounds concurrency per tool and, for
+   rate-limited services, shares one token-bucket quota across sessions
+2. Each session keeps its own call counters
+3. Throughput is reported in calls per second
+
+Running N sessions takes roughly as long as the slowest session,
+not the sum of all of them.
+
+With a fallback map, each tool gets a circuit breaker: failures route
+to the next fallback immediately, and an open breaker skips the tool
+entirely. Only when every fallback is exhausted does the result ask for
+human escalation ("fallbacks_exhausted").
+
+With a RetryScheduler, transient failures (timeouts, unavailable, rate
+limited) are retried with backoff and jitter, within a per-tool retry
+budget, before the fallback chain is tried.
+
+With a call_timeout, every call is bounded by the tighter of its own
+timeout and any session or plan deadline around it (demo_deadline.py);
+a call that runs out of time is cancelled, cleaned up via _cleanup()
+and fails with error code TIMEOUT.
+
+With a ComputePool, CPU-bound steps (CODE, CALCULATION, COMPUTATION)
+run in warm worker processes instead of on the event loop
+(demo_compute.py); every other call stays on the loop.
+
+With a ToolResultCache, repeated calls (same tool + params) are served
+from memory, identical in-flight calls share one real call, and a
+failing tool falls back to its last good result ("stale").
+
+With a FaultInjector (demo_faults.py), every call draws its outcome and
+latency jitter from a seeded per-tool fault model - scripted ("arXiv
+always times out") or at the FAULT_PROFILES rates for load tests.
+
+Run with: python3 demo_executor.py  (add --cache to enable the result cache,
+--retry to fail arXiv for every session and watch the retry budget cap retries)
+"""
+
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+
+from demo_cache import ToolResultCache
+from demo_circuit import CircuitBreaker
+from demo_clock import clock
+from demo_compute import ComputePool, is_cpu_bound
+from demo_deadline import bounded, deadline, expired
+from demo_events import bus, EventKind, use_renderer
+from demo_faults import Fault, FaultInjector
+from demo_metrics import tool_metrics
+from demo_retry import RetryScheduler
+from demo_services import ServiceRegistry
+from demo_tracing import tracer
+
+
+ToolCall = Tuple[str, Dict[str, Any]]
+
+
+class SessionCounters:
+    """Per-session call counters
+
+    Counters are only touched between awaits, so updates from concurrent
+    sessions never interleave on a single event loop.
+    """
+
+    __slots__ = ("session_id", "calls", "successes", "failures", "per_tool")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.per_tool: Counter = Counter()
+
+    def record(self, tool_name: str, success: bool):
+        self.calls += 1
+        self.per_tool[tool_name] += 1
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "per_tool": dict(self.per_tool)
+        }
+
+
+class ConcurrentToolExecutor:
+    """Executes simulated tool calls for many sessions concurrently"""
+
+    def __init__(self, tool_latency: float = 1.0, max_concurrency_per_tool: int = 10,
+                 faults: Optional[FaultInjector] = None,
+                 fallbacks: Optional[Dict[str, List[str]]] = None,
+                 breaker_threshold: int = 3, breaker_reset_seconds: float = 30.0,
+                 cache: Optional[ToolResultCache] = None,
+                 retry: Optional[RetryScheduler] = None, call_timeout: Optional[float] = None,
+                 services: Optional[ServiceRegistry] = None, compute: Optional[ComputePool] = None):
+        self.tool_latency = tool_latency
+        self.max_concurrency_per_tool = max_concurrency_per_tool
+        self.faults = faults
+        self.fallbacks = dict(fallbacks or {})
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.cache = cache
+        self.retry = retry
+        self.call_timeout = call_timeout
+        self.services = services or ServiceRegistry(size=max_concurrency_per_tool)
+        self.compute = compute
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._fallback_routes: Counter = Counter()
+
+        self._sessions: Dict[str, SessionCounters] = {}
+        self._in_flight: Counter = Counter()
+        self._peak_in_flight: Counter = Counter()
+        self._tool_calls: Counter = Counter()
+        self._completed = 0
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+
+    @property
+    def execution_count(self) -> int:
+        """Total tool calls completed across all sessions"""
+        return self._completed
+
+    def session(self, session_id: str) -> SessionCounters:
+        """Get (or create) the counters for a session"""
+        counters = self._sessions.get(session_id)
+        if counters is None:
+            counters = SessionCounters(session_id)
+            self._sessions[session_id] = counters
+        return counters
+
+    def breaker(self, tool_name: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a tool"""
+        breaker = self._breakers.get(tool_name)
+        if breaker is None:
+            breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset_seconds)
+            self._breakers[tool_name] = breaker
+        return breaker
+
+    def _draw(self, tool_name: str, params: Dict[str, Any]) -> Fault:
+        """This call's injected outcome (never fails without a fault model)"""
+        if self.faults is None:
+            return Fault(tool_name)
+        return self.faults.draw(tool_name, params)
+
+    async def _invoke(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Simulated tool body - override to plug in real tools"""
+        fault = self._draw(tool_name, params)
+        await clock.sleep(self.tool_latency * fault.latency_factor)
+
+        if fault.failed:
+            return fault.to_result()
+        return {
+            "success": True,
+            "result": f"Successfully executed {tool_name}",
+            "data": {"value": 42}
+        }
+
+    async def _invoke_compute(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """CPU-bound step body, run in the compute pool"""
+        fault = self._draw(tool_name, params)
+        if fault.failed:
+            return fault.to_result()
+        output = await self.compute.run_step(tool_name, params)
+        return {"success": True, "result": output["summary"], "data": output}
+
+    def _cleanup(self, tool_name: str, params: Dict[str, Any]):
+        """Called when a call is cancelled or times out - override to release resources"""
+
+    async def execute_tool(self, tool_name: str, params: Dict[str, Any],
+                           session_id: str = "default") -> Dict[str, Any]:
+        """Execute a tool call through the cache and the fallback chain"""
+        self.session(session_id)
+        if self.cache is not None:
+            return await self.cache.call(
+                tool_name, params, lambda: self._route(tool_name, params, session_id)
+            )
+        return await self._route(tool_name, params, session_id)
+
+    async def _route(self, tool_name: str, params: Dict[str, Any],
+                     session_id: str) -> Dict[str, Any]:
+        """Call the tool, falling back along the configured chain"""
+        chain = [tool_name] + self.fallbacks.get(tool_name, [])
+        if len(chain) == 1:
+            return await self._attempt(tool_name, params, session_id)
+
+        attempted: List[Dict[str, Any]] = []
+        result: Optional[Dict[str, Any]] = None
+        for candidate in chain:
+            breaker = self.breaker(candidate)
+            if not breaker.allow_request():
+                attempted.append({"tool": candidate, "skipped": "circuit_open"})
+                continue
+
+            if candidate != tool_name:
+                self._fallback_routes[(tool_name, candidate)] += 1
+                if bus.enabled:
+                    bus.emit(EventKind.FALLBACK_ROUTED, session_id, tool=tool_name, fallback=candidate,
+                             reason=attempted[-1].get("skipped") or attempted[-1].get("error_code"))
+
+            try:
+                result = await self._attempt(candidate, params, session_id)
+            except Exception:
+                breaker.record_failure()
+                raise
+
+            if result.get("success"):
+                breaker.record_success()
+                if candidate != tool_name:
+                    result = dict(result, requested_tool=tool_name, fallback_used=candidate)
+                return result
+
+            breaker.record_failure()
+            attempted.append({"tool": candidate, "error_code": result.get("error_code")})
+
+        if result is None:
+            result = {
+                "success": False,
+                "error": f"Circuit open for {tool_name} and all of its fallbacks",
+                "error_code": "CIRCUIT_OPEN"
+            }
+        return dict(result, fallbacks_exhausted=True, attempted=attempted)
+
+    async def _attempt(self, tool_name: str, params: Dict[str, Any],
+                       session_id: str) -> Dict[str, Any]:
+        """One tool's call, including its retries"""
+        if self.retry is None:
+            return await self._execute_once(tool_name, params, session_id)
+        return await self.retry.run(
+            tool_name, lambda: self._execute_once(tool_name, params, session_id), session_id
+        )
+
+    async def _execute_once(self, tool_name: str, params: Dict[str, Any],
+                            session_id: str) -> Dict[str, Any]:
+        """Execute exactly one call against one tool"""
+        if bus.enabled:
+            bus.emit(EventKind.TOOL_STARTED, session_id, tool=tool_name, params=params)
+
+        with deadline(self.call_timeout):
+            try:
+                if expired():
+                    raise TimeoutError
+                async with bounded():
+                    with tracer.span(tool_name, "tool", session=session_id):
+                        result = await self._call(tool_name, params)
+            except TimeoutError:
+                self._cleanup(tool_name, params)
+                result = {
+                    "success": False,
+                    "error": f"{tool_name} did not finish before its deadline",
+                    "error_code": "TIMEOUT"
+                }
+            except asyncio.CancelledError:
+                self._cleanup(tool_name, params)
+                raise
+
+        self._last_end = time.perf_counter()
+        self._completed += 1
+        self._tool_calls[tool_name] += 1
+        self.session(session_id).record(tool_name, result.get("success", False))
+
+        if bus.enabled:
+            if result.get("success"):
+                bus.emit(EventKind.TOOL_SUCCEEDED, session_id, tool=tool_name, result=result.get("result"))
+            else:
+                bus.emit(EventKind.TOOL_FAILED, session_id, tool=tool_name,
+                         error=result.get("error"), error_code=result.get("error_code"))
+        return result
+
+    async def _call(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.services.pool(tool_name).acquire():
+            start = time.perf_counter()
+            if self._first_start is None:
+                self._first_start = start
+
+            self._in_flight[tool_name] += 1
+            if self._in_flight[tool_name] > self._peak_in_flight[tool_name]:
+                self._peak_in_flight[tool_name] = self._in_flight[tool_name]
+            try:
+                with tool_metrics.track(tool_name) as timer:
+                    if self.compute is not None and is_cpu_bound(params):
+                        result = await self._invoke_compute(tool_name, params)
+                    else:
+                        result = await self._invoke(tool_name, params)
+                    timer.success = result.get("success", False)
+            finally:
+                self._in_flight[tool_name] -= 1
+        return result
+
+    async def run_session(self, session_id: str, calls: List[ToolCall],
+                          timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run one session's tool calls in order, within an optional session deadline"""
+        results = []
+        with deadline(timeout):
+            for tool_name, params in calls:
+                results.append(await self.execute_tool(tool_name, params, session_id=session_id))
+        return results
+
+    async def run_sessions(self, sessions: Dict[str, List[ToolCall]],
+                           timeout: Optional[float] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Run many sessions concurrently; each session stays sequential"""
+        session_ids = list(sessions)
+        outcomes = await asyncio.gather(
+            *(self.run_session(session_id, sessions[session_id], timeout) for session_id in session_ids)
+        )
+        return dict(zip(session_ids, outcomes))
+
+    def throughput_report(self) -> Dict[str, Any]:
+        """Summarize completed calls, wall time and calls per second"""
+        elapsed = 0.0
+        if self._first_start is not None and self._last_end is not None:
+            elapsed = self._last_end - self._first_start
+
+        report = {
+            "total_calls": self._completed,
+            "sessions": len(self._sessions),
+            "elapsed_seconds": elapsed,
+            "calls_per_second": self._completed / elapsed if elapsed > 0 else 0.0,
+            "per_tool_calls": dict(self._tool_calls),
+            "peak_concurrency_per_tool": dict(self._peak_in_flight),
+            "max_concurrency_per_tool": self.max_concurrency_per_tool,
+            "fallback_routes": {f"{src}->{dst}": n for (src, dst), n in self._fallback_routes.items()},
+            "circuit_breakers": {name: breaker.to_dict() for name, breaker in self._breakers.items()},
+            "services": self.services.stats()
+        }
+        if self.cache is not None:
+            report["cache"] = self.cache.stats()
+        if self.retry is not None:
+            report["retry"] = self.retry.stats()
+        if self.compute is not None:
+            report["compute"] = self.compute.stats()
+        if self.faults is not None:
+            report["faults"] = self.faults.stats()
+        return report
+
+
+async def main():
+    """Replay a batch of sessions and print the throughput report"""
+    use_renderer("null")
+    cached = "--cache" in sys.argv
+    retried = "--retry" in sys.argv
+    executor = ConcurrentToolExecutor(
+        tool_latency=0.1, max_concurrency_per_tool=50,
+        cache=ToolResultCache(ttl_seconds=60) if cached else None,
+        faults=FaultInjector.failing({"arxiv_search"}) if retried else None,
+        retry=RetryScheduler(base_delay=0.05, max_delay=0.4, seed=1) if retried else None
+    )
+
+    sessions = {
+        f"load-session-{i:03d}": [
+            ("arxiv_search", {"query": "artificial intelligence", "max_results": 10}),
+            ("google_scholar_search", {"query": "AI research papers"})
+        ]
+        for i in range(200)
+    }
+
+    await executor.run_sessions(sessions)
+    report = executor.throughput_report()
+
+    print(f"\n{'='*60}")
+    print("📊 THROUGHPUT REPORT")
+    print(f"{'='*60}")
+    print(f"Sessions: {report['sessions']}")
+    print(f"Total Calls: {report['total_calls']}")
+    print(f"Elapsed: {report['elapsed_seconds']:.2f}s")
+    print(f"Throughput: {report['calls_per_second']:.1f} calls/s")
+    print(f"Peak Concurrency: {report['peak_concurrency_per_tool']}")
+    if cached:
+        cache = report["cache"]
+        print(f"Cache: {cache['hits']} hits, {cache['coalesced']} coalesced, "
+              f"{cache['misses']} misses ({cache['hit_ratio']*100:.1f}% served without a call)")
+    if retried:
+        budget = report["retry"]["budgets"]["arxiv_search"]
+        print(f"Retries: {report['retry']['retries']} for {len(sessions)} failing calls "
+              f"({budget['denied']} denied by the retry budget)")
+
+    print("\n⏱️  Latency Percentiles:")
+    for tool_name, stats in tool_metrics.snapshot().items():
+        print(f"   {tool_name}: p50={stats['p50']*1000:.1f}ms "
+              f"p95={stats['p95']*1000:.1f}ms p99={stats['p99']*1000:.1f}ms "
+              f"({stats['successes']} ok / {stats['failures']} failed)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
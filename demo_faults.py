@@ -0,0 +1,224 @@
+"""
+Seeded Fault Injection
+======================
+
+One place decides whether a simulated tool call fails, how, and how
+long it takes:
+1. Each tool has a fault model: failure probability, a weighted
+   distribution of error codes and a log-normal latency spread
+   (multiplier around the tool's nominal latency)
+2. FAULT_PROFILES holds assumed load-test rates (e.g. arXiv fails 67%
+   of the time with network timeouts, News API 50% with rate limits);
+   they are not measured, see the note above the table
+3. Every tool draws from its own random stream seeded by (seed, tool),
+   so a run is reproducible by seed and calls to one tool never shift
+   the draws of another
+4. Scripted failures stay possible: a step with ``will_fail`` fails its
+   own tool (not its fallbacks) with the step's error
+
+    faults = FaultInjector.profiled(seed=7)          # load testing
+    faults = FaultInjector.failing({"arxiv_search"})  # scripted demo
+    fault = faults.draw("arxiv_search")
+    if fault.failed:
+        return fault.to_result()
+
+Run with: python3 demo_faults.py --seed 7  (observed rates per tool)
+"""
+
+import argparse
+import bisect
+import math
+import random
+from collections import Counter, defaultdict
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+
+# Error text per code; {tool} and {line} are filled in when drawn
+ERROR_MESSAGES: Dict[str, str] = {
+    "NETWORK_TIMEOUT": "Network timeout: Unable to connect to {tool} service",
+    "RATE_LIMITED": "API rate limit exceeded",
+    "SERVICE_UNAVAILABLE": "{tool} service unavailable",
+    "SYNTAX_ERROR": "SyntaxError: invalid syntax on line {line}",
+    "DATA_FORMAT_ERROR": "ValueError: Input data format mismatch",
+    "MODEL_TOO_COMPLEX": "Model too complex for available data",
+    "STEP_FAILED": "Step failed",
+}
+
+# Assumed failure rates for load tests, not measurements. The primary
+# tools' rates are the per-tool estimates the hand-written
+# TOOL_STATISTICS.md used to list (arXiv 67%, News API and Sentiment 50%,
+# Web Scraper 100%, Weather 20%, Statistical Analysis 25%); the 5% for
+# data processing and CODE steps is a small background rate. The
+# generated tables measure the scripted scenarios (failures are fixed per
+# test), so they are not a sample of failure rates either. Tools not
+# listed never fail. Keys are tool names, or step types for steps without
+# a tool
+FAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "arxiv_search": {"failure_rate": 0.67, "errors": {"NETWORK_TIMEOUT": 1.0}, "latency_sigma": 0.3},
+    "news_api": {"failure_rate": 0.5, "errors": {"RATE_LIMITED": 1.0}, "latency_sigma": 0.3},
+    "sentiment_api": {"failure_rate": 0.5, "errors": {"SERVICE_UNAVAILABLE": 1.0}, "latency_sigma": 0.3},
+    "web_scraper": {"failure_rate": 1.0, "errors": {"RATE_LIMITED": 1.0}, "latency_sigma": 0.3},
+    "weather_api": {"failure_rate": 0.2, "errors": {"NETWORK_TIMEOUT": 0.7, "RATE_LIMITED": 0.3},
+                    "latency_sigma": 0.3},
+    "statistical_analysis": {"failure_rate": 0.25,
+                             "errors": {"DATA_FORMAT_ERROR": 0.5, "MODEL_TOO_COMPLEX": 0.5},
+                             "latency_sigma": 0.2},
+    "data_processing": {"failure_rate": 0.05, "errors": {"DATA_FORMAT_ERROR": 1.0}, "latency_sigma": 0.1},
+    "CODE": {"failure_rate": 0.05, "errors": {"SYNTAX_ERROR": 1.0}, "latency_sigma": 0.1},
+}
+
+DEFAULT_LATENCY_SIGMA = 0.1  # Latency spread of profiled runs for tools without a profile
+
+
+class Fault:
+    """Outcome of one draw: an error (or None) and a latency multiplier"""
+
+    __slots__ = ("tool", "error_code", "error", "latency_factor")
+
+    def __init__(self, tool: str, error_code: Optional[str] = None, error: Optional[str] = None,
+                 latency_factor: float = 1.0):
+        self.tool = tool
+        self.error_code = error_code
+        self.error = error
+        self.latency_factor = latency_factor
+
+    @property
+    def failed(self) -> bool:
+        return self.error_code is not None
+
+    def to_result(self) -> Dict[str, Any]:
+        return {"success": False, "error": self.error, "error_code": self.error_code}
+
+
+class ToolFaultModel:
+    """Failure probability, error-code weights and latency spread of one tool"""
+
+    __slots__ = ("failure_rate", "codes", "cumulative", "latency_sigma")
+
+    def __init__(self, failure_rate: float = 0.0, errors: Optional[Dict[str, float]] = None,
+                 latency_sigma: float = 0.0):
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError(f"failure_rate must be within [0, 1], got {failure_rate}")
+        errors = errors or {"STEP_FAILED": 1.0}
+        self.failure_rate = failure_rate
+        self.codes = list(errors)
+        total, self.cumulative = 0.0, []
+        for code in self.codes:
+            total += errors[code]
+            self.cumulative.append(total)
+        self.latency_sigma = latency_sigma
+
+    def sample(self, rng: random.Random) -> Tuple[Optional[str], float]:
+        """(error code or None, latency multiplier with median 1)"""
+        factor = math.exp(rng.gauss(0.0, self.latency_sigma)) if self.latency_sigma else 1.0
+        if self.failure_rate and rng.random() < self.failure_rate:
+            index = bisect.bisect_right(self.cumulative, rng.random() * self.cumulative[-1])
+            return self.codes[min(index, len(self.codes) - 1)], factor
+        return None, factor
+
+
+class FaultInjector:
+    """Seeded per-tool fault models, shared by every session of a run"""
+
+    def __init__(self, seed: int = 0, profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default_sigma: float = 0.0):
+        self.seed = seed
+        self.default_sigma = default_sigma
+        self._models: Dict[str, ToolFaultModel] = {
+            tool: ToolFaultModel(**profile) for tool, profile in (profiles or {}).items()
+        }
+        self._streams: Dict[str, random.Random] = {}
+        self.draws: Counter = Counter()
+        self.failures: Dict[str, Counter] = defaultdict(Counter)
+
+    @classmethod
+    def profiled(cls, seed: int = 0) -> "FaultInjector":
+        """Random faults at the FAULT_PROFILES rates"""
+        return cls(seed, FAULT_PROFILES, default_sigma=DEFAULT_LATENCY_SIGMA)
+
+    @classmethod
+    def failing(cls, tools: Iterable[str], error_code: str = "NETWORK_TIMEOUT",
+                seed: int = 0) -> "FaultInjector":
+        """Every call to ``tools`` fails with ``error_code``; nothing else does"""
+        return cls(seed, {tool: {"failure_rate": 1.0, "errors": {error_code: 1.0}} for tool in tools})
+
+    def model(self, tool: str) -> ToolFaultModel:
+        model = self._models.get(tool)
+        if model is None:
+            model = ToolFaultModel(latency_sigma=self.default_sigma)
+            self._models[tool] = model
+        return model
+
+    def set_failure_rate(self, tool: str, failure_rate: float):
+        model = self.model(tool)
+        self._models[tool] = ToolFaultModel(
+            failure_rate, dict(zip(model.codes, _weights(model.cumulative))), model.latency_sigma
+        )
+
+    def heal(self, tool: Optional[str] = None):
+        """Stop injecting failures into ``tool`` (or every tool)"""
+        for name in ([tool] if tool is not None else list(self._models)):
+            self.set_failure_rate(name, 0.0)
+
+    def _stream(self, tool: str) -> random.Random:
+        rng = self._streams.get(tool)
+        if rng is None:
+            rng = random.Random(f"{self.seed}:{tool}")
+            self._streams[tool] = rng
+        return rng
+
+    def draw(self, tool: str, step: Optional[Any] = None) -> Fault:
+        """Decide one call to ``tool``; ``step`` may carry a scripted failure"""
+        rng = self._stream(tool)
+        code, factor = self.model(tool).sample(rng)
+        self.draws[tool] += 1
+
+        if step is not None and step.get("will_fail") and step.get("tool", tool) == tool:
+            code = step.get("error_code") or "STEP_FAILED"
+            error = step.get("error") or step.get("failure_reason") or ERROR_MESSAGES["STEP_FAILED"]
+        elif code is not None:
+            error = ERROR_MESSAGES.get(code, code).format(tool=tool, line=rng.randint(1, 200))
+        else:
+            return Fault(tool, latency_factor=factor)
+
+        self.failures[tool][code] += 1
+        return Fault(tool, code, error, factor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "draws": dict(self.draws),
+            "failures": {tool: dict(codes) for tool, codes in self.failures.items()}
+        }
+
+
+def _weights(cumulative: list) -> list:
+    return [high - low for low, high in zip([0.0] + cumulative[:-1], cumulative)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draw from the FAULT_PROFILES fault model")
+    parser.add_argument("--calls", type=int, default=10_000, help="Calls per tool")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = FaultInjector.profiled(args.seed)
+    factors: Dict[str, list] = defaultdict(list)
+    for tool in FAULT_PROFILES:
+        for _ in range(args.calls):
+            factors[tool].append(faults.draw(tool).latency_factor)
+
+    print(f"\n{'='*60}")
+    print(f"🎲 PROFILED FAULT MODEL (seed {args.seed}, {args.calls:,} calls per tool)")
+    print(f"{'='*60}")
+    for tool, profile in FAULT_PROFILES.items():
+        failures = faults.failures[tool]
+        observed = sum(failures.values()) / args.calls
+        spread = sorted(factors[tool])
+        print(f"{tool:22} {observed * 100:5.1f}% failed (target {profile['failure_rate'] * 100:3.0f}%), "
+              f"latency x{spread[len(spread) // 20]:.2f}-x{spread[-len(spread) // 20]:.2f} (p5-p95)  "
+              f"{dict(failures)}")
+
+
+if __name__ == "__main__":
+    main()
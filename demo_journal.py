@@ -0,0 +1,373 @@
+"""
+Intervention Journal
+====================
+
+Durable, append-only log of every human intervention:
+1. SQLite in WAL mode; one row per intervention, never rewritten except
+   to record its final outcome
+2. Indexes on session_id, intervention_type and tool for lookups
+3. Summary counters are updated in the same transaction as each insert,
+   so summary() reads a handful of rows no matter how long the journal is
+4. A suggestion_stats table keeps, per failure signature and suggestion,
+   how often humans chose it, how often it resolved the failure and the
+   total recovery time; SuggestionEngine ranks suggestions from it
+5. Writes run on one journal thread, in the order they were queued. It
+   drains every queued write before waking the event loop once for the
+   whole batch, so the async writers (arecord_context, amark_outcome,
+   ...) never stall other sessions on a commit; the plain writers wait
+   for the journal thread and are meant for synchronous code
+6. Reads use a connection of their own on the caller's thread and never
+   wait for a commit: a file journal's readers see the last commit (WAL);
+   the in-memory journal is one shared-cache database that reads
+   uncommitted rows rather than wait on the writer's table locks
+
+The in-memory get_intervention_summary() of HumanInLoopHandler is lost
+on restart; the journal is not.
+
+    journal = InterventionJournal("interventions.db")
+    channel = HumanChannel(responder, journal=journal)
+    await journal.amark_outcome(decision["journal_id"], success=True)
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Mapping
+from enum import Enum
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interventions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    session_id TEXT,
+    intervention_type TEXT NOT NULL,
+    tool TEXT,
+    action TEXT,
+    timed_out INTEGER NOT NULL DEFAULT 0,
+    wait_seconds REAL,
+    success INTEGER,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_interventions_session ON interventions(session_id);
+CREATE INDEX IF NOT EXISTS ix_interventions_type ON interventions(intervention_type);
+CREATE INDEX IF NOT EXISTS ix_interventions_tool ON interventions(tool);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS suggestion_stats (
+    signature TEXT NOT NULL,
+    suggestion TEXT NOT NULL,
+    chosen INTEGER NOT NULL,
+    resolved INTEGER NOT NULL,
+    recovery_seconds REAL NOT NULL,
+    PRIMARY KEY (signature, suggestion)
+);
+"""
+
+_BUMP = "INSERT INTO counters(name, value) VALUES (?, 1) " \
+        "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+
+_MERGE_STATS = "INSERT INTO suggestion_stats VALUES (?, ?, ?, ?, ?) " \
+               "ON CONFLICT(signature, suggestion) DO UPDATE SET " \
+               "chosen = chosen + excluded.chosen, resolved = resolved + excluded.resolved, " \
+               "recovery_seconds = recovery_seconds + excluded.recovery_seconds"
+
+
+_MEMORY_NAMES = itertools.count()
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class InterventionJournal:
+    """Append-only SQLite journal of interventions with O(1) summaries"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        if path == ":memory:":
+            # Both connections must open the same in-memory database
+            self._target = f"file:journal-{next(_MEMORY_NAMES)}?mode=memory&cache=shared"
+        else:
+            self._target = path
+        self._db = self._connect()  # Used only by the journal thread from here on
+        self._reader = sqlite3.connect(self._target, uri=True, check_same_thread=False)
+        if path == ":memory:":
+            self._reader.execute("PRAGMA read_uncommitted=1")
+        self._read_lock = threading.Lock()  # Readers only; the writer never takes it
+        self._writes: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._drain, name="journal", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._target, uri=True, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        db.commit()
+        return db
+
+    def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run the write ``fn`` on the journal thread and wait for it"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._writes.put((fn, args, kwargs, future, None))
+        return future.result()
+
+    async def _acall(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run the write ``fn`` on the journal thread without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writes.put((fn, args, kwargs, future, loop))
+        return await future
+
+    def _drain(self):
+        """Journal thread: run queued writes in batches until close()"""
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            settled: Dict[asyncio.AbstractEventLoop, list] = defaultdict(list)
+            for item in batch:
+                if item is None:
+                    continue
+                fn, args, kwargs, future, loop = item
+                try:
+                    result, error = fn(*args, **kwargs), None
+                except Exception as exc:
+                    result, error = None, exc
+                if loop is not None:
+                    settled[loop].append((future, result, error))
+                elif error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            for loop, outcomes in settled.items():
+                try:
+                    loop.call_soon_threadsafe(_settle, outcomes)
+                except RuntimeError:
+                    pass  # the loop closed; nobody is waiting any more
+            if None in batch:
+                return
+
+    def record(self, intervention_type: str, session_id: Optional[str] = None,
+               tool: Optional[str] = None, action: Optional[str] = None,
+               timed_out: bool = False, wait_seconds: Optional[float] = None,
+               success: Optional[bool] = None, payload: Optional[Dict[str, Any]] = None,
+               auto_resolved: bool = False) -> int:
+        """Append one intervention; returns its journal id"""
+        return self._call(self._insert, intervention_type, session_id, tool, action, timed_out,
+                          wait_seconds, success, payload, auto_resolved)
+
+    async def arecord(self, intervention_type: str, **fields: Any) -> int:
+        """record() for code on the event loop"""
+        return await self._acall(self._insert, intervention_type, **fields)
+
+    def _insert(self, intervention_type: str, session_id: Optional[str] = None,
+                tool: Optional[str] = None, action: Optional[str] = None,
+                timed_out: bool = False, wait_seconds: Optional[float] = None,
+                success: Optional[bool] = None, payload: Optional[Dict[str, Any]] = None,
+                auto_resolved: bool = False) -> int:
+        intervention_type = _plain(intervention_type)
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO interventions(ts, session_id, intervention_type, tool, action, "
+                "timed_out, wait_seconds, success, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), session_id, intervention_type, tool, action, int(timed_out),
+                 wait_seconds, None if success is None else int(success),
+                 json.dumps(payload, default=str) if payload is not None else None)
+            )
+            counters = ["total", f"type:{intervention_type}"]
+            if tool:
+                counters.append(f"tool:{tool}")
+            if action:
+                counters.append(f"action:{action}")
+            if timed_out:
+                counters.append("timed_out")
+            if auto_resolved:
+                counters.append("auto_resolved")
+            if success is not None:
+                counters.append("success" if success else "failure")
+            self._db.executemany(_BUMP, [(name,) for name in counters])
+        return cursor.lastrowid
+
+    def record_context(self, context: Any, decision: Dict[str, Any],
+                       wait_seconds: Optional[float] = None) -> int:
+        """Append an InterventionContext and the human decision for it"""
+        return self.record(**_context_fields(context, decision, wait_seconds))
+
+    async def arecord_context(self, context: Any, decision: Dict[str, Any],
+                              wait_seconds: Optional[float] = None) -> int:
+        """record_context() for code on the event loop"""
+        return await self.arecord(**_context_fields(context, decision, wait_seconds))
+
+    def mark_outcome(self, entry_id: int, success: bool) -> bool:
+        """Record whether the intervention led to success (once per entry)"""
+        return self._call(self._update_outcome, entry_id, success)
+
+    async def amark_outcome(self, entry_id: int, success: bool) -> bool:
+        """mark_outcome() for code on the event loop"""
+        return await self._acall(self._update_outcome, entry_id, success)
+
+    def _update_outcome(self, entry_id: int, success: bool) -> bool:
+        with self._db:
+            cursor = self._db.execute(
+                "UPDATE interventions SET success = ? WHERE id = ? AND success IS NULL",
+                (int(success), entry_id)
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._db.execute(_BUMP, ("success" if success else "failure",))
+        return True
+
+    def record_response(self, entry_id: int, action: str,
+                        response: Optional[Dict[str, Any]] = None) -> bool:
+        """Record the human answer to an intervention already journaled (once per entry)"""
+        return self._call(self._update_response, entry_id, action, response)
+
+    async def arecord_response(self, entry_id: int, action: str,
+                               response: Optional[Dict[str, Any]] = None) -> bool:
+        """record_response() for code on the event loop"""
+        return await self._acall(self._update_response, entry_id, action, response)
+
+    def _update_response(self, entry_id: int, action: str,
+                         response: Optional[Dict[str, Any]]) -> bool:
+        with self._db:
+            row = self._db.execute("SELECT payload FROM interventions WHERE id = ? AND action IS NULL",
+                                   (entry_id,)).fetchone()
+            if row is None:
+                return False
+            payload = json.loads(row[0]) if row[0] else {}
+            if response is not None:
+                payload["response"] = response
+            self._db.execute("UPDATE interventions SET action = ?, payload = ? WHERE id = ?",
+                             (action, json.dumps(payload, default=str), entry_id))
+            self._db.execute(_BUMP, (f"action:{action}",))
+        return True
+
+    def record_suggestion_outcome(self, signature: str, suggestion: str, success: bool,
+                                  recovery_seconds: float):
+        """Count one human choice of ``suggestion`` for a failure signature"""
+        self.merge_suggestion_stats(signature, suggestion, 1, int(success), recovery_seconds)
+
+    async def arecord_suggestion_outcome(self, signature: str, suggestion: str, success: bool,
+                                         recovery_seconds: float):
+        """record_suggestion_outcome() for code on the event loop"""
+        await self._acall(self._merge_stats, signature, suggestion, 1, int(success), recovery_seconds)
+
+    def merge_suggestion_stats(self, signature: str, suggestion: str, chosen: int,
+                               resolved: int, recovery_seconds: float):
+        """Add aggregated outcomes (e.g. imported history) to the statistics"""
+        self._call(self._merge_stats, signature, suggestion, chosen, resolved, recovery_seconds)
+
+    def _merge_stats(self, signature: str, suggestion: str, chosen: int, resolved: int,
+                     recovery_seconds: float):
+        with self._db:
+            self._db.execute(_MERGE_STATS, (signature, suggestion, chosen, resolved,
+                                            recovery_seconds))
+
+    def suggestion_stats(self, signature: str) -> Dict[str, Tuple[int, int, float]]:
+        """suggestion -> (chosen, resolved, total recovery seconds)"""
+        rows = self._fetch("SELECT suggestion, chosen, resolved, recovery_seconds "
+                           "FROM suggestion_stats WHERE signature = ?", (signature,))
+        return {suggestion: (chosen, resolved, seconds) for suggestion, chosen, resolved, seconds in rows}
+
+    def _fetch(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def _counters(self) -> Dict[str, int]:
+        return dict(self._fetch("SELECT name, value FROM counters"))
+
+    def summary(self) -> Dict[str, Any]:
+        """Same shape as HumanInLoopHandler.get_intervention_summary()
+
+        Reads only the counters table, never the interventions themselves.
+        """
+        counters = self._counters()
+        resolved = counters.get("success", 0) + counters.get("failure", 0)
+
+        def group(prefix: str) -> Dict[str, int]:
+            return {name[len(prefix):]: value for name, value in counters.items()
+                    if name.startswith(prefix)}
+
+        return {
+            "total_interventions": counters.get("total", 0),
+            "intervention_types": group("type:"),
+            "tools": group("tool:"),
+            "actions": group("action:"),
+            "timed_out": counters.get("timed_out", 0),
+            "auto_resolved": counters.get("auto_resolved", 0),
+            "success_rate": counters.get("success", 0) / resolved if resolved else 0.0
+        }
+
+    def query(self, session_id: Optional[str] = None, intervention_type: Optional[str] = None,
+              tool: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent interventions matching the (indexed) filters"""
+        clauses, params = [], []
+        for column, value in (("session_id", session_id),
+                              ("intervention_type", _plain(intervention_type)),
+                              ("tool", tool)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._fetch(
+            f"SELECT id, ts, session_id, intervention_type, tool, action, timed_out, "
+            f"wait_seconds, success, payload FROM interventions {where} ORDER BY id DESC LIMIT ?",
+            (*params, limit)
+        )
+        entries = []
+        for row in rows:
+            entry = dict(zip(("id", "ts", "session_id", "intervention_type", "tool", "action",
+                              "timed_out", "wait_seconds", "success", "payload"), row))
+            entry["timed_out"] = bool(entry["timed_out"])
+            if entry["success"] is not None:
+                entry["success"] = bool(entry["success"])
+            entry["payload"] = json.loads(entry["payload"]) if entry["payload"] else None
+            entries.append(entry)
+        return entries
+
+    def close(self):
+        self._writes.put(None)
+        self._writer.join()
+        self._db.close()
+        self._reader.close()
+
+
+def _settle(outcomes: List[Tuple[asyncio.Future, Any, Optional[BaseException]]]):
+    """Resolve one batch of async writes on their event loop"""
+    for future, result, error in outcomes:
+        if future.cancelled():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+def _context_fields(context: Any, decision: Dict[str, Any],
+                    wait_seconds: Optional[float]) -> Dict[str, Any]:
+    """record() arguments for an InterventionContext and its decision"""
+    failed_step = getattr(context, "failed_step", None) or {}
+    return {
+        "intervention_type": _plain(getattr(context, "intervention_type", "unknown")),
+        "session_id": getattr(context, "session_id", None),
+        "tool": failed_step.get("tool") if isinstance(failed_step, Mapping) else None,
+        "action": decision.get("action"),
+        "timed_out": bool(decision.get("timed_out")),
+        "auto_resolved": bool(decision.get("auto_resolved")),
+        "wait_seconds": wait_seconds,
+        "payload": {"error": getattr(context, "error_message", None), "decision": decision}
+    }
@@ -0,0 +1,191 @@
+"""
+Tool Latency Metrics
+====================
+
+Per-tool latency histograms with bounded memory:
+1. Log-bucketed histogram (~4% bucket width, fixed bucket count)
+2. p50 / p95 / p99 plus success and failure counts per tool
+3. Snapshots exportable as JSON or Prometheus text format
+
+Averages hide tail latency (e.g. arXiv timeouts); percentiles do not.
+"""
+
+import json
+import math
+import time
+from typing import Dict, Any, List, Optional
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with a fixed number of buckets
+
+    Bucket i covers [min_value * growth**i, min_value * growth**(i+1)).
+    Values below min_value land in bucket 0, values above max_value in
+    the last bucket, so memory never grows with the number of samples.
+    """
+
+    __slots__ = ("min_value", "max_value", "growth", "_log_growth", "counts",
+                 "count", "total", "minimum", "maximum")
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 3600.0,
+                 buckets_per_doubling: int = 16):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.growth = 2 ** (1.0 / buckets_per_doubling)
+        self._log_growth = math.log(self.growth)
+        size = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        self.counts: List[int] = [0] * size
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int(math.log(value / self.min_value) / self._log_growth)
+        return min(index, len(self.counts) - 1)
+
+    def record(self, value: float):
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Approximate p-th percentile (0-100); None if empty"""
+        if self.count == 0:
+            return None
+        rank = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to observed range
+                value = self.min_value * self.growth ** (index + 0.5)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: "LatencyHistogram"):
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for i, bucket_count in enumerate(other.counts):
+            self.counts[i] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class ToolStats:
+    """Histogram plus outcome counters for one tool"""
+
+    __slots__ = ("histogram", "successes", "failures")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.successes = 0
+        self.failures = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        h = self.histogram
+        return {
+            "count": h.count,
+            "successes": self.successes,
+            "failures": self.failures,
+            "mean": h.mean,
+            "min": h.minimum if h.count else None,
+            "max": h.maximum if h.count else None,
+            "p50": h.percentile(50),
+            "p95": h.percentile(95),
+            "p99": h.percentile(99)
+        }
+
+
+class _Timer:
+    """Context manager returned by ToolMetrics.track()"""
+
+    __slots__ = ("_metrics", "_name", "_start", "success")
+
+    def __init__(self, metrics: "ToolMetrics", name: str):
+        self._metrics = metrics
+        self._name = name
+        self.success = True
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        success = self.success and exc_type is None
+        self._metrics.observe(self._name, time.perf_counter() - self._start, success)
+        return False
+
+
+class ToolMetrics:
+    """Registry of per-tool latency statistics"""
+
+    def __init__(self):
+        self._tools: Dict[str, ToolStats] = {}
+
+    def stats(self, name: str) -> ToolStats:
+        entry = self._tools.get(name)
+        if entry is None:
+            entry = ToolStats()
+            self._tools[name] = entry
+        return entry
+
+    def observe(self, name: str, seconds: float, success: bool = True):
+        entry = self.stats(name)
+        entry.histogram.record(seconds)
+        if success:
+            entry.successes += 1
+        else:
+            entry.failures += 1
+
+    def track(self, name: str) -> _Timer:
+        """Time a block; set ``timer.success = False`` to record a failure"""
+        return _Timer(self, name)
+
+    def reset(self):
+        self._tools.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: entry.to_dict() for name, entry in sorted(self._tools.items())}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, metric: str = "demo_tool_latency_seconds") -> str:
+        """Render as Prometheus text exposition (summary + outcome counters)"""
+        lines = [
+            f"# HELP {metric} Tool execution latency in seconds",
+            f"# TYPE {metric} summary"
+        ]
+        for name, entry in sorted(self._tools.items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            for quantile in (50, 95, 99):
+                value = entry.histogram.percentile(quantile)
+                if value is not None:
+                    lines.append(f'{metric}{{tool="{label}",quantile="{quantile / 100:g}"}} {value:.6g}')
+            lines.append(f'{metric}_sum{{tool="{label}"}} {entry.histogram.total:.6g}')
+            lines.append(f'{metric}_count{{tool="{label}"}} {entry.histogram.count}')
+
+        lines.append("# HELP demo_tool_calls_total Tool calls by outcome")
+        lines.append("# TYPE demo_tool_calls_total counter")
+        for name, entry in sorted(self._tools.items()):
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'demo_tool_calls_total{{tool="{label}",outcome="success"}} {entry.successes}')
+            lines.append(f'demo_tool_calls_total{{tool="{label}",outcome="failure"}} {entry.failures}')
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used by all demo drivers
+tool_metrics = ToolMetrics()
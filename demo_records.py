@@ -0,0 +1,141 @@
+"""
+Compact Step and Intervention Records
+=====================================
+
+Slotted, frozen record types for the hot per-session objects:
+1. StepRecord replaces step dicts (no per-instance key table)
+2. ContextRecord mirrors InterventionContext with the same attribute
+   names, so handlers, the channel and the journal accept either
+3. Enum fields (StepType, InterventionKind) are shared singletons
+4. Plans are interned tuples: every context for the same plan points
+   at one object instead of carrying its own list copy. The intern
+   table keeps only the PLAN_INTERN_LIMIT most recently used plans, and
+   per-session progress (completed_steps) is never interned
+
+StepRecord is also a read-only Mapping, so code written against step
+dicts (step["description"], step.get("tool"), dict(step, ...)) keeps
+working. Unset optional fields are absent from the mapping, exactly as
+a missing dict key would be.
+
+Benchmark: python3 memory_benchmark.py
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from enum import Enum
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+
+class StepType(str, Enum):
+    """Kinds of plan steps"""
+    TOOL_CALL = "TOOL_CALL"
+    API_CALL = "API_CALL"
+    CODE = "CODE"
+    CALCULATION = "CALCULATION"
+    COMPUTATION = "COMPUTATION"
+    DATA_PROCESSING = "DATA_PROCESSING"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class InterventionKind(str, Enum):
+    """Values of InterventionType, usable without the agent package"""
+    TOOL_FAILURE = "tool_failure"
+    PLAN_FAILURE = "plan_failure"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+PLAN_INTERN_LIMIT = 256  # Distinct plans kept shared; least recently used are dropped
+
+_PLANS: "OrderedDict[Tuple[str, ...], Tuple[str, ...]]" = OrderedDict()
+
+
+def intern_plan(plan) -> Tuple[str, ...]:
+    """One shared tuple per distinct plan (among the recently used ones)"""
+    key = tuple(plan)
+    shared = _PLANS.get(key)
+    if shared is not None:
+        _PLANS.move_to_end(key)
+        return shared
+    _PLANS[key] = key
+    if len(_PLANS) > PLAN_INTERN_LIMIT:
+        _PLANS.popitem(last=False)
+    return key
+
+
+@dataclass(frozen=True, slots=True)
+class StepRecord(Mapping):
+    """Immutable plan step with dict-style read access"""
+
+    description: str
+    type: StepType
+    tool: Optional[str] = None
+    id: Optional[str] = None
+    depends_on: Optional[Tuple[str, ...]] = None
+    stage: Optional[str] = None
+    details: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    expected_result: Optional[str] = None
+    will_fail: Optional[bool] = None
+    failure_reason: Optional[str] = None
+    error: Optional[str] = None
+    error_code: Optional[str] = None
+    fallback_tool: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, step: Dict[str, Any]) -> "StepRecord":
+        values = dict(step)
+        values["type"] = StepType(values["type"])
+        if values.get("depends_on") is not None:
+            values["depends_on"] = tuple(values["depends_on"])
+        return cls(**values)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _STEP_FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in _STEP_FIELDS if getattr(self, name) is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+_STEP_FIELDS = tuple(field.name for field in fields(StepRecord))
+
+
+def freeze_steps(steps) -> Tuple[StepRecord, ...]:
+    """Convert step dicts (or records) into a tuple of StepRecords"""
+    return tuple(step if isinstance(step, StepRecord) else StepRecord.from_dict(step)
+                 for step in steps)
+
+
+@dataclass(frozen=True, slots=True)
+class ContextRecord:
+    """Slotted, immutable counterpart of InterventionContext"""
+
+    intervention_type: Enum
+    original_query: str
+    failed_step: Optional[StepRecord] = None
+    error_message: str = ""
+    current_plan: Tuple[str, ...] = ()
+    completed_steps: Tuple[str, ...] = ()
+    session_id: str = ""
+
+    @classmethod
+    def build(cls, intervention_type: Enum, original_query: str,
+              failed_step: Optional[Any] = None, error_message: str = "",
+              current_plan=(), completed_steps=(), session_id: str = "") -> "ContextRecord":
+        """Create a record, sharing the plan tuple and step records"""
+        if failed_step is not None and not isinstance(failed_step, StepRecord):
+            failed_step = StepRecord.from_dict(failed_step)
+        return cls(intervention_type, original_query, failed_step, error_message,
+                   intern_plan(current_plan), tuple(completed_steps), session_id)
@@ -0,0 +1,149 @@
+"""
+Retry Scheduler
+===============
+
+Retries transient tool failures before they reach a fallback or a human:
+1. Only retryable error codes (timeouts, unavailable, rate limited) retry
+2. Delays use exponential backoff with decorrelated jitter:
+       delay = min(max_delay, uniform(base_delay, previous_delay * 3))
+   so synchronized callers spread out instead of retrying in lockstep
+3. Each tool has a retry budget (token bucket): every first attempt
+   deposits ``budget_ratio`` tokens, every retry spends one. When a tool
+   fails for everyone, retries stop at ~budget_ratio of its traffic
+   instead of multiplying the load (no retry storms)
+
+Delays go through the demo clock, so DEMO_TIME_SCALE=0 replays instantly.
+A retry whose delay would outlast the current deadline (demo_deadline.py)
+is not attempted.
+"""
+
+import json
+import random
+from typing import Dict, Any, Awaitable, Callable, Optional, Set
+
+from demo_clock import clock
+from demo_deadline import remaining
+from demo_events import bus, EventKind
+
+
+RETRYABLE_ERRORS: Set[str] = {"NETWORK_TIMEOUT", "SERVICE_UNAVAILABLE", "RATE_LIMITED", "TIMEOUT"}
+
+
+class RetryBudget:
+    """Token bucket of retries, refilled by first attempts rather than time"""
+
+    __slots__ = ("ratio", "capacity", "tokens", "spent", "denied")
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10.0):
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+        self.spent = 0
+        self.denied = 0
+
+    def deposit(self):
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            self.denied += 1
+            return False
+        self.tokens -= 1.0
+        self.spent += 1
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"tokens": round(self.tokens, 2), "spent": self.spent, "denied": self.denied}
+
+
+class RetryScheduler:
+    """Runs a tool call with backoff, jitter and a per-tool retry budget"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 budget_ratio: float = 0.2, budget_capacity: float = 10.0,
+                 retryable: Optional[Set[str]] = None, seed: Optional[int] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_capacity = budget_capacity
+        self.retryable = set(RETRYABLE_ERRORS if retryable is None else retryable)
+        self._rng = random.Random(seed)
+        self._budgets: Dict[str, RetryBudget] = {}
+        self.retries = 0
+        self.recovered = 0
+
+    def budget(self, tool_name: str) -> RetryBudget:
+        """Get (or create) the retry budget for a tool"""
+        budget = self._budgets.get(tool_name)
+        if budget is None:
+            budget = RetryBudget(self.budget_ratio, self.budget_capacity)
+            self._budgets[tool_name] = budget
+        return budget
+
+    def next_delay(self, previous: float) -> float:
+        """Decorrelated jitter: uniform(base, 3 x previous), capped"""
+        return min(self.max_delay, self._rng.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    async def run(self, tool_name: str, attempt: Callable[[], Awaitable[Dict[str, Any]]],
+                  session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Call ``attempt`` until it succeeds, stops being retryable or runs out"""
+        budget = self.budget(tool_name)
+        budget.deposit()
+
+        result = await attempt()
+        retries, delay = 0, self.base_delay
+        while not result.get("success") and result.get("error_code") in self.retryable:
+            if retries >= self.max_retries:
+                break
+            delay = self.next_delay(delay)
+            left = remaining()
+            if left is not None and left <= clock.scaled(delay):
+                result = dict(result, deadline_exceeded=True)
+                break
+            if not budget.withdraw():
+                result = dict(result, retry_budget_exhausted=True)
+                break
+            retries += 1
+            self.retries += 1
+            if bus.enabled:
+                bus.emit(EventKind.TOOL_RETRYING, session_id, tool=tool_name, attempt=retries,
+                         max_retries=self.max_retries, delay=delay, error_code=result.get("error_code"))
+            await clock.sleep(delay)
+            result = await attempt()
+
+        if retries and result.get("success"):
+            self.recovered += 1
+        return dict(result, retry_count=retries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "budgets": {name: budget.to_dict() for name, budget in self._budgets.items()}
+        }
+
+
+def apply_modifications(params: Dict[str, Any], modifications: Any) -> Dict[str, Any]:
+    """Parameters for a human-requested retry
+
+    ``modifications`` is a dict of parameter overrides, or text such as
+    "max_results=5, sort_by=relevance"; any other text is passed along
+    as a ``notes`` parameter.
+    """
+    if isinstance(modifications, dict):
+        return dict(params, **modifications)
+    text = (modifications or "").strip()
+    if not text:
+        return dict(params)
+
+    overrides: Dict[str, Any] = {}
+    for part in text.replace(";", ",").split(","):
+        key, sep, value = part.partition("=")
+        if not sep or not key.strip():
+            return dict(params, notes=text)
+        try:
+            overrides[key.strip()] = json.loads(value.strip())
+        except ValueError:
+            overrides[key.strip()] = value.strip()
+    return dict(params, **overrides)
@@ -0,0 +1,435 @@
+"""
+Demo Scenario Definitions
+=========================
+
+Scenario data shared by the demo drivers and the batch scenario runner:
+- FAILURE_SCENARIOS: step/error pairs for the suggestion demo
+- Plan-failure steps (a dependency graph, see demo_dag.py) and the
+  human-approved recovery plan; "stage" names the WeatherStockPipeline
+  computation behind a step (see demo_timeseries.py); PLAN_STREAMING_STEPS
+  runs the same analysis on streamed record batches
+- QUERY_TABLE: the 100 test queries behind TEST_RESULTS_TABLE.md
+- TOOL_PROFILES: simulated tool latencies (nominal seconds) and rate limits
+"""
+
+from typing import Dict, Any, List, Tuple
+
+from demo_records import StepRecord, StepType, freeze_steps, intern_plan
+
+
+# Simulated tools: display label, nominal latency in seconds and, for the
+# services TOOL_STATISTICS.md reports as rate limited, calls per nominal
+# second ("rate") with a burst allowance
+TOOL_PROFILES: Dict[str, Dict[str, Any]] = {
+    "math_calculator": {"label": "Math Calculator", "latency": 0.3},
+    "geographic_database": {"label": "Geographic Database", "latency": 1.8},
+    "weather_api": {"label": "Weather API", "latency": 2.5},
+    "weather_api_backup": {"label": "Backup Weather API", "latency": 2.7},
+    "translation_api": {"label": "Translation API", "latency": 1.2},
+    "string_processing": {"label": "Array/String Processing", "latency": 0.4},
+    "historical_database": {"label": "Historical Database", "latency": 1.5},
+    "currency_api": {"label": "Currency Exchange API", "latency": 2.1},
+    "scientific_database": {"label": "Scientific Database", "latency": 1.4},
+    "arxiv_search": {"label": "Academic Search (arXiv)", "latency": 3.0},
+    "google_scholar_search": {"label": "Academic Search (Google Scholar)", "latency": 3.2},
+    "news_api": {"label": "News API (Primary)", "latency": 2.8, "rate": 5.0, "burst": 5},
+    "news_api_backup": {"label": "News API (Backup)", "latency": 3.1},
+    "sentiment_api": {"label": "Sentiment Analysis API", "latency": 2.4},
+    "sentiment_backup_model": {"label": "Sentiment Backup Model", "latency": 3.8},
+    "web_scraper": {"label": "Web Scraper", "latency": 2.0, "rate": 2.0, "burst": 2},
+    "cache_cdn": {"label": "Cache/CDN", "latency": 0.8},
+    "encoding_hashing": {"label": "Encoding/Hashing", "latency": 0.2},
+    "statistical_analysis": {"label": "Statistical Analysis", "latency": 4.2},
+    "demographic_database": {"label": "Demographic Database", "latency": 1.9},
+    "time_series_forecasting": {"label": "Time Series Forecasting", "latency": 5.0},
+    "web_search_api": {"label": "Web Search API", "latency": 1.6},
+    "stock_api": {"label": "Stock Market API", "latency": 2.2},
+    "data_processing": {"label": "Data Processing", "latency": 0.6},
+}
+
+
+# Fallback chains from TOOL_STATISTICS.md ("Successful Fallback Chains")
+TOOL_FALLBACKS: Dict[str, List[str]] = {
+    "arxiv_search": ["google_scholar_search"],
+    "news_api": ["news_api_backup"],
+    "sentiment_api": ["sentiment_backup_model"],
+    "web_scraper": ["cache_cdn"],
+    "weather_api": ["weather_api_backup"],
+}
+
+
+# Suggestion demo: one failure per step type
+FAILURE_SCENARIOS: List[Dict[str, Any]] = [
+    {
+        "name": "Code Execution Failure",
+        "step": {
+            "type": "CODE",
+            "description": "Execute Python code to analyze data"
+        },
+        "error": "SyntaxError: invalid syntax on line 42"
+    },
+    {
+        "name": "Search Tool Failure",
+        "step": {
+            "type": "TOOL_CALL",
+            "description": "Search for scientific papers in database"
+        },
+        "error": "SearchError: Database connection timeout"
+    },
+    {
+        "name": "Calculation Failure",
+        "step": {
+            "type": "CALCULATION",
+            "description": "Calculate statistical metrics for dataset"
+        },
+        "error": "ValueError: Input data format mismatch"
+    }
+]
+
+
+# The failures shown by the two YouTube demos
+ARXIV_TIMEOUT_FAILURE: Dict[str, Any] = {
+    "error": "Network timeout: Unable to connect to arxiv_search service after 3 retries",
+    "step_type": "TOOL_CALL",
+    "tool": "arxiv_search",
+    "description": "Search arXiv database for AI research papers"
+}
+DATA_FORMAT_PLAN_FAILURE: Dict[str, Any] = {
+    "error": "Data format incompatibility - cannot correlate hourly weather with daily stock data",
+    "intervention": "plan_failure"
+}
+
+# Plan-failure demo: weather/stock correlation
+PLAN_FAILURE_QUERY = "Analyze the correlation between weather patterns and stock market performance for tech companies in Q4 2024"
+
+INITIAL_PLAN: Tuple[str, ...] = intern_plan([
+    "Fetch weather data for all major tech company locations (Q4 2024)",
+    "Retrieve stock prices for top 50 tech companies (Q4 2024)",
+    "Perform correlation analysis between weather and stock movements",
+    "Generate statistical significance tests",
+    "Create visualization and summary report"
+])
+
+# Weather and stock fetches are independent; everything after the
+# correlation depends on it, so its failure cancels steps 4-5 only
+PLAN_FAILURE_STEPS: Tuple[StepRecord, ...] = freeze_steps([
+    {
+        "id": "weather",
+        "stage": "fetch_weather",
+        "depends_on": [],
+        "description": "Fetch weather data for major tech hubs",
+        "type": "API_CALL",
+        "tool": "weather_api",
+        "details": "Querying weather APIs for SF, Seattle, Austin, NYC",
+        "expected_result": "Weather data retrieved for 4 locations"
+    },
+    {
+        "id": "stocks",
+        "stage": "fetch_stocks",
+        "depends_on": [],
+        "description": "Retrieve stock prices for tech companies",
+        "type": "API_CALL",
+        "tool": "stock_api",
+        "details": "Fetching Q4 2024 data for 50 companies",
+        "expected_result": "Stock price data retrieved"
+    },
+    {
+        "id": "correlation",
+        "stage": "correlate_raw",
+        "depends_on": ["weather", "stocks"],
+        "description": "Perform correlation analysis",
+        "type": "COMPUTATION",
+        "tool": "statistical_analysis",
+        "details": "Cross-correlating weather patterns with stock movements",
+        "will_fail": True,
+        "failure_reason": "Data dimensionality mismatch - weather data is hourly, stock data is daily. Cannot directly correlate without preprocessing."
+    },
+    {
+        "id": "significance",
+        "depends_on": ["correlation"],
+        "description": "Run statistical significance tests",
+        "type": "COMPUTATION",
+        "tool": "statistical_analysis",
+        "details": "p-values for each weather/stock correlation",
+        "expected_result": "Significance tests complete"
+    },
+    {
+        "id": "report",
+        "depends_on": ["significance"],
+        "description": "Create visualization and summary report",
+        "type": "DATA_PROCESSING",
+        "tool": "data_processing",
+        "details": "Charts and written summary of the findings",
+        "expected_result": "Report generated"
+    }
+])
+
+RECOVERY_PLAN: Tuple[str, ...] = intern_plan([
+    "Aggregate hourly weather data to daily averages",
+    "Normalize both datasets to same time granularity",
+    "Perform simplified correlation on daily aggregates",
+    "Focus on major weather events vs stock volatility",
+    "Generate summary with caveats about data limitations"
+])
+
+# The replacement plan binds to the weather/stock fetches that already
+# succeeded; only the new preprocessing and analysis steps execute
+PLAN_RECOVERY_STEPS: Tuple[StepRecord, ...] = freeze_steps([
+    PLAN_FAILURE_STEPS[0],
+    PLAN_FAILURE_STEPS[1],
+    {
+        "id": "aggregate",
+        "stage": "aggregate",
+        "depends_on": ["weather"],
+        "description": "Aggregate hourly weather to daily",
+        "type": "DATA_PROCESSING",
+        "tool": "data_processing",
+        "details": "Converting hourly weather to daily averages",
+        "expected_result": "Daily weather aggregates created"
+    },
+    {
+        "id": "normalize",
+        "stage": "normalize",
+        "depends_on": ["aggregate", "stocks"],
+        "description": "Normalize datasets to daily granularity",
+        "type": "DATA_PROCESSING",
+        "tool": "data_processing",
+        "details": "Aligning weather and stock data by date",
+        "expected_result": "Datasets normalized"
+    },
+    {
+        "id": "daily_correlation",
+        "stage": "correlate",
+        "description": "Simplified correlation analysis",
+        "type": "COMPUTATION",
+        "tool": "statistical_analysis",
+        "details": "Daily correlation between weather and stock volatility",
+        "expected_result": "Correlation coefficients computed"
+    }
+])
+
+
+# The recovery analysis as a streamed plan: the fetch steps emit weekly
+# record batches that the downstream steps consume as they arrive
+PLAN_STREAMING_STEPS: Tuple[StepRecord, ...] = freeze_steps([
+    {
+        "id": "weather_stream",
+        "stage": "stream_weather",
+        "depends_on": [],
+        "description": "Stream hourly weather in weekly batches",
+        "type": "API_CALL",
+        "tool": "weather_api",
+        "details": "Hourly readings for SF, Seattle, Austin, NYC, one week per batch"
+    },
+    {
+        "id": "returns_stream",
+        "stage": "stream_returns",
+        "depends_on": [],
+        "description": "Stream daily stock returns in weekly batches",
+        "type": "API_CALL",
+        "tool": "stock_api",
+        "details": "Log returns for 50 companies, one week per batch"
+    },
+    {
+        "id": "daily_stream",
+        "stage": "stream_daily",
+        "depends_on": ["weather_stream"],
+        "description": "Aggregate each weather batch to daily averages",
+        "type": "DATA_PROCESSING",
+        "tool": "data_processing",
+        "details": "Hourly -> daily means per batch"
+    },
+    {
+        "id": "streamed_correlation",
+        "stage": "stream_correlate",
+        "depends_on": ["daily_stream", "returns_stream"],
+        "description": "Accumulate the correlation batch by batch",
+        "type": "COMPUTATION",
+        "tool": "statistical_analysis",
+        "details": "Running sums only; memory independent of data size"
+    }
+])
+
+# The 100 test queries: (id, query, plan, primary tool, expected result)
+QUERY_TABLE = [
+    (1, 'What is 234 + 567?', ('Parse numbers', 'Perform addition', 'Return result'), 'math_calculator', '801'),
+    (2, 'Find the capital of France', ('Search geographic database', 'Extract capital', 'Return answer'), 'geographic_database', 'Paris'),
+    (3, 'Search arXiv for quantum computing papers', ('Query arXiv API', 'Filter by relevance', 'Format results'), 'arxiv_search', 'Papers retrieved'),
+    (4, 'Calculate factorial of 10', ('Implement factorial function', 'Compute 10!', 'Return result'), 'math_calculator', '3,628,800'),
+    (5, "What's the weather in Tokyo?", ('Call weather API', 'Parse data', 'Format response'), 'weather_api', '18°C, Cloudy'),
+    (6, 'List prime numbers between 1-100', ('Generate range', 'Filter primes', 'Return list'), 'math_calculator', '25 primes found'),
+    (7, 'Translate "Hello" to Spanish', ('Call translation API', 'Get translation', 'Return result'), 'translation_api', '"Hola"'),
+    (8, 'Sort [5,2,8,1,9] in ascending order', ('Parse array', 'Apply sorting algorithm', 'Return sorted'), 'string_processing', '[1,2,5,8,9]'),
+    (9, 'Find square root of 144', ('Parse number', 'Calculate sqrt', 'Return result'), 'math_calculator', '12'),
+    (10, 'What year did WWII end?', ('Search historical database', 'Extract year', 'Return answer'), 'historical_database', '1945'),
+    (11, 'Convert 100 USD to EUR', ('Fetch exchange rate', 'Calculate conversion', 'Return result'), 'currency_api', '€92.50'),
+    (12, 'Count vowels in "education"', ('Parse string', 'Count vowels', 'Return count'), 'string_processing', '5 vowels'),
+    (13, 'Is 17 a prime number?', ('Check divisibility', 'Determine primality', 'Return boolean'), 'math_calculator', 'Yes'),
+    (14, 'Generate Fibonacci sequence (10 terms)', ('Initialize sequence', 'Generate terms', 'Return sequence'), 'math_calculator', '[0,1,1,2,3,5,8,13,21,34]'),
+    (15, 'Find area of circle with radius 5', ('Apply formula πr²', 'Calculate', 'Return area'), 'math_calculator', '78.54'),
+    (16, 'What is the population of India?', ('Query demographic database', 'Get latest data', 'Return population'), 'demographic_database', '~1.4 billion'),
+    (17, 'Reverse the string "hello"', ('Parse string', 'Reverse characters', 'Return result'), 'string_processing', '"olleh"'),
+    (18, 'Calculate 15% of 200', ('Parse percentage', 'Calculate', 'Return result'), 'math_calculator', '30'),
+    (19, 'Find GCD of 48 and 18', ('Apply Euclidean algorithm', 'Calculate GCD', 'Return result'), 'math_calculator', '6'),
+    (20, 'List days of the week', ('Retrieve calendar data', 'Format list', 'Return days'), 'historical_database', '7 days listed'),
+    (21, 'Analyze weather-stock correlation', ('Fetch hourly weather', 'Fetch daily stocks', 'Correlate data'), 'statistical_analysis', 'Correlation computed'),
+    (22, 'What is boiling point of water?', ('Query scientific database', 'Extract temperature', 'Return result'), 'scientific_database', '100°C'),
+    (23, 'Find largest of [5,2,9,1,7]', ('Parse array', 'Find maximum', 'Return result'), 'string_processing', '9'),
+    (24, 'Calculate compound interest', ('Parse parameters', 'Apply formula', 'Return result'), 'math_calculator', 'Calculated'),
+    (25, 'Search for Python tutorials', ('Query search engine', 'Filter results', 'Format response'), 'web_search_api', '50+ results'),
+    (26, 'Convert 32°F to Celsius', ('Apply conversion formula', 'Calculate', 'Return result'), 'math_calculator', '0°C'),
+    (27, 'Find length of "artificial intelligence"', ('Parse string', 'Count characters', 'Return length'), 'string_processing', '24 characters'),
+    (28, 'Is 2024 a leap year?', ('Check leap year rules', 'Determine status', 'Return boolean'), 'math_calculator', 'Yes'),
+    (29, 'Generate random number 1-100', ('Call RNG function', 'Generate number', 'Return result'), 'encoding_hashing', '47'),
+    (30, 'What is speed of light?', ('Query physics constants', 'Extract value', 'Return result'), 'scientific_database', '299,792,458 m/s'),
+    (31, 'Find median of [1,3,5,7,9]', ('Parse array', 'Calculate median', 'Return result'), 'string_processing', '5'),
+    (32, 'Count words in "The quick brown fox"', ('Parse sentence', 'Count words', 'Return count'), 'string_processing', '4 words'),
+    (33, 'Calculate BMI (70kg, 1.75m)', ('Parse parameters', 'Apply formula', 'Return BMI'), 'math_calculator', '22.9'),
+    (34, 'List planets in solar system', ('Query astronomy database', 'Get planet list', 'Return results'), 'scientific_database', '8 planets'),
+    (35, 'Find cube of 5', ('Parse number', 'Calculate 5³', 'Return result'), 'math_calculator', '125'),
+    (36, 'Search academic papers on ML', ('Query academic database', 'Filter by topic', 'Return results'), 'arxiv_search', 'Papers retrieved'),
+    (37, 'Convert miles to kilometers (10 mi)', ('Apply conversion factor', 'Calculate', 'Return result'), 'math_calculator', '16.09 km'),
+    (38, 'Find LCM of 12 and 15', ('Apply LCM algorithm', 'Calculate', 'Return result'), 'math_calculator', '60'),
+    (39, 'Is "racecar" a palindrome?', ('Parse string', 'Check palindrome', 'Return boolean'), 'string_processing', 'Yes'),
+    (40, "What is Planck's constant?", ('Query physics constants', 'Extract value', 'Return result'), 'scientific_database', '6.626×10⁻³⁴ J·s'),
+    (41, 'Calculate standard deviation', ('Parse dataset', 'Apply formula', 'Return result'), 'statistical_analysis', 'Calculated'),
+    (42, "Find ASCII value of 'A'", ('Parse character', 'Get ASCII code', 'Return value'), 'string_processing', '65'),
+    (43, 'List programming languages', ('Query tech database', 'Get popular languages', 'Return list'), 'web_search_api', '20+ languages'),
+    (44, 'Calculate distance (2 coordinates)', ('Parse coordinates', 'Apply distance formula', 'Return result'), 'math_calculator', 'Calculated'),
+    (45, 'What is golden ratio?', ('Query math constants', 'Extract value', 'Return result'), 'scientific_database', '1.618'),
+    (46, 'Find power: 2^10', ('Parse expression', 'Calculate power', 'Return result'), 'math_calculator', '1024'),
+    (47, 'Count consonants in "hello"', ('Parse string', 'Count consonants', 'Return count'), 'string_processing', '3 consonants'),
+    (48, 'Generate UUID', ('Call UUID generator', 'Create unique ID', 'Return UUID'), 'encoding_hashing', 'Generated'),
+    (49, 'Find absolute value of -15', ('Parse number', 'Calculate abs()', 'Return result'), 'math_calculator', '15'),
+    (50, "What is Avogadro's number?", ('Query chemistry constants', 'Extract value', 'Return result'), 'scientific_database', '6.022×10²³'),
+    (51, 'Compare ML frameworks', ('Fetch framework data', 'Compare features', 'Analyze metrics'), 'statistical_analysis', 'Comparison generated'),
+    (52, 'Convert binary 1010 to decimal', ('Parse binary', 'Convert to decimal', 'Return result'), 'math_calculator', '10'),
+    (53, 'Find perimeter of square (side=4)', ('Apply formula 4s', 'Calculate', 'Return result'), 'math_calculator', '16'),
+    (54, 'List chemical elements (first 10)', ('Query periodic table', 'Get elements', 'Return list'), 'scientific_database', 'H to Ne'),
+    (55, 'Calculate ROI for investment', ('Parse investment data', 'Apply ROI formula', 'Return result'), 'math_calculator', 'Calculated'),
+    (56, 'Find mode of [1,2,2,3,4]', ('Parse array', 'Calculate mode', 'Return result'), 'string_processing', '2'),
+    (57, "What is e (Euler's number)?", ('Query math constants', 'Extract value', 'Return result'), 'scientific_database', '2.718'),
+    (58, 'Convert 1GB to MB', ('Apply conversion', 'Calculate', 'Return result'), 'math_calculator', '1024 MB'),
+    (59, 'Find hypotenuse (a=3, b=4)', ('Apply Pythagorean theorem', 'Calculate', 'Return result'), 'math_calculator', '5'),
+    (60, 'Search recent AI breakthroughs', ('Query news APIs', 'Filter AI topics', 'Return results'), 'news_api', 'Articles retrieved'),
+    (61, 'Calculate average of [10,20,30]', ('Parse array', 'Sum and divide', 'Return average'), 'string_processing', '20'),
+    (62, 'Find volume of cube (side=3)', ('Apply formula s³', 'Calculate', 'Return result'), 'math_calculator', '27'),
+    (63, 'List continents', ('Query geography database', 'Get continents', 'Return list'), 'geographic_database', '7 continents'),
+    (64, 'Convert hexadecimal FF to decimal', ('Parse hex', 'Convert to decimal', 'Return result'), 'math_calculator', '255'),
+    (65, 'Find percentage: 25/200', ('Parse values', 'Calculate percentage', 'Return result'), 'math_calculator', '12.5%'),
+    (66, "What is Newton's gravitational constant?", ('Query physics constants', 'Extract G value', 'Return result'), 'scientific_database', '6.674×10⁻¹¹'),
+    (67, 'Generate random password', ('Define parameters', 'Generate secure string', 'Return password'), 'encoding_hashing', 'Generated'),
+    (68, 'Find range of [5,10,3,15,8]', ('Parse array', 'Calculate range', 'Return result'), 'string_processing', '12'),
+    (69, 'Calculate simple interest', ('Parse P,R,T', 'Apply formula', 'Return result'), 'math_calculator', 'Calculated'),
+    (70, 'List oceans of Earth', ('Query geography database', 'Get oceans', 'Return list'), 'geographic_database', '5 oceans'),
+    (71, 'Analyze sentiment of text', ('Parse text', 'Call sentiment API', 'Classify sentiment'), 'sentiment_api', 'Sentiment classified'),
+    (72, 'Find floor of 7.9', ('Parse number', 'Apply floor function', 'Return result'), 'math_calculator', '7'),
+    (73, 'Convert 24hr to 12hr time', ('Parse time format', 'Convert format', 'Return result'), 'string_processing', 'Converted'),
+    (74, 'List Nobel Prize categories', ('Query Nobel database', 'Get categories', 'Return list'), 'historical_database', '6 categories'),
+    (75, 'Find ceil of 4.1', ('Parse number', 'Apply ceiling function', 'Return result'), 'math_calculator', '5'),
+    (76, 'Calculate z-score', ('Parse data point and stats', 'Apply formula', 'Return z-score'), 'statistical_analysis', 'Calculated'),
+    (77, 'Find remainder: 17 mod 5', ('Parse expression', 'Calculate modulo', 'Return result'), 'math_calculator', '2'),
+    (78, 'List largest countries by area', ('Query geography database', 'Sort by area', 'Return top 10'), 'geographic_database', 'Russia, Canada, etc.'),
+    (79, 'Convert radians to degrees (π/2)', ('Apply conversion formula', 'Calculate', 'Return result'), 'math_calculator', '90°'),
+    (80, 'Find sum of digits in 12345', ('Parse number', 'Sum individual digits', 'Return result'), 'math_calculator', '15'),
+    (81, 'Cross-validate multiple datasets', ('Load datasets', 'Merge data', 'Run validation'), 'statistical_analysis', 'Validation complete'),
+    (82, 'Generate multiplication table for 7', ('Initialize loop', 'Generate products', 'Format table'), 'math_calculator', '7×1 to 7×10'),
+    (83, 'Find log base 10 of 1000', ('Parse expression', 'Calculate logarithm', 'Return result'), 'math_calculator', '3'),
+    (84, 'List states in USA', ('Query political database', 'Get state list', 'Return results'), 'geographic_database', '50 states'),
+    (85, 'Calculate variance of dataset', ('Parse dataset', 'Apply variance formula', 'Return result'), 'statistical_analysis', 'Calculated'),
+    (86, 'Find sin(30°)', ('Convert to radians', 'Calculate sine', 'Return result'), 'math_calculator', '0.5'),
+    (87, 'Encode string to Base64', ('Parse string', 'Apply encoding', 'Return encoded'), 'encoding_hashing', 'Encoded'),
+    (88, 'List top 10 most spoken languages', ('Query linguistics database', 'Sort by speakers', 'Return top 10'), 'demographic_database', 'Mandarin, English, etc.'),
+    (89, 'Find cos(60°)', ('Convert to radians', 'Calculate cosine', 'Return result'), 'math_calculator', '0.5'),
+    (90, 'Calculate correlation coefficient', ('Parse two datasets', 'Apply Pearson formula', 'Return r value'), 'statistical_analysis', 'Calculated'),
+    (91, 'Scrape and analyze web data', ('Scrape webpage', 'Parse HTML', 'Extract data'), 'web_scraper', 'Data extracted'),
+    (92, 'Find tan(45°)', ('Convert to radians', 'Calculate tangent', 'Return result'), 'math_calculator', '1'),
+    (93, 'Generate hash (SHA-256) of string', ('Parse string', 'Apply hash function', 'Return hash'), 'encoding_hashing', 'Generated'),
+    (94, 'List largest cities by population', ('Query demographic database', 'Sort by population', 'Return top 10'), 'demographic_database', 'Tokyo, Delhi, etc.'),
+    (95, 'Calculate Euclidean distance', ('Parse coordinates', 'Apply distance formula', 'Return result'), 'math_calculator', 'Calculated'),
+    (96, 'Find natural log of e', ('Parse expression', 'Calculate ln(e)', 'Return result'), 'math_calculator', '1'),
+    (97, 'Multi-step time series forecasting', ('Load historical data', 'Train model', 'Generate forecast'), 'time_series_forecasting', 'Forecast generated'),
+    (98, 'Convert JSON to CSV', ('Parse JSON', 'Extract fields', 'Format as CSV'), 'string_processing', 'Converted'),
+    (99, 'List tallest buildings in world', ('Query architecture database', 'Sort by height', 'Return top 10'), 'historical_database', 'Burj Khalifa, etc.'),
+    (100, 'Calculate matrix determinant', ('Parse matrix', 'Apply determinant formula', 'Return result'), 'math_calculator', 'Calculated'),
+]
+
+# Queries whose primary tool fails and is swapped for a fallback
+TOOL_FAILURES: Dict[int, Dict[str, Any]] = {
+    3: {"error": "Network timeout: Unable to connect to arxiv_search service after 3 retries",
+        "error_code": "NETWORK_TIMEOUT", "fallback_tool": "google_scholar_search",
+        "recovery": "Used Google Scholar"},
+    36: {"error": "Network timeout: Unable to connect to arxiv_search service after 3 retries",
+         "error_code": "NETWORK_TIMEOUT", "fallback_tool": "google_scholar_search",
+         "recovery": "Used backup API"},
+    60: {"error": "API rate limit exceeded", "error_code": "RATE_LIMITED",
+         "fallback_tool": "news_api_backup", "recovery": "Used alternative source"},
+    71: {"error": "Sentiment service unavailable", "error_code": "SERVICE_UNAVAILABLE",
+         "fallback_tool": "sentiment_backup_model", "recovery": "Used backup model"},
+    91: {"error": "API rate limit exceeded", "error_code": "RATE_LIMITED",
+         "fallback_tool": "cache_cdn", "recovery": "Rate limited, used cache"},
+}
+
+# Queries whose plan fails and is replaced by a human-approved plan
+PLAN_FAILURES: Dict[int, Dict[str, Any]] = {
+    21: {"steps": PLAN_FAILURE_STEPS, "recovery_steps": PLAN_RECOVERY_STEPS,
+         "recovery": "Added preprocessing"},
+    51: {"failure_reason": "Too many comparison criteria - analysis did not converge",
+         "recovery": "Simplified criteria",
+         "recovery_steps": [
+             {"description": "Compare frameworks on 3 core criteria", "type": "COMPUTATION",
+              "tool": "statistical_analysis", "expected_result": "Comparison generated"}
+         ]},
+    81: {"failure_reason": "Merged datasets contain missing and malformed values",
+         "recovery": "Added data cleaning step",
+         "recovery_steps": [
+             {"description": "Clean and impute merged data", "type": "DATA_PROCESSING",
+              "tool": "data_processing", "expected_result": "Datasets cleaned"},
+             {"description": "Run validation on cleaned data", "type": "COMPUTATION",
+              "tool": "statistical_analysis", "expected_result": "Validation complete"}
+         ]},
+    97: {"failure_reason": "Forecasting model too complex for available history",
+         "recovery": "Reduced complexity",
+         "recovery_steps": [
+             {"description": "Fit moving-average forecast", "type": "COMPUTATION",
+              "tool": "statistical_analysis", "expected_result": "Forecast generated"}
+         ]},
+}
+
+
+def load_test_scenarios() -> List[Dict[str, Any]]:
+    """Expand QUERY_TABLE into runnable scenario definitions"""
+    scenarios = []
+    for test_id, query, plan, tool, expected in QUERY_TABLE:
+        scenario = {
+            "id": test_id,
+            "query": query,
+            "plan": intern_plan(plan),
+            "expected_result": expected,
+            "kind": "direct",
+            "recovery": None,
+            "recovery_steps": ()
+        }
+
+        if test_id in TOOL_FAILURES:
+            failure = TOOL_FAILURES[test_id]
+            scenario["kind"] = "tool_failure"
+            scenario["recovery"] = failure["recovery"]
+            scenario["steps"] = (StepRecord(
+                plan[0], StepType.TOOL_CALL, tool, will_fail=True, error=failure["error"],
+                error_code=failure["error_code"], fallback_tool=failure["fallback_tool"]
+            ),)
+        elif test_id in PLAN_FAILURES:
+            failure = PLAN_FAILURES[test_id]
+            scenario["kind"] = "plan_failure"
+            scenario["recovery"] = failure["recovery"]
+            scenario["recovery_steps"] = freeze_steps(failure["recovery_steps"])
+            scenario["steps"] = failure.get("steps") or (StepRecord(
+                plan[-1], StepType.COMPUTATION, tool,
+                will_fail=True, failure_reason=failure["failure_reason"]
+            ),)
+        else:
+            scenario["steps"] = (StepRecord(plan[0], StepType.TOOL_CALL, tool),)
+
+        scenarios.append(scenario)
+    return scenarios
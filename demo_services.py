@@ -0,0 +1,186 @@
+"""
+Simulated Service Clients: Rate Limits and Connection Pools
+===========================================================
+
+Every call to a simulated external service goes through that service's
+pool, shared by all sessions on the event loop:
+1. A pool holds a fixed number of clients ("connections"); a call waits
+   for a free one, so the pool size caps concurrency per service
+2. A rate-limited service also has a token bucket (rate tokens per
+   nominal second, up to burst). Waiters are served in arrival order and
+   each waits exactly until its token is due, so concurrent sessions
+   share one quota and use all of it - no fixed sleeps between calls
+
+Rates are nominal and scaled by the demo clock; at DEMO_TIME_SCALE=0
+they do not delay anything.
+
+Run with: python3 demo_services.py  (fixed sleeps vs a shared token bucket)
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Optional
+
+from demo_clock import clock
+
+
+class TokenBucket:
+    """Async token bucket; acquire() waits until a token is available"""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated", "_lock", "granted", "waited")
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.granted = 0
+        self.waited = 0.0  # Nominal seconds spent waiting for tokens
+
+    def _refill(self, now: float):
+        if self._updated is not None and clock.time_scale > 0:
+            elapsed = (now - self._updated) / clock.time_scale
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Take one token, waiting (in arrival order) until it is due"""
+        if clock.time_scale == 0:
+            self.granted += 1
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            self._refill(loop.time())
+            if self._tokens < 1.0:
+                wait = (1.0 - self._tokens) / self.rate
+                self.waited += wait
+                await clock.sleep(wait)
+                self._refill(loop.time())
+                self._tokens = max(self._tokens, 1.0)
+            self._tokens -= 1.0
+            self.granted += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "burst": self.burst, "granted": self.granted,
+                "waited_seconds": round(self.waited, 3)}
+
+
+class PooledClient:
+    """One reusable connection to a service"""
+
+    __slots__ = ("service", "client_id", "calls")
+
+    def __init__(self, service: str, client_id: int):
+        self.service = service
+        self.client_id = client_id
+        self.calls = 0
+
+
+class ServicePool:
+    """Fixed-size client pool for one service, with an optional rate limit"""
+
+    def __init__(self, service: str, size: int = 10, rate: Optional[float] = None, burst: int = 1):
+        self.service = service
+        self.size = size
+        self.limiter = TokenBucket(rate, burst) if rate else None
+        # LIFO hands out the most recently used (warm) client first
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        for client_id in range(size):
+            self._idle.put_nowait(PooledClient(service, client_id))
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.calls = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[PooledClient]:
+        """Borrow a client; with a rate limit, also wait for a token"""
+        client = await self._idle.get()
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.calls += 1
+            client.calls += 1
+            try:
+                yield client
+            finally:
+                self.in_use -= 1
+        finally:
+            self._idle.put_nowait(client)
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = {"size": self.size, "calls": self.calls, "peak_in_use": self.peak_in_use}
+        if self.limiter is not None:
+            stats["rate_limit"] = self.limiter.to_dict()
+        return stats
+
+
+class ServiceRegistry:
+    """One pool per service, created on first use"""
+
+    def __init__(self, size: int = 10, limits: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.size = size
+        self.limits = dict(limits or {})
+        self._pools: Dict[str, ServicePool] = {}
+
+    @classmethod
+    def from_profiles(cls, profiles: Dict[str, Dict[str, Any]], size: int = 10) -> "ServiceRegistry":
+        """Rate limits from tool profiles that declare "rate" (and "burst")"""
+        limits = {name: {"rate": profile["rate"], "burst": profile.get("burst", 1)}
+                  for name, profile in profiles.items() if profile.get("rate")}
+        return cls(size=size, limits=limits)
+
+    def pool(self, service: str) -> ServicePool:
+        pool = self._pools.get(service)
+        if pool is None:
+            limit = self.limits.get(service, {})
+            pool = ServicePool(service, limit.get("pool_size", self.size),
+                               limit.get("rate"), limit.get("burst", 1))
+            self._pools[service] = pool
+        return pool
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.to_dict() for name, pool in sorted(self._pools.items())}
+
+
+async def _fixed_sleeps(calls: int, latency: float, rate: float) -> float:
+    """The old way: one test at a time, sleeping 1/rate after each call"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        await clock.sleep(latency)
+        await clock.sleep(1.0 / rate)
+    return time.perf_counter() - start
+
+
+async def _shared_bucket(calls: int, latency: float, rate: float, sessions: int) -> float:
+    """Concurrent sessions drawing from one pool and one token bucket"""
+    pool = ServicePool("news_api", size=sessions, rate=rate, burst=1)
+
+    async def call():
+        async with pool.acquire():
+            await clock.sleep(latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    return time.perf_counter() - start
+
+
+async def main():
+    calls, latency, rate = 100, 0.05, 50.0
+    fixed = await _fixed_sleeps(calls, latency, rate)
+    shared = await _shared_bucket(calls, latency, rate, sessions=10)
+
+    print(f"\n{'='*60}")
+    print(f"📊 {calls} CALLS TO A SERVICE LIMITED TO {rate:g} CALLS/S")
+    print(f"{'='*60}")
+    print(f"Fixed sleeps:        {fixed:5.2f}s  ({calls / fixed:5.1f} calls/s)")
+    print(f"Shared token bucket: {shared:5.2f}s  ({calls / shared:5.1f} calls/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+Streaming Step Payloads
+=======================
+
+Steps can hand large payloads downstream as a stream of record batches
+instead of one big result:
+
+    producer ──send──> [bounded queue] ──async for──> consumer
+
+The queue holds at most ``maxsize`` batches; a producer that gets ahead
+waits on send() (backpressure), so memory is bounded by batch size x
+queue depth rather than by dataset size.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+
+_END = object()
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class BatchChannel:
+    """Bounded async channel of record batches; iterate it to consume"""
+
+    def __init__(self, maxsize: int = 2):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.sent = 0
+        self.received = 0
+        self.peak_buffered = 0
+        self.task: Optional[asyncio.Task] = None
+
+    async def send(self, batch: Any):
+        """Queue a batch, waiting while the consumer is behind"""
+        await self._queue.put(batch)
+        self.sent += 1
+        if self._queue.qsize() > self.peak_buffered:
+            self.peak_buffered = self._queue.qsize()
+
+    async def close(self):
+        await self._queue.put(_END)
+
+    async def fail(self, exc: BaseException):
+        """End the stream; the consumer re-raises ``exc``"""
+        await self._queue.put(_Failure(exc))
+
+    def cancel(self):
+        """Stop the producer task, e.g. when the consumer gives up"""
+        if self.task is not None:
+            self.task.cancel()
+
+    def __aiter__(self) -> "BatchChannel":
+        return self
+
+    async def __anext__(self) -> Any:
+        item = await self._queue.get()
+        if item is _END:
+            raise StopAsyncIteration
+        if isinstance(item, _Failure):
+            raise item.exc
+        self.received += 1
+        return item
+
+
+def open_stream(source: AsyncIterator[Any], maxsize: int = 2) -> BatchChannel:
+    """Pump an async iterator into a bounded channel on a background task"""
+    channel = BatchChannel(maxsize)
+
+    async def pump():
+        try:
+            async for batch in source:
+                await channel.send(batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            await channel.fail(exc)
+            return
+        await channel.close()
+
+    channel.task = asyncio.ensure_future(pump())
+    return channel
+
+
+def is_stream(value: Any) -> bool:
+    """True for async iterators (stream-producing step outputs)"""
+    return hasattr(value, "__anext__")
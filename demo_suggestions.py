@@ -0,0 +1,294 @@
+"""
+Suggestion Engine
+=================
+
+Recovery suggestions from a data-driven rule table instead of code
+that rebuilds them on every failure:
+1. SUGGESTION_RULES is plain data; each rule lists the conditions it
+   needs (step type, error class, error topic, tool) and its suggestions
+2. The table is compiled once into an index keyed by those conditions
+3. Error topics come from one precompiled regex alternation, so the
+   error text is scanned once however many topics exist
+4. Error signatures are memoized per error text, and suggestions per
+   (intervention, step type, tool, error signature); a repeated failure
+   costs two dict lookups
+5. Given outcome statistics (InterventionJournal.suggestion_stats), the
+   candidates are re-ranked by expected time to recovery: mean recovery
+   time divided by resolution rate, both smoothed towards a prior so an
+   untried suggestion ranks between proven and failing ones
+
+Benchmark with a large synthetic rule set: python3 demo_suggestions.py
+"""
+
+import re
+import time
+from collections import defaultdict
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+
+
+# Error topics: a topic matches when its pattern occurs in the error text
+# or in the failed step's description
+ERROR_TOPICS: Dict[str, str] = {
+    "timeout": r"time[ds]?\s?out",
+    "network": r"network|connect(?:ion)?|unreachable|dns",
+    "rate_limit": r"rate.?limit|too many requests|\b429\b",
+    "auth": r"unauthori[sz]ed|forbidden|api key|\b40[13]\b",
+    "search": r"\bsearch",
+    "syntax": r"syntax|indent|unexpected token",
+    "data_format": r"format|dimension|granularity|incompatib|mismatch",
+    "not_found": r"not found|no results|\b404\b",
+}
+
+# Rules in priority order: earlier rules' suggestions come first
+SUGGESTION_RULES: List[Dict[str, Any]] = [
+    # Tool failures
+    {"intervention": "tool_failure", "when": {"error": "SearchError"}, "suggest": [
+        "Retry the search with a longer timeout",
+        "Query a mirror or alternative database"]},
+    {"intervention": "tool_failure", "when": {"tool": "arxiv_search"}, "suggest": [
+        "Use a fallback service (Google Scholar instead of arXiv)"]},
+    {"intervention": "tool_failure", "when": {"topic": "search"}, "suggest": [
+        "Try different search terms or API endpoints",
+        "Use broader or more specific search criteria",
+        "Search in different sources or databases"]},
+    {"intervention": "tool_failure", "when": {"topic": "network"}, "suggest": [
+        "Gather cached data if available"]},
+    {"intervention": "tool_failure", "when": {"type": "CODE", "error": "SyntaxError"}, "suggest": [
+        "Fix the syntax error at the reported line and re-run",
+        "Run the code through a linter before executing it"]},
+    {"intervention": "tool_failure", "when": {"type": "CODE"}, "suggest": [
+        "Break the code into smaller, testable blocks",
+        "Use a built-in function instead of custom code"]},
+    {"intervention": "tool_failure", "when": {"type": "CALCULATION", "error": "ValueError"}, "suggest": [
+        "Validate and convert the input data before calculating"]},
+    {"intervention": "tool_failure", "when": {"topic": "data_format"}, "suggest": [
+        "Normalize inputs to the format the step expects"]},
+    {"intervention": "tool_failure", "when": {"type": "CALCULATION"}, "suggest": [
+        "Break the calculation into smaller verified steps"]},
+    {"intervention": "tool_failure", "when": {"topic": "rate_limit"}, "suggest": [
+        "Wait for the rate limit window, then retry",
+        "Serve the request from cache"]},
+    {"intervention": "tool_failure", "when": {"topic": "auth"}, "suggest": [
+        "Check the API credentials for this tool"]},
+    {"intervention": "tool_failure", "when": {"topic": "timeout"}, "suggest": [
+        "Retry with a longer timeout"]},
+    {"intervention": "tool_failure", "when": {}, "suggest": [
+        "Use an alternative tool with similar capabilities",
+        "Skip this step and continue"]},
+    # Plan failures
+    {"intervention": "plan_failure", "when": {"topic": "data_format"}, "suggest": [
+        "Add a preprocessing step that aligns the data formats"]},
+    {"intervention": "plan_failure", "when": {}, "suggest": [
+        "Break the problem into smaller, more manageable sub-queries",
+        "Use a completely different approach with simpler tools",
+        "Gather prerequisite information first, then proceed",
+        "Switch to a hybrid manual-automated workflow"]},
+]
+
+# Prior for ranking: an untried suggestion counts as one 50/50 choice
+# that took this long to recover
+RANK_PRIOR_SECONDS = 30.0
+
+# Rule conditions, most selective first; a rule is indexed under its first
+_CONDITIONS = ("tool", "error", "topic", "type")
+
+_ERROR_CLASS = re.compile(r"^\s*([A-Z]\w*(?:Error|Exception|Timeout|Warning))\b")
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class SuggestionEngine:
+    """Rule table compiled into an index, with memoized lookups"""
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None,
+                 topics: Optional[Dict[str, str]] = None, memo_size: int = 4096):
+        self.rules = list(SUGGESTION_RULES if rules is None else rules)
+        self.topics = dict(ERROR_TOPICS if topics is None else topics)
+
+        # One alternation, one named group per topic
+        self._topic_pattern = re.compile(
+            "|".join(f"(?P<{name}>{pattern})" for name, pattern in self.topics.items()),
+            re.IGNORECASE
+        ) if self.topics else None
+
+        # (intervention, condition, value) -> rule indexes; value None = no conditions
+        self._index: Dict[Tuple[str, str, Any], List[int]] = defaultdict(list)
+        for position, rule in enumerate(self.rules):
+            when = rule.get("when", {})
+            unknown = set(when) - set(_CONDITIONS)
+            if unknown:
+                raise ValueError(f"Rule {position} has unknown conditions {sorted(unknown)}")
+            if "topic" in when and when["topic"] not in self.topics:
+                raise ValueError(f"Rule {position} uses unknown topic '{when['topic']}'")
+            key = next(((name, when[name]) for name in _CONDITIONS if name in when), (None, None))
+            self._index[(rule["intervention"], *key)].append(position)
+
+        self._lookup = lru_cache(maxsize=memo_size)(self._compute)
+        self._signature = lru_cache(maxsize=memo_size)(self.error_signature)
+
+    def error_signature(self, error: str, description: str = "") -> Tuple[Optional[str], FrozenSet[str]]:
+        """(error class, topics) - everything the rules can distinguish"""
+        match = _ERROR_CLASS.match(error or "")
+        topics: FrozenSet[str] = frozenset()
+        if self._topic_pattern is not None:
+            text = f"{error or ''}\n{description or ''}"
+            topics = frozenset(m.lastgroup for m in self._topic_pattern.finditer(text))
+        return (match.group(1) if match else None), topics
+
+    def _compute(self, intervention: str, step_type: Optional[str], tool: Optional[str],
+                 error_class: Optional[str], topics: FrozenSet[str]) -> Tuple[str, ...]:
+        facts = {"type": step_type, "tool": tool, "error": error_class}
+        keys = [(intervention, None, None), (intervention, "type", step_type),
+                (intervention, "tool", tool), (intervention, "error", error_class)]
+        keys.extend((intervention, "topic", topic) for topic in topics)
+
+        candidates = sorted({i for key in keys for i in self._index.get(key, ())})
+        suggestions: Dict[str, None] = {}
+        for position in candidates:
+            when = self.rules[position].get("when", {})
+            if all((value in topics) if name == "topic" else facts[name] == value
+                   for name, value in when.items()):
+                suggestions.update(dict.fromkeys(self.rules[position]["suggest"]))
+        return tuple(suggestions)
+
+    def signature(self, error: str, step_type: Optional[str] = None, tool: Optional[str] = None,
+                  description: str = "", intervention: str = "tool_failure") -> str:
+        """Stable text key of a failure, used to file outcome statistics"""
+        error_class, topics = self._signature(error or "", description or "")
+        return "|".join((_plain(intervention), _plain(step_type) or "-", tool or "-",
+                         error_class or "-", ",".join(sorted(topics)) or "-"))
+
+    @staticmethod
+    def expected_recovery(chosen: int, resolved: int, recovery_seconds: float) -> float:
+        """Smoothed mean recovery time / smoothed resolution rate"""
+        rate = (resolved + 1) / (chosen + 2)
+        mean_seconds = (recovery_seconds + RANK_PRIOR_SECONDS) / (chosen + 1)
+        return mean_seconds / rate
+
+    def rank(self, suggestions, stats: Dict[str, Tuple[int, int, float]]) -> List[str]:
+        """Order suggestions by expected time to recovery; rule order breaks ties"""
+        def key(item):
+            position, suggestion = item
+            return self.expected_recovery(*stats.get(suggestion, (0, 0, 0.0))), position
+        return [suggestion for _, suggestion in sorted(enumerate(suggestions), key=key)]
+
+    def suggest(self, error: str, step_type: Optional[str] = None, tool: Optional[str] = None,
+                description: str = "", intervention: str = "tool_failure",
+                limit: Optional[int] = None, stats: Optional[Any] = None) -> List[str]:
+        """Suggestions for one failure, most specific rules first
+
+        With ``stats`` (anything with suggestion_stats(signature), such as
+        an InterventionJournal) they are ranked by past outcomes instead.
+        """
+        error_class, topics = self._signature(error or "", description or "")
+        result = self._lookup(_plain(intervention), _plain(step_type), tool, error_class, topics)
+        if stats is not None:
+            signature = self.signature(error, step_type, tool, description, intervention)
+            result = self.rank(result, stats.suggestion_stats(signature))
+        return list(result[:limit] if limit else result)
+
+    def suggest_for(self, context: Any, limit: Optional[int] = None,
+                    stats: Optional[Any] = None) -> List[str]:
+        """Suggestions for an InterventionContext (or ContextRecord)"""
+        step = getattr(context, "failed_step", None) or {}
+        return self.suggest(
+            error=getattr(context, "error_message", ""),
+            step_type=step.get("type"),
+            tool=step.get("tool"),
+            description=step.get("description", ""),
+            intervention=getattr(context, "intervention_type", "tool_failure"),
+            limit=limit,
+            stats=stats
+        )
+
+    def cache_info(self):
+        return self._lookup.cache_info()
+
+    def clear(self):
+        self._lookup.cache_clear()
+        self._signature.cache_clear()
+
+
+def history_note(outcome: Optional[Tuple[int, int, float]]) -> str:
+    """Short display of one suggestion's track record"""
+    if not outcome or not outcome[0]:
+        return ""
+    chosen, resolved, seconds = outcome
+    return f"resolved {resolved}/{chosen}, ~{seconds / chosen:.0f}s to recover"
+
+
+# Shared engine used by all demo drivers
+suggestion_engine = SuggestionEngine()
+
+
+def _synthetic_rules(count: int) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """A large rule table: per-tool, per-error-class and per-topic rules"""
+    topics = dict(ERROR_TOPICS)
+    topics.update({f"topic{i}": f"\\bkeyword{i}\\b" for i in range(count // 10)})
+    rules = list(SUGGESTION_RULES)
+    for i in range(count):
+        condition = [{"tool": f"tool_{i}"}, {"error": f"Custom{i}Error"},
+                     {"topic": f"topic{i % (count // 10)}"}][i % 3]
+        rules.append({"intervention": "tool_failure", "when": condition,
+                      "suggest": [f"Synthetic suggestion {i}"]})
+    return rules, topics
+
+
+def _naive_suggest(rules, topics, error, step_type, tool, description):
+    """Reference implementation: test every rule, compile every pattern"""
+    match = _ERROR_CLASS.match(error)
+    error_class = match.group(1) if match else None
+    text = f"{error}\n{description}"
+    found = []
+    for rule in rules:
+        ok = rule["intervention"] == "tool_failure"
+        for name, value in rule.get("when", {}).items():
+            if name == "topic":
+                ok = ok and re.search(topics[value], text, re.IGNORECASE) is not None
+            else:
+                ok = ok and {"type": step_type, "tool": tool, "error": error_class}[name] == value
+        if ok:
+            found.extend(s for s in rule["suggest"] if s not in found)
+    return found
+
+
+def main():
+    """Suggestion latency vs rule count: naive scan, index, memoized index"""
+    failure = ("Network timeout: Unable to connect to arxiv_search service",
+               "TOOL_CALL", "arxiv_search", "Search arXiv database for AI research papers")
+    calls = 2000
+
+    print(f"\n{'='*60}")
+    print("📊 SUGGESTION LATENCY (µs per failure)")
+    print(f"{'='*60}")
+    print(f"{'Rules':>6} {'Naive':>10} {'Indexed':>10} {'Memoized':>10}")
+    for count in (10, 100, 500, 1000):
+        rules, topics = _synthetic_rules(count)
+        engine = SuggestionEngine(rules, topics)
+
+        start = time.perf_counter()
+        for _ in range(calls // 10):
+            expected = _naive_suggest(rules, topics, *failure)
+        naive = (time.perf_counter() - start) / (calls // 10)
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            engine._compute("tool_failure", failure[1], failure[2],
+                            *engine.error_signature(failure[0], failure[3]))
+        indexed = (time.perf_counter() - start) / calls
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            result = engine.suggest(failure[0], failure[1], failure[2], failure[3])
+        memoized = (time.perf_counter() - start) / calls
+
+        assert result == expected, "indexed engine disagrees with the naive scan"
+        print(f"{len(rules):>6} {naive*1e6:>10.1f} {indexed*1e6:>10.1f} {memoized*1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
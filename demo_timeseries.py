@@ -0,0 +1,453 @@
+"""
+Weather / Stock Time-Series Engine
+==================================
+
+The real computation behind the plan-failure recovery plan:
+1. Resample hourly weather to daily means (one reduceat per array)
+2. Join weather and stock data on trading dates
+3. Correlate every location with every ticker in one matrix product
+
+All stages are vectorized with NumPy; 4 locations x 50 tickers x a full
+quarter (2,208 hourly readings per location) take a few milliseconds.
+
+The data is synthetic and seeded, so every demo run gives the same
+numbers. Stock returns carry a small negative weather loading so the
+correlation is weak but real.
+
+The stream_* stages compute the same correlation from week-sized record
+batches (see demo_stream.py), so peak memory follows the batch size,
+not the dataset size:
+
+    python3 demo_timeseries.py --locations 200 --tickers 500 --days 365
+"""
+
+import argparse
+import asyncio
+import inspect
+import time
+import tracemalloc
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from demo_stream import open_stream
+
+
+LOCATIONS = ["San Francisco", "Seattle", "Austin", "New York"]
+QUARTER_START = np.datetime64("2024-10-01")
+QUARTER_END = np.datetime64("2025-01-01")
+
+# A trading day has extreme weather when the all-location mean temperature
+# is this many standard deviations away from its quarter mean
+EXTREME_WEATHER_Z = 1.5
+
+# Upper bounds of |r| for each strength label
+CORRELATION_STRENGTHS = ((0.1, "negligible"), (0.3, "weak"), (0.5, "moderate"), (float("inf"), "strong"))
+
+
+def correlation_strength(r: float) -> str:
+    """Plain-words label of a correlation, e.g. 'weak negative'"""
+    label = next(name for bound, name in CORRELATION_STRENGTHS if abs(r) < bound)
+    return label if label == "negligible" else f"{label} {'negative' if r < 0 else 'positive'}"
+
+
+def hourly_timestamps(start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """Every hour in [start, end) as datetime64[h]"""
+    return np.arange(start.astype("datetime64[h]"), end.astype("datetime64[h]"))
+
+
+def trading_days(start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """Weekdays in [start, end) as datetime64[D]"""
+    days = np.arange(start, end, dtype="datetime64[D]")
+    return days[np.is_busday(days)]
+
+
+def resample_daily(values: np.ndarray, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Average (series, hours) readings into (series, days)
+
+    Timestamps must be sorted; days with partial coverage are averaged
+    over the hours that exist.
+    """
+    days = timestamps.astype("datetime64[D]")
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    counts = np.diff(np.r_[starts, len(days)])
+    sums = np.add.reduceat(values, starts, axis=1)
+    return days[starts], sums / counts
+
+
+def align_on_dates(dates_a: np.ndarray, a: np.ndarray,
+                   dates_b: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Inner join of two (series, dates) arrays on their date axis"""
+    dates, index_a, index_b = np.intersect1d(dates_a, dates_b, assume_unique=True,
+                                             return_indices=True)
+    return dates, a[:, index_a], b[:, index_b]
+
+
+def log_returns(dates: np.ndarray, closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Daily log returns; the first date has no return and is dropped"""
+    return dates[1:], np.diff(np.log(closes), axis=1)
+
+
+def batched_correlation(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation of every row of x with every row of y
+
+    x is (m, T), y is (n, T); the result is (m, n). Raises ValueError
+    when the time axes differ, e.g. hourly weather vs daily stocks.
+    """
+    if x.shape[1] != y.shape[1]:
+        raise ValueError(
+            f"Data dimensionality mismatch - {x.shape[1]} vs {y.shape[1]} observations per series"
+        )
+    zx = x - x.mean(axis=1, keepdims=True)
+    zy = y - y.mean(axis=1, keepdims=True)
+    zx /= np.linalg.norm(zx, axis=1, keepdims=True)
+    zy /= np.linalg.norm(zy, axis=1, keepdims=True)
+    return zx @ zy.T
+
+
+class StreamingCorrelation:
+    """Pearson correlation matrix accumulated batch by batch
+
+    Keeps only running sums (O(m*n) memory), shifted by the first
+    batch's means for numerical stability.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._shift_x: Optional[np.ndarray] = None
+        self._shift_y: Optional[np.ndarray] = None
+
+    def update(self, x: np.ndarray, y: np.ndarray):
+        """Add a batch: x is (m, t), y is (n, t) over the same t dates"""
+        if x.shape[1] != y.shape[1]:
+            raise ValueError(
+                f"Data dimensionality mismatch - {x.shape[1]} vs {y.shape[1]} observations per series"
+            )
+        if x.shape[1] == 0:
+            return
+        if self._shift_x is None:
+            self._shift_x = x.mean(axis=1, keepdims=True)
+            self._shift_y = y.mean(axis=1, keepdims=True)
+            self._sx = np.zeros(x.shape[0])
+            self._sy = np.zeros(y.shape[0])
+            self._sxx = np.zeros(x.shape[0])
+            self._syy = np.zeros(y.shape[0])
+            self._sxy = np.zeros((x.shape[0], y.shape[0]))
+        dx = x - self._shift_x
+        dy = y - self._shift_y
+        self._sx += dx.sum(axis=1)
+        self._sy += dy.sum(axis=1)
+        self._sxx += (dx * dx).sum(axis=1)
+        self._syy += (dy * dy).sum(axis=1)
+        self._sxy += dx @ dy.T
+        self.count += x.shape[1]
+
+    def result(self) -> np.ndarray:
+        n = self.count
+        cov = self._sxy - np.outer(self._sx, self._sy) / n
+        var_x = self._sxx - self._sx ** 2 / n
+        var_y = self._syy - self._sy ** 2 / n
+        return cov / np.sqrt(np.outer(var_x, var_y))
+
+
+class WeatherStockPipeline:
+    """Stateful stages of the weather/stock analysis
+
+    Each batch stage stores its output on the pipeline, so the recovery
+    plan can pick up the fetched data without fetching it again. Stream
+    stages return async iterators of batches instead (see arun()).
+
+    Data is generated in batches of ``batch_days`` calendar days; the
+    batch and streaming stages see identical numbers.
+    """
+
+    def __init__(self, tickers: int = 50, locations: Optional[List[str]] = None,
+                 start: np.datetime64 = QUARTER_START, end: np.datetime64 = QUARTER_END,
+                 weather_loading: float = -0.25, seed: int = 2024, batch_days: int = 7):
+        self.tickers = [f"TECH{i:02d}" for i in range(1, tickers + 1)]
+        self.locations = list(locations or LOCATIONS)
+        self.start = start
+        self.end = end
+        self.weather_loading = weather_loading
+        self.seed = seed
+        self.batch_days = batch_days
+
+        # Shared daily weather factor, so the fetch stages can run in any order
+        self.calendar_days = int((end - start).astype(int))
+        self._factor = np.random.default_rng([seed, 0]).normal(0, 1, size=self.calendar_days)
+        self._base = np.random.default_rng([seed, 1]).uniform(8, 18, size=(len(self.locations), 1))
+        self._first_trading_day = trading_days(start, end)[0]
+
+        self.hours: Optional[np.ndarray] = None
+        self.hourly_weather: Optional[np.ndarray] = None
+        self.stock_dates: Optional[np.ndarray] = None
+        self.closes: Optional[np.ndarray] = None
+        self.weather_dates: Optional[np.ndarray] = None
+        self.daily_weather: Optional[np.ndarray] = None
+        self.dates: Optional[np.ndarray] = None
+        self.weather: Optional[np.ndarray] = None
+        self.returns: Optional[np.ndarray] = None
+        self.correlation: Optional[np.ndarray] = None
+        self.observations = 0
+        self.timings: Dict[str, float] = {}
+
+    # -- data sources -------------------------------------------------
+
+    def _windows(self) -> Iterator[Tuple[int, int, int]]:
+        for index, first in enumerate(range(0, self.calendar_days, self.batch_days)):
+            yield index, first, min(first + self.batch_days, self.calendar_days)
+
+    def _weather_batch(self, index: int, first: int, last: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Hourly temperatures for calendar days [first, last)"""
+        hours = hourly_timestamps(self.start + first, self.start + last)
+        hour_of_day = (hours - hours.astype("datetime64[D]")).astype(int)
+        day_index = (hours.astype("datetime64[D]") - self.start).astype(int)
+
+        rng = np.random.default_rng([self.seed, 1, index])
+        local = rng.normal(0, 2, size=(len(self.locations), last - first))
+        diurnal = 4 * np.sin((hour_of_day - 9) / 24 * 2 * np.pi)
+        fronts = 3 * self._factor[day_index] + local[:, day_index - first]
+        noise = rng.normal(0, 1, size=(len(self.locations), len(hours)))
+        return hours, self._base + diurnal + fronts + noise
+
+    def _returns_batch(self, index: int, first: int, last: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Daily log returns for trading days in [first, last)"""
+        dates = trading_days(self.start + first, self.start + last)
+        dates = dates[dates != self._first_trading_day]
+
+        rng = np.random.default_rng([self.seed, 2, index])
+        returns = rng.normal(0.0005, 0.015, size=(len(self.tickers), len(dates)))
+        returns += self.weather_loading * 0.015 * self._factor[(dates - self.start).astype(int)]
+        return dates, returns
+
+    # -- batch stages ---------------------------------------------------
+
+    def fetch_weather(self) -> str:
+        """Hourly temperatures (deg C) for every location"""
+        batches = [self._weather_batch(*window) for window in self._windows()]
+        self.hours = np.concatenate([hours for hours, _ in batches])
+        self.hourly_weather = np.hstack([values for _, values in batches])
+        return f"{len(self.locations)} locations x {len(self.hours)} hourly readings"
+
+    def fetch_stocks(self) -> str:
+        """Daily closes for every ticker; returns load weakly on the weather"""
+        batches = [self._returns_batch(*window) for window in self._windows()]
+        returns = np.hstack([values for _, values in batches])
+
+        self.stock_dates = trading_days(self.start, self.end)
+        closes = 100 * np.exp(np.cumsum(returns, axis=1))
+        self.closes = np.hstack([np.full((len(self.tickers), 1), 100.0), closes])
+        return f"{len(self.tickers)} tickers x {len(self.stock_dates)} trading days"
+
+    def aggregate(self) -> str:
+        """Hourly weather -> daily means"""
+        start = time.perf_counter()
+        self.weather_dates, self.daily_weather = resample_daily(self.hourly_weather, self.hours)
+        self.timings["aggregate"] = time.perf_counter() - start
+        return (f"{self.hourly_weather.shape[1]} hourly -> {self.daily_weather.shape[1]} daily "
+                f"readings per location ({self.timings['aggregate']*1000:.2f} ms)")
+
+    def normalize(self) -> str:
+        """Join daily weather with daily returns on trading dates"""
+        start = time.perf_counter()
+        return_dates, returns = log_returns(self.stock_dates, self.closes)
+        self.dates, self.weather, self.returns = align_on_dates(
+            self.weather_dates, self.daily_weather, return_dates, returns
+        )
+        self.observations = len(self.dates)
+        self.timings["normalize"] = time.perf_counter() - start
+        return (f"{len(self.dates)} shared trading days "
+                f"({self.timings['normalize']*1000:.2f} ms)")
+
+    def correlate(self) -> str:
+        """Correlation of every location with every ticker"""
+        start = time.perf_counter()
+        self.correlation = batched_correlation(self.weather, self.returns)
+        self.timings["correlate"] = time.perf_counter() - start
+        return (f"{self.correlation.size} location/ticker pairs, mean r = "
+                f"{self.correlation.mean():+.2f} ({self.timings['correlate']*1000:.2f} ms)")
+
+    def correlate_raw(self) -> str:
+        """The original plan: correlate hourly weather with daily stocks"""
+        self.correlation = batched_correlation(self.hourly_weather, self.closes)
+        return "Correlated raw data"
+
+    # -- stream stages --------------------------------------------------
+
+    async def stream_weather(self) -> AsyncIterator[Tuple[np.ndarray, np.ndarray]]:
+        """Hourly weather, one (hours, values) batch per window"""
+        for window in self._windows():
+            yield self._weather_batch(*window)
+
+    async def stream_returns(self) -> AsyncIterator[Tuple[np.ndarray, np.ndarray]]:
+        """Daily log returns, one (dates, values) batch per window"""
+        for window in self._windows():
+            yield self._returns_batch(*window)
+
+    async def stream_daily(self, weather: AsyncIterator) -> AsyncIterator[Tuple[np.ndarray, np.ndarray]]:
+        """Hourly batches -> daily means (windows never split a day)"""
+        async for hours, values in weather:
+            yield resample_daily(values, hours)
+
+    async def stream_correlate(self, daily: AsyncIterator, returns: AsyncIterator) -> str:
+        """Join both streams window by window and accumulate the correlation
+
+        Raises ValueError when one stream has more windows than the other.
+        """
+        start = time.perf_counter()
+        accumulator = StreamingCorrelation()
+        returns = returns.__aiter__()
+        windows = 0
+        async for weather_dates, weather in daily:
+            try:
+                return_dates, values = await returns.__anext__()
+            except StopAsyncIteration:
+                raise ValueError(f"Stream length mismatch - returns ended after {windows} windows, "
+                                 f"weather has more") from None
+            windows += 1
+            _, weather, values = align_on_dates(weather_dates, weather, return_dates, values)
+            accumulator.update(weather, values)
+        try:
+            await returns.__anext__()
+        except StopAsyncIteration:
+            pass
+        else:
+            raise ValueError(f"Stream length mismatch - weather ended after {windows} windows, "
+                             f"returns has more")
+
+        self.correlation = accumulator.result()
+        self.observations = accumulator.count
+        self.timings["stream_correlate"] = time.perf_counter() - start
+        return (f"{self.correlation.size} location/ticker pairs over {accumulator.count} days, "
+                f"mean r = {self.correlation.mean():+.2f} (streamed)")
+
+    # -- dispatch -------------------------------------------------------
+
+    def _stage(self, stage: str):
+        method = getattr(self, stage, None)
+        if method is None or stage.startswith("_") or stage in ("run", "arun", "summary"):
+            raise ValueError(f"Unknown pipeline stage '{stage}'")
+        return method
+
+    def run(self, stage: str) -> str:
+        """Run a batch stage by name and return a one-line summary"""
+        return self._stage(stage)()
+
+    async def arun(self, stage: str, *inputs: AsyncIterator) -> Any:
+        """Run any stage; stream stages return an async iterator of batches"""
+        output = self._stage(stage)(*inputs)
+        if inspect.isawaitable(output):
+            output = await output
+        return output
+
+    # Arrays the batch stages leave behind, in stage order
+    STATE_FIELDS = ("hours", "hourly_weather", "stock_dates", "closes", "weather_dates",
+                    "daily_weather", "dates", "weather", "returns", "correlation")
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays computed so far (for a session checkpoint)"""
+        return {name: getattr(self, name) for name in self.STATE_FIELDS
+                if getattr(self, name) is not None}
+
+    def restore(self, state: Dict[str, np.ndarray]):
+        """Pick up arrays saved with state() instead of recomputing them"""
+        for name in self.STATE_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        if self.dates is not None:
+            self.observations = len(self.dates)
+
+    def extreme_weather_volatility(self) -> Optional[Tuple[int, float]]:
+        """(extreme-weather days, return volatility on them / on the other days)
+
+        Needs the joined daily data of the batch stages; None without it
+        or when either group of days is empty.
+        """
+        if self.weather is None or self.returns is None or self.weather.shape[1] != self.returns.shape[1]:
+            return None
+        mean_weather = self.weather.mean(axis=0)
+        z = (mean_weather - mean_weather.mean()) / mean_weather.std()
+        extreme = np.abs(z) > EXTREME_WEATHER_Z
+        if not extreme.any() or extreme.all():
+            return None
+        return int(extreme.sum()), float(self.returns[:, extreme].std() / self.returns[:, ~extreme].std())
+
+    def summary(self) -> Dict[str, Any]:
+        """Headline numbers of the last correlation"""
+        if self.correlation is None:
+            return {}
+        flat = self.correlation.ravel()
+        strongest = int(np.argmin(flat))
+        location, ticker = divmod(strongest, self.correlation.shape[1])
+        return {
+            "mean_correlation": float(flat.mean()),
+            "strength": correlation_strength(float(flat.mean())),
+            "extreme_weather": self.extreme_weather_volatility(),
+            "min_correlation": float(flat.min()),
+            "max_correlation": float(flat.max()),
+            "strongest_pair": (self.locations[location], self.tickers[ticker]),
+            "pairs": int(flat.size),
+            "days": self.observations,
+            "compute_ms": 1000 * sum(self.timings.values())
+        }
+
+
+def _measure(run) -> Tuple[Any, float, float]:
+    """(result, seconds, peak traced MiB) of a zero-argument callable"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main():
+    """Compare peak memory of the batch and streamed correlation"""
+    parser = argparse.ArgumentParser(description="Batch vs streamed weather/stock correlation")
+    parser.add_argument("--locations", type=int, default=len(LOCATIONS))
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=92, help="calendar days from 2024-10-01")
+    parser.add_argument("--batch-days", type=int, default=7)
+    parser.add_argument("--buffer", type=int, default=2, help="batches queued between stages")
+    args = parser.parse_args()
+
+    def pipeline() -> WeatherStockPipeline:
+        locations = LOCATIONS if args.locations == len(LOCATIONS) else [
+            f"Location {i:03d}" for i in range(1, args.locations + 1)
+        ]
+        return WeatherStockPipeline(tickers=args.tickers, locations=locations,
+                                    end=QUARTER_START + args.days, batch_days=args.batch_days)
+
+    def batch():
+        p = pipeline()
+        for stage in ("fetch_weather", "fetch_stocks", "aggregate", "normalize", "correlate"):
+            p.run(stage)
+        return p
+
+    async def streamed():
+        p = pipeline()
+        weather = open_stream(await p.arun("stream_weather"), args.buffer)
+        daily = open_stream(await p.arun("stream_daily", weather), args.buffer)
+        returns = open_stream(await p.arun("stream_returns"), args.buffer)
+        await p.arun("stream_correlate", daily, returns)
+        return p
+
+    batch_result, batch_seconds, batch_peak = _measure(batch)
+    stream_result, stream_seconds, stream_peak = _measure(lambda: asyncio.run(streamed()))
+    drift = float(np.abs(batch_result.correlation - stream_result.correlation).max())
+
+    print(f"\n{'='*60}")
+    print("📊 BATCH vs STREAMED CORRELATION")
+    print(f"{'='*60}")
+    print(f"Data: {args.locations} locations x {args.days * 24} hours, "
+          f"{args.tickers} tickers, {args.batch_days}-day batches")
+    print(f"Batch:    {batch_seconds*1000:8.1f} ms, peak {batch_peak:8.2f} MiB")
+    print(f"Streamed: {stream_seconds*1000:8.1f} ms, peak {stream_peak:8.2f} MiB")
+    print(f"Mean r: {batch_result.summary()['mean_correlation']:+.4f} "
+          f"(max difference {drift:.1e})")
+
+
+if __name__ == "__main__":
+    main()
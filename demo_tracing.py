@@ -0,0 +1,382 @@
+"""
+Stage Timing Spans
+==================
+
+Shows where a session's time goes - tools, humans or rendering:
+1. A span has monotonic start/end times and a parent; the current span
+   lives in a contextvar, so spans opened in child tasks (parallel DAG
+   steps, concurrent sessions) nest under whatever was current when the
+   task was created
+2. The demo drivers mark the Perception -> Decision -> Action ->
+   Human Intervention -> Recovery stages with tracer.stage(); each
+   stage ends where the next one begins. Tool calls, human waits,
+   HumanInLoopHandler calls and event rendering open their own spans
+3. Finished spans export as Chrome trace JSON (chrome://tracing,
+   Perfetto) with one lane per asyncio task, or as folded stacks with
+   self-time in microseconds (flamegraph.pl, speedscope)
+4. An optional sampling profiler records the main thread's Python stack
+   every few milliseconds, prefixed with the current stage; kill -USR1
+   pauses and resumes it while the demo runs
+
+Tracing is off by default; a disabled span is a shared no-op context.
+
+    DEMO_TRACE=trace.json python3 youtube_demo_automated.py      # Chrome trace
+    DEMO_TRACE=trace.folded python3 youtube_demo_plan_failure.py  # folded stacks
+    DEMO_PROFILE=profile.folded python3 youtube_demo_automated.py
+
+Run with: python3 demo_tracing.py  (time by category for the 100 scenarios)
+"""
+
+import asyncio
+import atexit
+import contextlib
+import itertools
+import json
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
+
+SAMPLE_INTERVAL = 0.005  # Seconds between profiler samples
+MAX_SPANS = 100_000  # Spans past this are only counted (dropped), not kept
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Span:
+    """One timed region; ``end`` is None while it is open"""
+
+    __slots__ = ("span_id", "parent", "name", "category", "start", "end", "lane", "args")
+
+    def __init__(self, span_id: int, parent: Optional["Span"], name: str, category: str,
+                 lane: int, args: Dict[str, Any]):
+        self.span_id = span_id
+        self.parent = parent
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.lane = lane
+        self.args = args
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def path(self) -> List[str]:
+        names, span = [], self
+        while span is not None:
+            names.append(span.name.replace(";", ","))
+            span = span.parent
+        return names[::-1]
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_current_stage: ContextVar[Optional[Span]] = ContextVar("current_stage", default=None)
+
+
+def _lane() -> int:
+    """The asyncio task (or, outside a loop, the thread) a span runs on"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, *exc_info):
+        _current_span.reset(self.token)
+        self.tracer._finish(self.span)
+
+
+class Tracer:
+    """Collects spans while enabled"""
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.max_spans = max_spans
+        self.enabled = False
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self.stage_name: Optional[str] = None  # Latest stage, for the profiler
+        self._ids = itertools.count(1)
+        self._open_stages: Dict[int, Span] = {}
+        self._origin = time.perf_counter()
+
+    def start(self) -> "Tracer":
+        self.enabled = True
+        return self
+
+    def stop(self):
+        self.enabled = False
+
+    def reset(self):
+        self.spans.clear()
+        self._open_stages.clear()
+        self.dropped = 0
+        self._origin = time.perf_counter()
+
+    def _open(self, name: str, category: str, parent: Optional[Span], args: Dict[str, Any]) -> Span:
+        return Span(next(self._ids), parent, name, category, _lane(), args)
+
+    def _finish(self, span: Span):
+        if span.end is not None:
+            return
+        span.end = time.perf_counter()
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+    def span(self, name: str, category: str = "span", **args: Any):
+        """Context manager timing a region as a child of the current span"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _SpanContext(self, self._open(name, category, _current_span.get(), args))
+
+    def stage(self, name: str, category: str = "stage", **args: Any):
+        """End the current stage (if any) and start the next one"""
+        if not self.enabled:
+            return
+        previous = _current_stage.get()
+        if previous is not None and previous.end is None:
+            parent = previous.parent
+            self._end_stage(previous)
+        else:
+            parent = _current_span.get()
+        span = self._open(name, category, parent, args)
+        self._open_stages[span.span_id] = span
+        self.stage_name = name
+        _current_stage.set(span)
+        _current_span.set(span)
+
+    def end_stage(self):
+        """End the current stage; later spans nest under its parent again"""
+        stage = _current_stage.get()
+        if stage is None or stage.end is not None:
+            return
+        self._end_stage(stage)
+        _current_stage.set(None)
+        _current_span.set(stage.parent)
+
+    def _end_stage(self, stage: Span):
+        self._open_stages.pop(stage.span_id, None)
+        self._finish(stage)
+        self.stage_name = None
+
+    def _close_open_stages(self):
+        for stage in list(self._open_stages.values()):
+            self._end_stage(stage)
+
+    def self_times(self) -> Dict[int, float]:
+        """Span id -> time not covered by its children (never negative)"""
+        children: Dict[int, float] = defaultdict(float)
+        for span in self.spans:
+            if span.parent is not None:
+                children[span.parent.span_id] += span.duration
+        return {span.span_id: max(0.0, span.duration - children[span.span_id]) for span in self.spans}
+
+    def by_category(self) -> Dict[str, float]:
+        """Self time per category, in seconds, largest first"""
+        self._close_open_stages()
+        self_times = self.self_times()
+        totals: Dict[str, float] = defaultdict(float)
+        for span in self.spans:
+            totals[span.category] += self_times[span.span_id]
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Complete ("X") events, one lane (tid) per task or thread"""
+        self._close_open_stages()
+        pid = os.getpid()
+        lanes: Dict[int, int] = {}
+        events: List[Dict[str, Any]] = []
+        for span in sorted(self.spans, key=lambda s: s.start):
+            tid = lanes.get(span.lane)
+            if tid is None:
+                tid = lanes[span.lane] = len(lanes) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                               "args": {"name": span.name if tid > 1 else "main"}})
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((span.start - self._origin) * 1e6, 1),
+                "dur": round(span.duration * 1e6, 1),
+                "args": {key: str(value) for key, value in span.args.items()}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"dropped_spans": self.dropped}}
+
+    def to_folded(self) -> str:
+        """Folded stacks ("root;child;leaf self_us"), one line per distinct path"""
+        self._close_open_stages()
+        self_times = self.self_times()
+        stacks: Counter = Counter()
+        for span in self.spans:
+            stacks[";".join(span.path())] += int(self_times[span.span_id] * 1e6)
+        return "".join(f"{stack} {micros}\n" for stack, micros in stacks.items() if micros > 0)
+
+    def write(self, path: str):
+        """Chrome trace for *.json, folded stacks otherwise"""
+        with open(path, "w") as f:
+            if path.endswith(".json"):
+                json.dump(self.to_chrome_trace(), f)
+            else:
+                f.write(self.to_folded())
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.main_thread().ident
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def toggle(self) -> bool:
+        """Pause or resume sampling; returns whether it is now running"""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+        return self.running
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if tracer.stage_name:
+                stack.append(f"stage:{tracer.stage_name}")
+            self.samples[";".join(reversed(stack))] += 1
+
+    def to_folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items())
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            f.write(self.to_folded())
+
+
+# Shared by all demo drivers
+tracer = Tracer()
+profiler = SamplingProfiler()
+
+
+def print_breakdown():
+    totals = tracer.by_category()
+    overall = sum(totals.values()) or 1.0
+    print(f"\n⏱️  Time by category ({len(tracer.spans)} spans"
+          f"{f', {tracer.dropped} dropped' if tracer.dropped else ''}):")
+    for category, seconds in totals.items():
+        print(f"   {category:10} {seconds:8.3f}s  {seconds / overall * 100:5.1f}%")
+
+
+def install_from_env():
+    """Turn on tracing (DEMO_TRACE=path) and profiling (DEMO_PROFILE=path)
+
+    Output is written when the process exits; while profiling,
+    SIGUSR1 pauses and resumes the sampler.
+    """
+    trace_path = os.environ.get("DEMO_TRACE")
+    profile_path = os.environ.get("DEMO_PROFILE")
+    if trace_path:
+        tracer.start()
+    if profile_path:
+        # The stage prefix needs stage markers, which need the tracer
+        tracer.start()
+        profiler.start()
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.toggle())
+    if not (trace_path or profile_path):
+        return
+
+    def export():
+        profiler.stop()
+        if trace_path:
+            tracer.write(trace_path)
+            print_breakdown()
+            print(f"📝 Trace written to {trace_path}")
+        if profile_path:
+            profiler.write(profile_path)
+            print(f"📝 {sum(profiler.samples.values())} profiler samples written to {profile_path}")
+
+    atexit.register(export)
+
+
+async def _traced_run(time_scale: float) -> float:
+    from demo_clock import set_time_scale
+    from demo_scenarios import load_test_scenarios
+    from scenario_runner import ScenarioRunner
+
+    set_time_scale(time_scale)
+    runner = ScenarioRunner(workers=10)
+    start = time.perf_counter()
+    await runner.run(load_test_scenarios())
+    return time.perf_counter() - start
+
+
+def main():
+    from demo_events import use_renderer
+    # As a script this module is __main__; the instrumented modules share demo_tracing's tracer
+    from demo_tracing import print_breakdown, tracer
+
+    use_renderer("null")
+    asyncio.run(_traced_run(0))  # Warm-up
+    untraced = min(asyncio.run(_traced_run(0)) for _ in range(5))
+    tracer.start()
+    traced = min(asyncio.run(_traced_run(0)) for _ in range(5))
+    spans = len(tracer.spans) // 5
+    tracer.reset()
+    asyncio.run(_traced_run(0.01))
+    tracer.stop()
+
+    print(f"\n{'='*60}")
+    print("🔎 100 SCENARIOS, TRACED")
+    print(f"{'='*60}")
+    print(f"Overhead at time scale 0: {untraced * 1000:.1f} ms untraced vs {traced * 1000:.1f} ms "
+          f"with {spans} spans ({(traced - untraced) / spans * 1e6:.1f} µs per span)")
+    print_breakdown()
+    base = os.path.join(tempfile.gettempdir(), "scenario_trace")
+    tracer.write(f"{base}.json")
+    tracer.write(f"{base}.folded")
+    print(f"📝 {base}.json (chrome://tracing) and {base}.folded (flamegraph.pl)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Intervention Context Memory Benchmark
+=====================================
+
+Builds N intervention contexts (default 100,000) the way the demos do,
+once with dict/list based contexts and once with the compact records
+from demo_records.py, and reports traced memory for each:
+
+    before -> dataclass context, copied step dict and plan lists
+    after  -> slotted frozen ContextRecord, shared StepRecord and
+              interned plan tuples
+
+Run with: python3 memory_benchmark.py [--contexts 100000]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List, Tuple
+
+from demo_records import ContextRecord, InterventionKind, StepRecord
+from demo_scenarios import INITIAL_PLAN, PLAN_FAILURE_QUERY, PLAN_FAILURE_STEPS
+
+
+@dataclass
+class DictContext:
+    """Shape of agent.human_in_loop.InterventionContext"""
+    intervention_type: InterventionKind
+    original_query: str
+    failed_step: Dict[str, Any] = None
+    error_message: str = ""
+    current_plan: List[str] = field(default_factory=list)
+    completed_steps: List[str] = field(default_factory=list)
+    session_id: str = ""
+
+
+def build_before(count: int) -> List[DictContext]:
+    failed_step = dict(PLAN_FAILURE_STEPS[2])
+    plan = list(INITIAL_PLAN)
+    return [
+        DictContext(
+            intervention_type=InterventionKind.PLAN_FAILURE,
+            original_query=PLAN_FAILURE_QUERY,
+            failed_step=dict(failed_step),
+            error_message=failed_step["failure_reason"],
+            current_plan=list(plan),
+            completed_steps=list(plan[:2]),
+            session_id=f"session-{i:06d}"
+        )
+        for i in range(count)
+    ]
+
+
+def build_after(count: int) -> List[ContextRecord]:
+    failed_step: StepRecord = PLAN_FAILURE_STEPS[2]
+    return [
+        ContextRecord.build(
+            intervention_type=InterventionKind.PLAN_FAILURE,
+            original_query=PLAN_FAILURE_QUERY,
+            failed_step=failed_step,
+            error_message=failed_step["failure_reason"],
+            current_plan=INITIAL_PLAN,
+            completed_steps=INITIAL_PLAN[:2],
+            session_id=f"session-{i:06d}"
+        )
+        for i in range(count)
+    ]
+
+
+def measure(build: Callable[[int], list], count: int) -> Tuple[float, float]:
+    """(MiB retained by the built contexts, build seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    contexts = build(count)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del contexts
+    return retained / 2 ** 20, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory of intervention contexts, before vs after")
+    parser.add_argument("--contexts", type=int, default=100_000)
+    args = parser.parse_args()
+
+    before_mib, before_s = measure(build_before, args.contexts)
+    after_mib, after_s = measure(build_after, args.contexts)
+
+    print(f"\n{'='*60}")
+    print(f"📊 MEMORY: {args.contexts:,} INTERVENTION CONTEXTS")
+    print(f"{'='*60}")
+    print(f"Before (dict/list):      {before_mib:8.1f} MiB  "
+          f"({before_mib * 2 ** 20 / args.contexts:6.0f} B/context, {before_s:.2f}s)")
+    print(f"After (slotted records): {after_mib:8.1f} MiB  "
+          f"({after_mib * 2 ** 20 / args.contexts:6.0f} B/context, {after_s:.2f}s)")
+    print(f"Saved: {before_mib - after_mib:.1f} MiB ({(1 - after_mib / before_mib) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Intervention Performance Benchmark
+==================================
+
+Runs the three intervention paths with DEMO_TIME_SCALE=0 (no simulated
+delays, only the real work) at 1, 100 and 10,000 sessions:
+1. tool_failure   - failing tool call with retries, human channel round
+                    trip with an immediate responder, journal entry,
+                    alternative tool, outcome
+2. suggestions    - ranked suggestions for the FAILURE_SCENARIOS errors,
+                    with journal history
+3. plan_failure   - DAG plan with a failing step, ranked recovery
+                    strategies, recovery plan reusing stored results
+4. fault_load     - every profiled tool at its FAULT_PROFILES
+                    failure rate (demo_faults.py), through retries,
+                    circuit breakers and fallbacks
+
+Faults and retry jitter are seeded (--seed), so two runs with the same
+seed inject the same failures and are comparable.
+
+Every flow/session count runs in its own subprocess (so peak RSS and
+caches are not shared) and reports throughput (sessions/s), p50/p99
+session latency, tracemalloc peak and retained memory (a second pass)
+and peak RSS. Sessions run on at most --concurrency workers. Cases that
+finish in a few milliseconds are repeated and the best run is kept, so
+timer noise does not dominate them.
+
+Results are compared to the committed JSON baseline
+(benchmark_baseline.json); a metric worse than its threshold (relative
+change, plus an absolute floor so noise on tiny numbers does not trip
+it) fails the run with exit code 1, and so does a missing baseline or a
+case the baseline has no entry for. Every run also writes its results
+to benchmark_results.json (local output, not committed).
+
+Run with: python3 perf_benchmark.py [--sessions 1 100 10000] [--flows ...]
+Record a baseline: python3 perf_benchmark.py --write-baseline
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(REPO_DIR, "benchmark_baseline.json")
+OUTPUT_PATH = os.path.join(REPO_DIR, "benchmark_results.json")
+
+SESSION_COUNTS = (1, 100, 10_000)
+MIN_TIMING_SECONDS = 0.5  # Repeat short cases until they ran this long in total
+MAX_TIMING_RUNS = 50
+
+# metric -> (higher is better, allowed relative regression, absolute floor)
+THRESHOLDS: Dict[str, Tuple[bool, float, float]] = {
+    "throughput": (True, 0.25, 0.0),
+    "p99_ms": (False, 0.50, 1.0),
+    "alloc_peak_mib": (False, 0.25, 1.0),
+    "peak_rss_mib": (False, 0.25, 16.0),
+}
+
+DEFAULT_SEED = 7
+
+SessionFlow = Callable[[int], Awaitable[None]]
+
+
+# -- flows ----------------------------------------------------------------
+# Each factory builds the shared state of one run from the seed and
+# returns the coroutine function for session i
+
+def tool_failure_flow(seed: int) -> SessionFlow:
+    from demo_channel import HumanChannel, Responder
+    from demo_executor import ConcurrentToolExecutor
+    from demo_faults import FaultInjector
+    from demo_journal import InterventionJournal
+    from demo_records import ContextRecord, InterventionKind
+    from demo_retry import RetryScheduler
+
+    class ImmediateResponder(Responder):
+        async def respond(self, request):
+            return {"action": "alternative", "alternative_tool": "google_scholar_search",
+                    "alternative_approach": "Use Google Scholar instead of arXiv"}
+
+    step = {"type": "TOOL_CALL", "description": "Search arXiv database for AI research papers",
+            "tool": "arxiv_search", "params": {"query": "artificial intelligence", "max_results": 10}}
+    plan = ("Search arXiv database for AI research papers", "Filter results by relevance score")
+    executor = ConcurrentToolExecutor(tool_latency=0.0,
+                                      faults=FaultInjector.failing({"arxiv_search"}, seed=seed),
+                                      retry=RetryScheduler(seed=seed))
+    journal = InterventionJournal()
+    channel = HumanChannel(ImmediateResponder(), journal=journal)
+
+    async def run(i: int):
+        session_id = f"bench-{i:05d}"
+        result = await executor.execute_tool(step["tool"], step["params"], session_id=session_id)
+        context = ContextRecord.build(InterventionKind.TOOL_FAILURE, "Search for the latest AI papers",
+                                      failed_step=step, error_message=result["error"],
+                                      current_plan=plan, session_id=session_id)
+        decision = await channel.request_intervention(context, error_code=result["error_code"])
+        recovered = await executor.execute_tool(decision["alternative_tool"], {"query": "AI research papers"},
+                                                session_id=session_id)
+        await journal.amark_outcome(decision["journal_id"], recovered["success"])
+
+    return run
+
+
+def suggestions_flow(seed: int) -> SessionFlow:
+    from demo_journal import InterventionJournal
+    from demo_scenarios import FAILURE_SCENARIOS
+    from demo_suggestions import SuggestionEngine
+
+    engine = SuggestionEngine()
+    journal = InterventionJournal()
+
+    async def run(i: int):
+        scenario = FAILURE_SCENARIOS[i % len(FAILURE_SCENARIOS)]
+        engine.suggest(scenario["error"], step_type=scenario["step"]["type"],
+                       tool=scenario["step"].get("tool"), description=scenario["step"]["description"],
+                       limit=5, stats=journal)
+
+    return run
+
+
+def plan_failure_flow(seed: int) -> SessionFlow:
+    from demo_journal import InterventionJournal
+    from demo_scenarios import (
+        DATA_FORMAT_PLAN_FAILURE, PLAN_FAILURE_STEPS, PLAN_RECOVERY_STEPS
+    )
+    from demo_suggestions import SuggestionEngine
+    from youtube_demo_plan_failure import PlanExecutionSimulator
+
+    engine = SuggestionEngine()
+    journal = InterventionJournal()
+
+    async def run(i: int):
+        simulator = PlanExecutionSimulator()
+        await simulator.execute_plan(PLAN_FAILURE_STEPS)
+        engine.suggest(DATA_FORMAT_PLAN_FAILURE["error"], intervention="plan_failure",
+                       limit=4, stats=journal)
+        await simulator.execute_plan(PLAN_RECOVERY_STEPS)
+        if simulator.pipeline.correlation is None:
+            raise RuntimeError("recovery plan did not produce a correlation")
+
+    return run
+
+
+def fault_load_flow(seed: int) -> SessionFlow:
+    from demo_executor import ConcurrentToolExecutor
+    from demo_faults import FAULT_PROFILES, FaultInjector
+    from demo_retry import RetryScheduler
+    from demo_scenarios import TOOL_FALLBACKS
+
+    tools = [tool for tool in FAULT_PROFILES if tool.islower()]  # Tools, not step types
+    executor = ConcurrentToolExecutor(tool_latency=0.0, faults=FaultInjector.profiled(seed),
+                                      fallbacks=TOOL_FALLBACKS, retry=RetryScheduler(seed=seed))
+
+    async def run(i: int):
+        session_id = f"bench-{i:05d}"
+        for tool in tools:
+            await executor.execute_tool(tool, {"query": f"load query {i % 50}"}, session_id=session_id)
+
+    return run
+
+
+FLOWS: Dict[str, Callable[[int], SessionFlow]] = {
+    "tool_failure": tool_failure_flow,
+    "suggestions": suggestions_flow,
+    "plan_failure": plan_failure_flow,
+    "fault_load": fault_load_flow,
+}
+
+
+# -- measurement ------------------------------------------------------------
+
+async def drive(flow: SessionFlow, sessions: int, concurrency: int) -> List[float]:
+    """Run ``sessions`` sessions on ``concurrency`` workers; per-session seconds"""
+    latencies: List[float] = []
+
+    async def worker(first: int, step: int):
+        for i in range(first, sessions, step):
+            start = time.perf_counter()
+            await flow(i)
+            latencies.append(time.perf_counter() - start)
+
+    workers = max(1, min(concurrency, sessions))
+    await asyncio.gather(*(worker(w, workers) for w in range(workers)))
+    return latencies
+
+
+def peak_rss_mib() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # bytes vs KiB
+
+
+def run_case(flow_name: str, sessions: int, concurrency: int, seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Measure one flow at one session count (in this process)"""
+    from demo_clock import set_time_scale
+    from demo_events import use_renderer
+    from demo_metrics import LatencyHistogram
+
+    set_time_scale(0)
+    use_renderer("null")
+    factory = FLOWS[flow_name]
+
+    # Warm-up: imports and first-call costs stay out of the numbers
+    asyncio.run(drive(factory(seed), 1, 1))
+
+    runs: List[Tuple[float, List[float]]] = []
+    while not runs or (sum(run[0] for run in runs) < MIN_TIMING_SECONDS and len(runs) < MAX_TIMING_RUNS):
+        gc.collect()
+        start = time.perf_counter()
+        latencies = asyncio.run(drive(factory(seed), sessions, concurrency))
+        runs.append((time.perf_counter() - start, latencies))
+    elapsed, latencies = min(runs, key=lambda run: run[0])
+
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    # Allocations are traced in a separate pass; tracing slows everything down
+    gc.collect()
+    tracemalloc.start()
+    flow = factory(seed)
+    asyncio.run(drive(flow, sessions, concurrency))
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del flow
+
+    return {
+        "sessions": sessions,
+        "runs": len(runs),
+        "elapsed_s": elapsed,
+        "throughput": sessions / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": histogram.percentile(50) * 1000,
+        "p99_ms": histogram.percentile(99) * 1000,
+        "alloc_peak_mib": peak / 2 ** 20,
+        "alloc_retained_mib": retained / 2 ** 20,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+
+def run_isolated(flow_name: str, sessions: int, concurrency: int, seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """run_case() in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", f"{flow_name}:{sessions}",
+         "--concurrency", str(concurrency), "--seed", str(seed)],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# -- baseline and gates ---------------------------------------------------------
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> List[str]:
+    """Regressions of ``results`` against a baseline, as readable lines"""
+    thresholds = {**THRESHOLDS, **{name: tuple(value) for name, value in baseline.get("thresholds", {}).items()}}
+    regressions = []
+    for case, metrics in results.items():
+        reference = baseline.get("results", {}).get(case)
+        if reference is None:
+            regressions.append(f"{case}: not in the baseline; record it with --write-baseline")
+            continue
+        for metric, (higher_is_better, allowed, floor) in thresholds.items():
+            new, old = metrics.get(metric), reference.get(metric)
+            if new is None or old is None:
+                continue
+            worse = old - new if higher_is_better else new - old
+            if worse > floor and worse > allowed * old:
+                regressions.append(f"{case} {metric}: {old:.2f} -> {new:.2f} "
+                                   f"({worse / old * 100 if old else float('inf'):.0f}% worse, "
+                                   f"allowed {allowed * 100:.0f}%)")
+    return regressions
+
+
+def render(results: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'Case':<22} {'Sessions/s':>11} {'p50 ms':>8} {'p99 ms':>8} "
+             f"{'Alloc MiB':>10} {'Retained':>9} {'RSS MiB':>8}"]
+    for case, m in results.items():
+        rss = f"{m['peak_rss_mib']:8.1f}" if m["peak_rss_mib"] is not None else f"{'n/a':>8}"
+        lines.append(f"{case:<22} {m['throughput']:11.1f} {m['p50_ms']:8.2f} {m['p99_ms']:8.2f} "
+                     f"{m['alloc_peak_mib']:10.2f} {m['alloc_retained_mib']:9.2f} {rss}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intervention path benchmarks with regression gates")
+    parser.add_argument("--flows", nargs="+", choices=sorted(FLOWS), default=list(FLOWS))
+    parser.add_argument("--sessions", nargs="+", type=int, default=list(SESSION_COUNTS))
+    parser.add_argument("--concurrency", type=int, default=100, help="Sessions in flight at once")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for injected faults and retry jitter")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--write-baseline", action="store_true",
+                        help="Save this run as the baseline instead of comparing")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Write this run's results as JSON")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # flow:sessions, used by run_isolated()
+    args = parser.parse_args()
+
+    if args.case:
+        flow_name, sessions = args.case.split(":")
+        print(json.dumps(run_case(flow_name, int(sessions), args.concurrency, args.seed)))
+        return
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for flow_name in args.flows:
+        for sessions in args.sessions:
+            case = f"{flow_name}/{sessions}"
+            print(f"⏱️  {case}...", flush=True)
+            results[case] = run_isolated(flow_name, sessions, args.concurrency, args.seed)
+
+    print(f"\n{'='*60}")
+    print("📊 INTERVENTION BENCHMARK (time scale 0)")
+    print(f"{'='*60}")
+    print(render(results))
+
+    report = {
+        "created": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.write_baseline:
+        report["thresholds"] = THRESHOLDS
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ No baseline at {args.baseline}; record one with --write-baseline")
+        sys.exit(1)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("seed", args.seed) != args.seed:
+        print(f"\n⚠️  Baseline was recorded with --seed {baseline['seed']}; injected faults differ")
+    regressions = compare(results, baseline)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) against {os.path.basename(args.baseline)}:")
+        for line in regressions:
+            print(f"   • {line}")
+        sys.exit(1)
+    print(f"\n✅ No regressions against {os.path.basename(args.baseline)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,545 @@
+"""
+Batch Scenario Runner
+=====================
+
+Runs the 100 test queries from demo_scenarios.py across an asyncio worker
+pool and regenerates the tables in TEST_RESULTS_TABLE.md and
+TOOL_STATISTICS.md from the measured results.
+
+Tool failures are routed to the fallback chain by the executor's
+circuit breakers without a human round-trip. CPU-bound steps (the
+statistical and correlation COMPUTATION steps) run their kernels in a
+warm ComputePool (demo_compute.py), so they do not stall the other
+sessions' tool calls. Only exhausted fallbacks
+and plan failures escalate to a simulated human decision, followed by
+the human-chosen tool or the human-approved recovery steps.
+
+Run with: python3 scenario_runner.py --workers 16 --write
+Instant run (CI): python3 scenario_runner.py --time-scale 0
+Load test with random faults (FAULT_PROFILES rates): python3 scenario_runner.py --time-scale 0 --faults 7
+Compute kernels inline on the loop: python3 scenario_runner.py --compute-workers 0
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional
+
+from demo_clock import clock, set_time_scale
+from demo_compute import ComputePool
+from demo_dag import ResultStore
+from demo_deadline import bounded, deadline
+from demo_events import RENDERERS, use_renderer
+from demo_executor import ConcurrentToolExecutor
+from demo_faults import FaultInjector
+from demo_metrics import LatencyHistogram, tool_metrics
+from demo_scenarios import TOOL_FALLBACKS, TOOL_PROFILES, load_test_scenarios
+from demo_services import ServiceRegistry
+from demo_tracing import tracer
+
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_RESULTS_PATH = os.path.join(REPO_DIR, "TEST_RESULTS_TABLE.md")
+TOOL_STATISTICS_PATH = os.path.join(REPO_DIR, "TOOL_STATISTICS.md")
+
+
+class ScenarioToolExecutor(ConcurrentToolExecutor):
+    """Tool executor whose latency comes from TOOL_PROFILES
+
+    A step's ``will_fail`` flag only fails the step's own tool, so the
+    executor's fallbacks can still succeed. Every individual call is
+    logged per session for the statistics tables.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("faults", FaultInjector())
+        super().__init__(**kwargs)
+        self.calls: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    async def _execute_once(self, tool_name: str, params: Dict[str, Any],
+                            session_id: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = await super()._execute_once(tool_name, params, session_id)
+        self.calls[session_id].append({
+            "tool": tool_name,
+            "success": result["success"],
+            "elapsed": time.perf_counter() - start,
+            "error": result.get("error"),
+            "error_code": result.get("error_code")
+        })
+        return result
+
+    async def _invoke(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        fault = self._draw(tool_name, params)
+        profile = TOOL_PROFILES.get(tool_name, {})
+        await clock.sleep(profile.get("latency", self.tool_latency) * fault.latency_factor)
+
+        if fault.failed:
+            return fault.to_result()
+        return {
+            "success": True,
+            "result": params.get("expected_result") or f"Successfully executed {tool_name}"
+        }
+
+    async def _invoke_compute(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        fault = self._draw(tool_name, params)
+        profile = TOOL_PROFILES.get(tool_name, {})
+        await clock.sleep(profile.get("latency", self.tool_latency) * fault.latency_factor)
+
+        if fault.failed:
+            return fault.to_result()
+        output = await self.compute.run_step(tool_name, params)
+        return {
+            "success": True,
+            "result": params.get("expected_result") or output["summary"],
+            "data": output
+        }
+
+
+class ScenarioRunner:
+    """Runs scenario definitions on a bounded pool of asyncio workers"""
+
+    def __init__(self, workers: int = 10, human_delay: float = 2.0,
+                 max_concurrency_per_tool: int = 50, session_timeout: Optional[float] = None,
+                 faults: Optional[FaultInjector] = None, compute: Optional[ComputePool] = None):
+        self.workers = workers
+        self.human_delay = human_delay
+        self.session_timeout = session_timeout
+        self.executor = ScenarioToolExecutor(
+            max_concurrency_per_tool=max_concurrency_per_tool,
+            fallbacks=TOOL_FALLBACKS,
+            services=ServiceRegistry.from_profiles(TOOL_PROFILES, size=max_concurrency_per_tool),
+            faults=faults or FaultInjector(),
+            compute=compute
+        )
+        self.elapsed = 0.0
+
+    async def run_scenario(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one scenario, recovering via fallback tool or recovery plan"""
+        session_id = f"test-{scenario['id']:03d}"
+        record = {
+            "id": scenario["id"],
+            "query": scenario["query"],
+            "plan": scenario["plan"],
+            "kind": scenario["kind"],
+            "recovery": scenario["recovery"],
+            "expected_result": scenario["expected_result"],
+            "intervened": False,
+            "auto_fallback": None,
+            "success": True,
+            "error": None,
+            "tool_calls": []
+        }
+
+        start = time.perf_counter()
+        with tracer.span("scenario", "session", session=session_id), deadline(self.session_timeout):
+            try:
+                await self._run_steps(scenario, record, session_id)
+            except TimeoutError:
+                record["success"] = False
+                record["error"] = "Session deadline exceeded"
+            finally:
+                tracer.end_stage()
+
+        record["elapsed"] = time.perf_counter() - start
+        record["tool_calls"] = self.executor.calls.pop(session_id, [])
+        return record
+
+    async def _run_steps(self, scenario: Dict[str, Any], record: Dict[str, Any], session_id: str):
+        """Run the scenario's steps, escalating the first failure"""
+        completed = ResultStore()
+        tracer.stage("Action")
+        for step in scenario["steps"]:
+            result = await self.executor.execute_tool(step["tool"], step, session_id=session_id)
+            if result["success"]:
+                completed.put(step, result)
+                record["auto_fallback"] = record["auto_fallback"] or result.get("fallback_used")
+                continue
+
+            record["intervened"] = True
+            record["error"] = result["error"]
+            tracer.stage("Human Intervention", "human")
+            async with bounded():
+                await clock.sleep(self.human_delay)
+            tracer.stage("Recovery")
+
+            if step.get("fallback_tool"):
+                fallback = dict(step, will_fail=False)
+                result = await self.executor.execute_tool(step["fallback_tool"], fallback, session_id=session_id)
+                record["success"] = result["success"]
+            elif scenario["recovery_steps"]:
+                result = {"success": True}
+                for recovery_step in scenario["recovery_steps"]:
+                    if recovery_step in completed:
+                        continue
+                    result = await self.executor.execute_tool(recovery_step["tool"], recovery_step,
+                                                              session_id=session_id)
+                    if not result["success"]:
+                        break
+                record["success"] = result["success"]
+            else:
+                record["success"] = False
+            break
+
+    async def _worker(self, queue: asyncio.Queue, results: List[Dict[str, Any]]):
+        while True:
+            scenario = await queue.get()
+            try:
+                results.append(await self.run_scenario(scenario))
+            finally:
+                queue.task_done()
+
+    async def run(self, scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run all scenarios and return their records ordered by id"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for scenario in scenarios:
+            queue.put_nowait(scenario)
+
+        results: List[Dict[str, Any]] = []
+        start = time.perf_counter()
+        workers = [asyncio.create_task(self._worker(queue, results))
+                   for _ in range(max(1, self.workers))]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        self.elapsed = time.perf_counter() - start
+
+        return sorted(results, key=lambda r: r["id"])
+
+
+def tool_statistics(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Aggregate per-tool uses, failures and execution time percentiles"""
+    stats: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {"uses": 0, "successes": 0, "failures": 0, "success_time": 0.0,
+                 "errors": [], "error_codes": Counter(), "histogram": LatencyHistogram()}
+    )
+    for record in results:
+        for call in record["tool_calls"]:
+            entry = stats[call["tool"]]
+            entry["uses"] += 1
+            if call["success"]:
+                entry["successes"] += 1
+                entry["success_time"] += call["elapsed"]
+                entry["histogram"].record(call["elapsed"])
+            else:
+                entry["failures"] += 1
+                entry["errors"].append(call["error"])
+                entry["error_codes"][call.get("error_code") or "STEP_FAILED"] += 1
+
+    for entry in stats.values():
+        entry["success_rate"] = entry["successes"] / entry["uses"] if entry["uses"] else 0.0
+        entry["avg_time"] = entry["success_time"] / entry["successes"] if entry["successes"] else None
+        for quantile in (50, 95, 99):
+            entry[f"p{quantile}"] = entry["histogram"].percentile(quantile)
+    return dict(stats)
+
+
+def _result_cell(record: Dict[str, Any]) -> str:
+    outcome = "✅ Success" if record["success"] else f"❌ Failed: {record['error']}"
+    if record["auto_fallback"] and not record["intervened"]:
+        return f"🔀 Tool Failure → {record['recovery'] or record['auto_fallback']} (automatic fallback) → {outcome}"
+    if record["kind"] == "tool_failure" and record["intervened"]:
+        return f"🤝 Tool Failure → {record['recovery']} → {outcome}"
+    if record["kind"] == "plan_failure" and record["intervened"]:
+        return f"🤝 Plan Failure → {record['recovery']} → {outcome}"
+    if record["success"]:
+        return f"✅ Success: {record['expected_result']}"
+    return outcome
+
+
+def render_overview(results: List[Dict[str, Any]], elapsed: float, workers: int) -> str:
+    total = len(results)
+    succeeded = sum(1 for r in results if r["success"])
+    direct = sum(1 for r in results if r["success"] and not r["intervened"] and not r["auto_fallback"])
+    auto_routed = [r for r in results if r["auto_fallback"] and not r["intervened"]]
+    tool_failures = [r for r in results if r["kind"] == "tool_failure" and r["intervened"]]
+    plan_failures = [r for r in results if r["kind"] == "plan_failure" and r["intervened"]]
+    avg_time = sum(r["elapsed"] for r in results) / total if total else 0.0
+
+    return "\n".join([
+        f"- **Total Tests**: {total}",
+        f"- **Success Rate**: {succeeded / total * 100:.0f}%" if total else "- **Success Rate**: N/A",
+        f"- **Direct Success**: {direct}",
+        f"- **Automatic Fallbacks**: {len(auto_routed)} "
+        f"({sum(1 for r in auto_routed if r['success'])} recovered without human intervention)",
+        f"- **Tool Failures Escalated**: {len(tool_failures)} "
+        f"({sum(1 for r in tool_failures if r['success'])} recovered via human-in-loop)",
+        f"- **Plan Failures**: {len(plan_failures)} "
+        f"({sum(1 for r in plan_failures if r['success'])} recovered via replanning)",
+        f"- **Average Execution Time**: {avg_time:.2f}s per query",
+        f"- **Batch Wall Time**: {elapsed:.2f}s with {workers} workers "
+        f"(time scale {clock.time_scale:g})"
+    ])
+
+
+def render_results_table(results: List[Dict[str, Any]]) -> str:
+    lines = ["| # | Query | Plan | Result |", "|---|-------|------|--------|"]
+    for record in results:
+        plan = "<br>".join(f"{i}. {step}" for i, step in enumerate(record["plan"], 1))
+        lines.append(f"| {record['id']} | {record['query']} | {plan} | {_result_cell(record)} |")
+    return "\n".join(lines)
+
+
+def render_tool_table(stats: Dict[str, Dict[str, Any]]) -> str:
+    lines = [
+        "| Tool Name | Total Uses | Successes | Failures | Success Rate | Avg Execution Time | p50 | p95 | p99 |",
+        "|-----------|------------|-----------|----------|--------------|-------------------|-----|-----|-----|"
+    ]
+    ordered = sorted(stats.items(), key=lambda item: (-item[1]["uses"], item[0]))
+    for tool_name, entry in ordered:
+        label = TOOL_PROFILES.get(tool_name, {}).get("label", tool_name)
+        times = [f"{entry[key]:.2f}s" if entry[key] is not None else "N/A"
+                 for key in ("avg_time", "p50", "p95", "p99")]
+        lines.append(
+            f"| **{label}** | {entry['uses']} | {entry['successes']} | {entry['failures']} | "
+            f"{entry['success_rate'] * 100:.0f}% | {' | '.join(times)} |"
+        )
+    return "\n".join(lines)
+
+
+def render_tool_summary(stats: Dict[str, Dict[str, Any]]) -> str:
+    total_uses = sum(e["uses"] for e in stats.values())
+    total_time = sum(e["success_time"] for e in stats.values())
+    total_successes = sum(e["successes"] for e in stats.values())
+    perfect = sum(1 for e in stats.values() if e["failures"] == 0)
+    avg_rate = sum(e["success_rate"] for e in stats.values()) / len(stats) if stats else 0.0
+    avg_time = total_time / total_successes if total_successes else 0.0
+
+    return "\n".join([
+        f"- **Total Unique Tools**: {len(stats)}",
+        f"- **Total Tool Calls**: {total_uses}",
+        f"- **Average Success Rate**: {avg_rate * 100:.1f}%",
+        f"- **Tools with 100% Success**: {perfect}",
+        f"- **Tools Requiring Fallbacks**: {len(stats) - perfect}",
+        f"- **Average Execution Time**: {avg_time:.2f}s"
+    ])
+
+
+def _label(tool_name: str) -> str:
+    return TOOL_PROFILES.get(tool_name, {}).get("label", tool_name)
+
+
+def _outcome(record: Dict[str, Any]) -> str:
+    """How a scenario was handled: direct, fallback, human tool swap or replanning"""
+    if record["auto_fallback"] and not record["intervened"]:
+        return "Automatic fallback"
+    if record["intervened"]:
+        return "Human tool swap" if record["kind"] == "tool_failure" else "Replanning"
+    return "Direct"
+
+
+def _first_error(record: Dict[str, Any]) -> str:
+    failed = next((call for call in record["tool_calls"] if not call["success"]), None)
+    return (failed or {}).get("error") or record["error"] or "N/A"
+
+
+def render_recoveries(results: List[Dict[str, Any]]) -> str:
+    lines = ["| # | Query | Failure | Recovery | Handled By | Result |",
+             "|---|-------|---------|----------|------------|--------|"]
+    for record in results:
+        outcome = _outcome(record)
+        if outcome == "Direct":
+            continue
+        recovery = record["recovery"] or _label(record["auto_fallback"])
+        result = "✅ Success" if record["success"] else f"❌ {record['error']}"
+        lines.append(f"| {record['id']} | {record['query']} | {_first_error(record)} | "
+                     f"{recovery} | {outcome} | {result} |")
+    return "\n".join(lines)
+
+
+def render_execution_time(results: List[Dict[str, Any]]) -> str:
+    by_outcome: Dict[str, List[float]] = defaultdict(list)
+    for record in results:
+        by_outcome[_outcome(record)].append(record["elapsed"])
+
+    lines = ["| Handled By | Tests | Avg Time | Max Time |", "|------------|-------|----------|----------|"]
+    for outcome in ("Direct", "Automatic fallback", "Human tool swap", "Replanning"):
+        times = by_outcome.get(outcome)
+        if times:
+            lines.append(f"| {outcome} | {len(times)} | {sum(times) / len(times):.2f}s | {max(times):.2f}s |")
+    return "\n".join(lines)
+
+
+def _reason(error_code: str) -> str:
+    return error_code.replace("_", " ").capitalize()
+
+
+def render_failure_analysis(stats: Dict[str, Dict[str, Any]]) -> str:
+    failing = sorted(((name, entry) for name, entry in stats.items() if entry["failures"]),
+                     key=lambda item: (item[1]["success_rate"], -item[1]["failures"], item[0]))
+    if not failing:
+        return "No tool failed in this run."
+
+    sections = []
+    for rank, (tool_name, entry) in enumerate(failing, 1):
+        fallbacks = TOOL_FALLBACKS.get(tool_name)
+        recovery = (f"Automatic fallback to {', '.join(_label(f) for f in fallbacks)}"
+                    if fallbacks else "Human-approved recovery plan")
+        sections.append("\n".join([
+            f"#### {rank}. {_label(tool_name)}",
+            f"- **Success Rate**: {entry['success_rate'] * 100:.0f}% ({entry['successes']}/{entry['uses']})",
+            f"- **Failures**: {entry['failures']}",
+            "- **Failure Reasons**:",
+            *(f"  - {_reason(code)} ({count} case{'s' if count != 1 else ''})"
+              for code, count in entry["error_codes"].most_common()),
+            f"- **Recovery Strategy**: {recovery}"
+        ]))
+    return "\n\n".join(sections)
+
+
+def render_fallback_chains(stats: Dict[str, Dict[str, Any]]) -> str:
+    lines = ["| Primary Tool | Uses | Failure Rate | Fallback Tool | Fallback Uses | Fallback Success |",
+             "|--------------|------|--------------|---------------|---------------|------------------|"]
+    for tool_name, fallbacks in TOOL_FALLBACKS.items():
+        primary = stats.get(tool_name)
+        if not primary:
+            continue
+        for fallback in fallbacks:
+            entry = stats.get(fallback)
+            success = f"{entry['success_rate'] * 100:.0f}%" if entry else "N/A"
+            lines.append(f"| {_label(tool_name)} | {primary['uses']} | "
+                         f"{(1 - primary['success_rate']) * 100:.0f}% | {_label(fallback)} | "
+                         f"{entry['uses'] if entry else 0} | {success} |")
+    return "\n".join(lines)
+
+
+# (heading, lowest success rate, usage advice) from most to least reliable
+RELIABILITY_TIERS = (
+    ("Tier 1: Production-Ready (95-100% success)", 0.95, "Use without fallbacks"),
+    ("Tier 2: Reliable with Fallback (70-94% success)", 0.70, "Use with one fallback"),
+    ("Tier 3: Needs Multiple Fallbacks (50-69% success)", 0.50, "Use with 2+ fallbacks"),
+    ("Tier 4: Unreliable - Avoid as Primary (0-49% success)", 0.0,
+     "Only use as fallback or with major alternatives"),
+)
+
+
+def render_reliability_tiers(stats: Dict[str, Dict[str, Any]]) -> str:
+    tiers: List[List[str]] = [[] for _ in RELIABILITY_TIERS]
+    for tool_name, entry in sorted(stats.items(), key=lambda item: (-item[1]["success_rate"], item[0])):
+        index = next(i for i, (_, floor, _) in enumerate(RELIABILITY_TIERS) if entry["success_rate"] >= floor)
+        tiers[index].append(f"- {_label(tool_name)} ({entry['success_rate'] * 100:.0f}%)")
+
+    sections = []
+    for (heading, _, advice), tools in zip(RELIABILITY_TIERS, tiers):
+        sections.append("\n".join([f"### {heading}", *(tools or ["- None"]), "",
+                                    f"**Total**: {len(tools)} tool{'s' if len(tools) != 1 else ''} | **{advice}**"]))
+    return "\n\n".join(sections)
+
+
+def render_intervention_impact(results: List[Dict[str, Any]]) -> str:
+    auto_routed = [r for r in results if _outcome(r) == "Automatic fallback"]
+    escalated = [r for r in results if r["intervened"]]
+    recovered = [r for r in auto_routed + escalated if r["success"]]
+    handled = len(auto_routed) + len(escalated)
+    avg_time = sum(r["elapsed"] for r in recovered) / len(recovered) if recovered else 0.0
+    return "\n".join([
+        f"- **Tool Failures Recovered Without Intervention**: {len(auto_routed)}",
+        f"- **Failures Escalated to Human-in-Loop**: {len(escalated)}",
+        f"- **Recovery Success Rate**: {len(recovered) / handled * 100:.0f}%" if handled
+        else "- **Recovery Success Rate**: N/A",
+        f"- **Average Time of Recovered Queries**: {avg_time:.2f}s"
+    ])
+
+
+def replace_section(path: str, name: str, content: str):
+    """Replace the text between GENERATED markers in a markdown file"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    pattern = re.compile(
+        rf"(<!-- BEGIN GENERATED: {re.escape(name)} -->\n).*?(\n<!-- END GENERATED: {re.escape(name)} -->)",
+        re.DOTALL
+    )
+    if not pattern.search(text):
+        raise ValueError(f"No GENERATED section '{name}' in {path}")
+    text = pattern.sub(lambda m: m.group(1) + content + m.group(2), text)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_reports(results: List[Dict[str, Any]], elapsed: float, workers: int):
+    """Regenerate the measured sections of both markdown reports"""
+    stats = tool_statistics(results)
+    replace_section(TEST_RESULTS_PATH, "overview", render_overview(results, elapsed, workers))
+    replace_section(TEST_RESULTS_PATH, "results-table", render_results_table(results))
+    replace_section(TEST_RESULTS_PATH, "recoveries", render_recoveries(results))
+    replace_section(TEST_RESULTS_PATH, "execution-time", render_execution_time(results))
+    replace_section(TOOL_STATISTICS_PATH, "tool-table", render_tool_table(stats))
+    replace_section(TOOL_STATISTICS_PATH, "failure-analysis", render_failure_analysis(stats))
+    replace_section(TOOL_STATISTICS_PATH, "fallback-chains", render_fallback_chains(stats))
+    replace_section(TOOL_STATISTICS_PATH, "reliability-tiers", render_reliability_tiers(stats))
+    replace_section(TOOL_STATISTICS_PATH, "tool-summary", render_tool_summary(stats))
+    replace_section(TOOL_STATISTICS_PATH, "intervention-impact", render_intervention_impact(results))
+
+
+async def main(workers: int = 10, write: bool = False, metrics_format: Optional[str] = None,
+               session_timeout: Optional[float] = None, fault_seed: Optional[int] = None,
+               compute_workers: Optional[int] = None):
+    faults = FaultInjector.profiled(fault_seed) if fault_seed is not None else None
+    compute = await ComputePool(workers=compute_workers).start()
+    runner = ScenarioRunner(workers=workers, session_timeout=session_timeout, faults=faults,
+                            compute=compute)
+    try:
+        results = await runner.run(load_test_scenarios())
+    finally:
+        compute.shutdown()
+
+    print(f"\n{'='*60}")
+    print("📊 SCENARIO RUN SUMMARY")
+    print(f"{'='*60}")
+    print(render_overview(results, runner.elapsed, workers))
+    print()
+    print(render_tool_table(tool_statistics(results)))
+    stats = compute.stats()
+    print(f"\n🧮 Compute pool ({stats['workers']} workers): {stats['steps']} CPU-bound steps, "
+          f"{stats['busy_seconds']:.2f}s of work, {stats['shared_bytes'] / 2 ** 20:.1f} MiB via shared memory")
+    if faults is not None:
+        breakers = runner.executor.throughput_report()["circuit_breakers"]
+        print(f"\n🎲 Profiled faults (seed {fault_seed}): "
+              f"{sum(sum(codes.values()) for codes in faults.failures.values())} injected, "
+              f"{sum(b['times_opened'] for b in breakers.values())} breaker trips")
+
+    if metrics_format == "json":
+        print(f"\n{tool_metrics.to_json()}")
+    elif metrics_format == "prometheus":
+        print(f"\n{tool_metrics.to_prometheus()}")
+
+    if write:
+        write_reports(results, runner.elapsed, workers)
+        print(f"\n📝 Updated {os.path.basename(TEST_RESULTS_PATH)} and {os.path.basename(TOOL_STATISTICS_PATH)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the 100-query scenario table")
+    parser.add_argument("--workers", type=int, default=10, help="Concurrent scenario workers")
+    parser.add_argument("--time-scale", type=float, default=None,
+                        help="Delay scale (1.0 real time, 0 no delays)")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default="null",
+                        help="Event renderer for per-tool output")
+    parser.add_argument("--metrics", choices=["json", "prometheus"], default=None,
+                        help="Also print the per-tool latency snapshot")
+    parser.add_argument("--session-timeout", type=float, default=None,
+                        help="Deadline per scenario in nominal seconds (failures: TIMEOUT)")
+    parser.add_argument("--faults", type=int, default=None, metavar="SEED",
+                        help="Inject random faults at the FAULT_PROFILES rates (demo_faults.py)")
+    parser.add_argument("--compute-workers", type=int, default=None,
+                        help="Processes for CPU-bound steps (default: one per core, 0 runs them inline)")
+    parser.add_argument("--write", action="store_true",
+                        help="Regenerate TEST_RESULTS_TABLE.md and TOOL_STATISTICS.md")
+    args = parser.parse_args()
+    if args.write and args.faults is not None:
+        parser.error("--write regenerates the reference tables; it cannot be combined with --faults")
+
+    if args.time_scale is not None:
+        set_time_scale(args.time_scale)
+    use_renderer(args.renderer)
+    asyncio.run(main(workers=args.workers, write=args.write, metrics_format=args.metrics,
+                     session_timeout=args.session_timeout, fault_seed=args.faults,
+                     compute_workers=args.compute_workers))
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from demo_cache import ToolResultCache, cache_key
+
+
+def test_cache_key_ignores_param_order():
+    assert cache_key("news_api", {"q": "ai", "limit": 5}) == cache_key("news_api", {"limit": 5, "q": "ai"})
+
+
+def test_ttl_expiry_and_hit():
+    cache = ToolResultCache(ttl_seconds=0.0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return {"success": True, "result": len(calls)}
+
+    async def scenario():
+        first = await cache.call("t", {}, fetch)
+        second = await cache.call("t", {}, fetch)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert (first["result"], second["result"]) == (1, 2)  # ttl 0: always refetched
+
+    cache = ToolResultCache(ttl_seconds=60)
+    calls.clear()
+    first, second = asyncio.run(scenario())
+    assert second["cached"] and second["result"] == 1 and len(calls) == 1
+
+
+def test_concurrent_calls_are_coalesced():
+    cache = ToolResultCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"success": True, "result": "ok"}
+
+    async def scenario():
+        return await asyncio.gather(*(cache.call("t", {"q": 1}, fetch) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(r["result"] == "ok" for r in results)
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_failure_falls_back_to_stale_entry():
+    cache = ToolResultCache(ttl_seconds=0.0)
+
+    async def scenario():
+        await cache.call("t", {}, _result(True))
+        return await cache.call("t", {}, _result(False))
+
+    result = asyncio.run(scenario())
+    assert result["stale"] and result["masked_error_code"] == "NETWORK_TIMEOUT"
+
+
+def test_cancelled_owner_does_not_cancel_waiters():
+    cache = ToolResultCache()
+    owner_started = None
+
+    async def owner_fetch():
+        owner_started.set()
+        await asyncio.sleep(3600)
+
+    async def waiter_fetch():
+        return {"success": True, "result": "from waiter"}
+
+    async def scenario():
+        nonlocal owner_started
+        owner_started = asyncio.Event()
+        owner = asyncio.create_task(cache.call("t", {"q": 1}, owner_fetch))
+        await owner_started.wait()
+        waiter = asyncio.create_task(cache.call("t", {"q": 1}, waiter_fetch))
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    result = asyncio.run(scenario())
+    assert result["result"] == "from waiter"
+    assert cache.get("t", {"q": 1})["result"] == "from waiter"
+
+
+def _result(success):
+    async def fetch():
+        if success:
+            return {"success": True, "result": "fresh"}
+        return {"success": False, "error": "timeout", "error_code": "NETWORK_TIMEOUT"}
+    return fetch
@@ -0,0 +1,115 @@
+import asyncio
+import builtins
+import os
+import threading
+
+import pytest
+
+import demo_channel
+from demo_channel import HandlerResponder, HumanChannel, StdinReader
+
+
+@pytest.fixture
+def pipe_stdin(monkeypatch):
+    """stdin_lines reading from a pipe; yields the write end"""
+    read_fd, write_fd = os.pipe()
+    monkeypatch.setattr(demo_channel, "stdin_lines", StdinReader(read_fd))
+    yield write_fd
+    for fd in (read_fd, write_fd):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+class Context:
+    session_id = "test-session"
+    failed_step = {"tool": "arxiv_search"}
+
+
+def test_reader_splits_lines_and_reports_eof(pipe_stdin):
+    async def scenario():
+        os.write(pipe_stdin, b"first\nsecond\n")
+        lines = [await demo_channel.ainput(), await demo_channel.ainput()]
+        os.close(pipe_stdin)
+        with pytest.raises(EOFError):
+            await demo_channel.ainput()
+        return lines
+
+    assert asyncio.run(scenario()) == ["first", "second"]
+
+
+def test_timed_out_prompt_does_not_steal_the_next_answer(pipe_stdin):
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(demo_channel.ainput("stale? "), timeout=0.01)
+        os.write(pipe_stdin, b"answer\n")
+        return await demo_channel.ainput("next? ")
+
+    assert asyncio.run(scenario()) == "answer"
+
+
+def test_abandoned_handler_releases_stdin(pipe_stdin):
+    handler_outcome = []
+    handler_done = threading.Event()
+
+    class Handler:
+        def handle_tool_failure(self, context):
+            try:
+                handler_outcome.append(input("choice: "))
+            except EOFError:
+                handler_outcome.append("abandoned")
+            finally:
+                handler_done.set()
+            return {"action": "skip"}
+
+    async def scenario():
+        channel = HumanChannel(HandlerResponder(Handler()), timeout_seconds=0.05, timeout_action="abort")
+        decision = await channel.request_intervention(Context())
+        os.write(pipe_stdin, b"for the next prompt\n")
+        line = await demo_channel.ainput()
+        await channel.close()
+        return decision, line
+
+    decision, line = asyncio.run(scenario())
+    assert decision == {"action": "abort", "timed_out": True}
+    assert line == "for the next prompt"
+    assert handler_done.wait(1.0) and handler_outcome == ["abandoned"]
+
+
+def test_handler_answer_is_returned(pipe_stdin):
+    class Handler:
+        def handle_tool_failure(self, context):
+            return {"action": input("choice: ")}
+
+    async def scenario():
+        channel = HumanChannel(HandlerResponder(Handler()), timeout_seconds=5)
+        os.write(pipe_stdin, b"retry\n")
+        decision = await channel.request_intervention(Context())
+        await channel.close()
+        return decision
+
+    assert asyncio.run(scenario()) == {"action": "retry"}
+
+
+def test_input_is_rerouted_only_in_handler_threads_until_close(monkeypatch):
+    def original(prompt=""):
+        return "from the original input()"
+
+    monkeypatch.setattr(builtins, "input", original)
+
+    async def scenario():
+        responders = [HandlerResponder(object()), HandlerResponder(object())]
+        answers = []
+        other = threading.Thread(target=lambda: answers.append(input()))
+        other.start()
+        other.join()
+        await responders[0].close()
+        await responders[0].close()  # Closing twice releases once
+        rerouted = builtins.input is not original
+        await responders[1].close()
+        return answers, rerouted
+
+    answers, rerouted = asyncio.run(scenario())
+    assert answers == ["from the original input()"] and rerouted
+    assert builtins.input is original
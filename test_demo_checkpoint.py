@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from demo_checkpoint import CheckpointStore, SessionCheckpoint
+
+
+def test_checkpoint_survives_reopening_the_store(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    store = CheckpointStore(path)
+    checkpoint = SessionCheckpoint(
+        "session-1", phase="awaiting_human", query="Analyze weather-stock correlation",
+        plan=["Fetch weather", "Fetch stocks", "Correlate"],
+        results={"step:abc": {"success": True, "result": "weather"}},
+        completed_steps=["Fetch weather"],
+        intervention={"error": "Data dimensionality mismatch"},
+        data={"failed_at": 12.5}
+    )
+    store.save(checkpoint, arrays={"hourly": np.arange(24.0)})
+    store.close()
+
+    store = CheckpointStore(path)
+    restored = store.load("session-1")
+    assert restored.to_dict() == checkpoint.to_dict()
+    assert restored.reached("awaiting_human") and not restored.reached("recovering")
+    np.testing.assert_array_equal(store.arrays("session-1")["hourly"], np.arange(24.0))
+
+    restored.phase = "recovering"
+    store.save(restored)  # arrays=None keeps the stored arrays
+    assert store.load("session-1").phase == "recovering"
+    assert "hourly" in store.arrays("session-1")
+    assert [s["session_id"] for s in store.sessions(phase="recovering")] == ["session-1"]
+
+    assert store.delete("session-1") and store.load("session-1") is None
+    store.close()
+
+
+def test_unknown_phase_is_rejected():
+    store = CheckpointStore()
+    with pytest.raises(ValueError):
+        store.save(SessionCheckpoint("session-1", phase="paused"))
+    assert store.load("session-1") is None
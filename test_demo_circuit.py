@@ -0,0 +1,73 @@
+import time
+
+from demo_circuit import CircuitBreaker, CircuitState
+from demo_clock import clock, set_time_scale
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_threshold_and_recovers_after_reset_timeout():
+    now = FakeTime()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=now)
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    now.now = 29.9
+    assert breaker.state is CircuitState.OPEN
+
+    now.now = 30.0
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # One trial call at a time
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.to_dict() == {"state": "closed", "consecutive_failures": 0, "times_opened": 1}
+
+
+def test_failed_trial_call_reopens():
+    now = FakeTime()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=now)
+    breaker.record_failure()
+    now.now = 5.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.times_opened == 2
+
+
+def test_reset_window_elapses_without_any_demo_sleep():
+    set_time_scale(0.001)  # 50 nominal seconds are 0.05 real seconds
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=50.0)
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)  # Nothing else runs, so no demo time is slept
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+def test_reset_window_is_not_shortened_by_other_sessions():
+    set_time_scale(1.0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    set_time_scale(0)
+    for _ in range(500):
+        clock.sleep_sync(10.0)  # Other sessions' sleeps are not this breaker's time
+    set_time_scale(1.0)
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_reset_window_elapses_at_once_at_scale_zero():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.HALF_OPEN
@@ -0,0 +1,26 @@
+import asyncio
+
+from demo_clock import SessionTimer, clock
+
+
+def test_session_timers_count_only_their_own_sleeps():
+    async def session(delay: float) -> float:
+        timer = SessionTimer()
+        for _ in range(3):
+            await clock.sleep(delay)
+        return timer.elapsed()
+
+    async def scenario():
+        return await asyncio.gather(*(session(delay) for delay in (1.0, 2.0, 5.0)))
+
+    assert asyncio.run(scenario()) == [3.0, 6.0, 15.0]
+
+
+def test_spawned_tasks_count_toward_the_session():
+    async def scenario():
+        timer = SessionTimer(offset=10.0)  # Continues a checkpointed session
+        await asyncio.create_task(clock.sleep(2.0))
+        await clock.sleep(1.0)
+        return timer.elapsed()
+
+    assert asyncio.run(scenario()) == 13.0
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from demo_dag import NodeStatus, PlanScheduler, ResultStore, build_graph
+
+
+def test_default_dependencies_chain_steps_in_plan_order():
+    nodes = build_graph([{"type": "CODE"}, {"type": "CODE"}, {"type": "CODE", "depends_on": []}])
+    assert [node.depends_on for node in nodes.values()] == [[], ["step1"], []]
+    assert nodes["step1"].dependents == ["step2"]
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        build_graph([{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}])
+    with pytest.raises(ValueError, match="unknown step"):
+        build_graph([{"id": "a", "depends_on": ["missing"]}])
+
+
+def test_steps_start_after_their_dependencies_and_get_their_outputs():
+    steps = [
+        {"id": "fetch_a"},
+        {"id": "fetch_b", "depends_on": []},
+        {"id": "merge", "depends_on": ["fetch_a", "fetch_b"]},
+    ]
+    started = []
+
+    async def run_step(node):
+        started.append(node.id)
+        await asyncio.sleep(0)
+        return {"success": True, "output": node.id, "inputs": [r["output"] for r in node.inputs]}
+
+    nodes = asyncio.run(PlanScheduler().run(steps, run_step))
+    assert started == ["fetch_a", "fetch_b", "merge"]
+    assert nodes["merge"].result["inputs"] == ["fetch_a", "fetch_b"]
+    assert all(node.status is NodeStatus.SUCCEEDED for node in nodes.values())
+
+
+def test_failure_cancels_only_its_dependents():
+    steps = [
+        {"id": "load"},
+        {"id": "correlate", "depends_on": ["load"]},
+        {"id": "summary", "depends_on": ["load"]},
+        {"id": "report", "depends_on": ["correlate", "summary"]},
+        {"id": "chart", "depends_on": ["correlate"]},
+    ]
+    cancelled = []
+
+    async def run_step(node):
+        return {"success": node.id != "correlate"}
+
+    nodes = asyncio.run(PlanScheduler().run(steps, run_step, on_cancel=cancelled.append))
+    assert nodes["correlate"].status is NodeStatus.FAILED
+    assert nodes["summary"].status is NodeStatus.SUCCEEDED
+    assert [node.id for node in cancelled] == ["report", "chart"]
+    assert all(node.cancelled_by is nodes["correlate"] for node in cancelled)
+
+
+def test_max_parallel_limits_running_steps():
+    running, peak = 0, 0
+
+    async def run_step(node):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return {"success": True}
+
+    steps = [{"id": f"s{i}", "depends_on": []} for i in range(6)]
+    asyncio.run(PlanScheduler(max_parallel=2).run(steps, run_step))
+    assert peak == 2
+
+
+def test_result_store_reuses_results_by_work_not_by_id():
+    store = ResultStore()
+    step = {"id": "step3", "type": "TOOL_CALL", "tool": "stock_api", "params": {"symbol": "AAPL"},
+            "description": "Fetch stock prices"}
+    store.put(step, {"success": True, "result": "prices"})
+
+    same_work = dict(step, id="recovery2", description="Reuse the stock prices")
+    assert same_work in store
+    assert store.get(same_work) == {"success": True, "result": "prices"}
+    assert store.get(dict(step, params={"symbol": "MSFT"})) is None
+
+    restored = ResultStore()
+    restored.update(store.to_dict())
+    assert restored.get(same_work) == store.get(step) and len(restored) == 1
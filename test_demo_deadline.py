@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from demo_deadline import bounded, current, deadline, expired, remaining
+
+
+def test_no_deadline_by_default():
+    async def scenario():
+        with deadline(None) as when:
+            assert when is None
+        assert remaining() is None and not expired()
+
+    asyncio.run(scenario())
+
+
+def test_nested_deadlines_only_tighten():
+    async def scenario():
+        with deadline(10.0) as outer:
+            assert 9.0 < remaining() <= 10.0
+            with deadline(100.0) as inner:
+                assert inner == outer  # A looser inner deadline keeps the outer one
+            with deadline(1.0):
+                assert remaining() <= 1.0
+            assert current() == outer
+        assert current() is None
+
+    asyncio.run(scenario())
+
+
+def test_expired_and_bounded():
+    async def scenario():
+        with deadline(0.0):
+            assert expired()
+        with deadline(0.01):
+            async with bounded():
+                await asyncio.sleep(1.0)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(scenario())
+
+
+def test_deadline_is_per_task():
+    async def child():
+        return remaining()
+
+    async def scenario():
+        with deadline(5.0):
+            inherited = await asyncio.create_task(child())
+        unrelated = await asyncio.create_task(child())
+        return inherited, unrelated
+
+    inherited, unrelated = asyncio.run(scenario())
+    assert inherited is not None and unrelated is None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from demo_journal import InterventionJournal
+
+
+def test_async_writes_land_in_order():
+    journal = InterventionJournal()
+
+    async def scenario():
+        ids = await asyncio.gather(*(journal.arecord("tool_failure", session_id=f"s{i}", tool="arxiv_search")
+                                     for i in range(20)))
+        assert await journal.amark_outcome(ids[0], success=True)
+        assert not await journal.amark_outcome(ids[0], success=False)  # Outcome is set once
+        await journal.arecord_suggestion_outcome("sig", "retry", True, 2.0)
+        return ids
+
+    ids = asyncio.run(scenario())
+    assert ids == sorted(ids)
+    summary = journal.summary()
+    assert summary["total_interventions"] == 20
+    assert summary["tools"] == {"arxiv_search": 20}
+    assert summary["success_rate"] == 1.0
+    assert journal.suggestion_stats("sig") == {"retry": (1, 1, 2.0)}
+    journal.close()
+
+
+def test_writes_run_off_the_event_loop_thread():
+    journal = InterventionJournal()
+    threads = []
+
+    def insert(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return original(*args, **kwargs)
+
+    original, journal._insert = journal._insert, insert
+    asyncio.run(journal.arecord("tool_failure"))
+    journal.record("tool_failure")
+    assert threads == [journal._writer, journal._writer]
+    journal.close()
+
+
+def test_write_errors_reach_the_caller():
+    journal = InterventionJournal()
+
+    async def scenario():
+        with pytest.raises(TypeError):
+            await journal.arecord("tool_failure", unknown_field=1)
+        return await journal.arecord("tool_failure")  # The journal thread survives
+
+    assert asyncio.run(scenario()) == 1
+    journal.close()
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_reads_do_not_wait_for_a_commit(tmp_path, in_memory):
+    journal = InterventionJournal(":memory:" if in_memory else str(tmp_path / "journal.db"))
+    journal.record_suggestion_outcome("sig", "retry", True, 2.0)
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_write():
+        with journal._db:
+            journal._db.execute("UPDATE suggestion_stats SET chosen = chosen + 1")
+            writing.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=journal._call, args=(slow_write,))
+    writer.start()
+    assert writing.wait(5)
+
+    reads = []
+    reader = threading.Thread(target=lambda: reads.append(journal.suggestion_stats("sig")))
+    reader.start()
+    reader.join(2)
+    finished = not reader.is_alive()
+    release.set()
+    writer.join()
+    reader.join()
+    assert finished and reads[0]["retry"][1:] == (1, 2.0)
+    journal.close()
+
+
+def test_a_response_resolves_its_intervention():
+    journal = InterventionJournal()
+
+    async def scenario():
+        entry_id = await journal.arecord("tool_failure", tool="arxiv_search", payload={"error": "timeout"})
+        assert await journal.arecord_response(entry_id, "alternative", {"prompt": "choice?"})
+        assert not await journal.arecord_response(entry_id, "skip")  # Answered once
+        return entry_id
+
+    entry_id = asyncio.run(scenario())
+    summary = journal.summary()
+    assert summary["total_interventions"] == 1 and summary["actions"] == {"alternative": 1}
+    entry, = journal.query()
+    assert entry["id"] == entry_id and entry["action"] == "alternative"
+    assert entry["payload"] == {"error": "timeout", "response": {"prompt": "choice?"}}
+    journal.close()
@@ -0,0 +1,48 @@
+from demo_faults import FAULT_PROFILES
+from demo_policy import ResolutionPolicy
+from demo_scenarios import TOOL_FALLBACKS
+
+SCHOLAR = {"action": "alternative", "alternative_tool": "google_scholar_search"}
+
+
+def test_consistent_human_answers_become_a_rule():
+    policy = ResolutionPolicy(rules=[], learn_after=3, min_agreement=0.9)
+    for _ in range(3):
+        assert policy.resolve("arxiv_search", "NETWORK_TIMEOUT") is None
+        policy.observe("arxiv_search", "NETWORK_TIMEOUT", dict(SCHOLAR, custom_input="ok"))
+
+    decision = policy.resolve("arxiv_search", "NETWORK_TIMEOUT")
+    assert decision == dict(SCHOLAR, auto_resolved=True, policy="learned")
+    assert policy.stats()["learned"] == 1 and policy.stats()["escalated"] == 3
+
+
+def test_disagreeing_answers_keep_escalating():
+    policy = ResolutionPolicy(rules=[], learn_after=3, min_agreement=0.9)
+    for decision in (SCHOLAR, SCHOLAR, {"action": "skip"}):
+        policy.observe("arxiv_search", "NETWORK_TIMEOUT", decision)
+    assert policy.resolve("arxiv_search", "NETWORK_TIMEOUT") is None
+
+
+def test_timeouts_and_auto_decisions_are_not_learned():
+    policy = ResolutionPolicy(rules=[], learn_after=1)
+    policy.observe("arxiv_search", "NETWORK_TIMEOUT", {"action": "abort", "timed_out": True})
+    policy.observe("arxiv_search", "NETWORK_TIMEOUT", dict(SCHOLAR, auto_resolved=True))
+    assert policy.lookup("arxiv_search", "NETWORK_TIMEOUT") is None
+
+
+def test_exact_tool_rules_win_over_wildcards():
+    policy = ResolutionPolicy(rules=[
+        {"tool": "*", "error_code": "RATE_LIMITED", "decision": {"action": "retry"}},
+        {"tool": "news_api", "error_code": "RATE_LIMITED", "decision": {"action": "skip"}},
+    ])
+    assert policy.resolve("news_api", "RATE_LIMITED")["action"] == "skip"
+    assert policy.resolve("web_scraper", "RATE_LIMITED")["action"] == "retry"
+    assert policy.resolve("web_scraper", None) is None
+
+
+def test_configured_fallbacks_follow_the_fallback_chains():
+    policy = ResolutionPolicy()
+    for tool, chain in TOOL_FALLBACKS.items():
+        for error_code in FAULT_PROFILES.get(tool, {}).get("errors", {}):
+            assert policy.resolve(tool, error_code)["alternative_tool"] == chain[0]
+    assert policy.resolve("stock_api", "RATE_LIMITED")["action"] == "retry"
@@ -0,0 +1,33 @@
+import demo_records
+from demo_records import ContextRecord, InterventionKind, StepRecord, intern_plan
+
+
+def test_same_plan_is_shared_across_contexts():
+    plan = ["Fetch data", "Analyze data"]
+    first = ContextRecord.build(InterventionKind.PLAN_FAILURE, "q", current_plan=plan, session_id="a")
+    second = ContextRecord.build(InterventionKind.PLAN_FAILURE, "q", current_plan=list(plan), session_id="b")
+    assert first.current_plan is second.current_plan
+
+
+def test_intern_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(demo_records, "PLAN_INTERN_LIMIT", 3)
+    monkeypatch.setattr(demo_records, "_PLANS", type(demo_records._PLANS)())
+    kept = intern_plan(["kept"])
+    for i in range(10):
+        intern_plan([f"plan {i}"])
+        intern_plan(["kept"])  # Recently used plans stay shared
+    assert len(demo_records._PLANS) == 3
+    assert intern_plan(("kept",)) is kept
+
+
+def test_completed_steps_are_not_interned(monkeypatch):
+    monkeypatch.setattr(demo_records, "_PLANS", type(demo_records._PLANS)())
+    ContextRecord.build(InterventionKind.PLAN_FAILURE, "q", current_plan=["a", "b"], completed_steps=["a"])
+    assert list(demo_records._PLANS) == [("a", "b")]
+
+
+def test_step_record_reads_like_a_dict():
+    step = StepRecord.from_dict({"type": "TOOL_CALL", "description": "Search", "tool": "arxiv_search"})
+    assert step["tool"] == "arxiv_search"
+    assert step.get("params") is None
+    assert dict(step) == {"description": "Search", "type": "TOOL_CALL", "tool": "arxiv_search"}
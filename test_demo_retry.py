@@ -0,0 +1,59 @@
+import asyncio
+
+from demo_retry import RetryBudget, RetryScheduler
+
+
+def test_budget_spends_tokens_and_refills_from_first_attempts():
+    budget = RetryBudget(ratio=0.5, capacity=2.0)
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+    assert budget.to_dict() == {"tokens": 0.0, "spent": 2, "denied": 1}
+
+    budget.deposit()
+    assert not budget.withdraw()  # Half a token is not a retry
+    budget.deposit()
+    assert budget.withdraw()
+
+
+def test_budget_never_exceeds_capacity():
+    budget = RetryBudget(ratio=1.0, capacity=3.0)
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 3.0
+
+
+def _failing_attempt(error_code="NETWORK_TIMEOUT"):
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        return {"success": False, "error_code": error_code}
+
+    return attempt, calls
+
+
+def test_exhausted_budget_stops_retries():
+    scheduler = RetryScheduler(max_retries=5, budget_ratio=0.0, budget_capacity=2.0, seed=1)
+    attempt, calls = _failing_attempt()
+    result = asyncio.run(scheduler.run("arxiv_search", attempt))
+    assert result["retry_count"] == 2 and result["retry_budget_exhausted"]
+    assert len(calls) == 3
+
+    attempt, calls = _failing_attempt()
+    result = asyncio.run(scheduler.run("arxiv_search", attempt))
+    assert result["retry_count"] == 0 and len(calls) == 1
+    assert scheduler.budget("news_api").tokens == 2.0  # Budgets are per tool
+
+
+def test_non_retryable_errors_are_not_retried():
+    scheduler = RetryScheduler(seed=1)
+    attempt, calls = _failing_attempt("SYNTAX_ERROR")
+    assert asyncio.run(scheduler.run("CODE", attempt))["retry_count"] == 0
+    assert len(calls) == 1
+
+
+def test_backoff_is_capped_and_reproducible():
+    first, second = RetryScheduler(base_delay=0.5, max_delay=2.0, seed=3), RetryScheduler(seed=3, max_delay=2.0)
+    delays = [first.next_delay(previous) for previous in (0.5, 1.0, 4.0, 8.0)]
+    assert delays == [second.next_delay(previous) for previous in (0.5, 1.0, 4.0, 8.0)]
+    assert all(0.5 <= delay <= 2.0 for delay in delays)
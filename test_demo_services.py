@@ -0,0 +1,55 @@
+import asyncio
+
+from demo_clock import set_time_scale
+from demo_scenarios import TOOL_PROFILES
+from demo_services import ServicePool, ServiceRegistry, TokenBucket
+
+
+def test_pool_size_caps_concurrent_calls():
+    pool = ServicePool("geographic_database", size=2)
+
+    async def call():
+        async with pool.acquire():
+            await asyncio.sleep(0.001)
+
+    async def scenario():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(scenario())
+    assert pool.peak_in_use == 2 and pool.calls == 6 and pool.in_use == 0
+
+
+def test_rate_limit_spaces_calls_by_the_token_rate():
+    set_time_scale(0.01)
+    pool = ServicePool("news_api", size=10, rate=10.0, burst=1)
+
+    async def call():
+        async with pool.acquire():
+            pass
+
+    async def scenario():
+        await asyncio.gather(*(call() for _ in range(5)))
+
+    asyncio.run(scenario())
+    limiter = pool.to_dict()["rate_limit"]
+    assert limiter["granted"] == 5
+    # One token up front, then one every 0.1 nominal seconds
+    assert 0.3 < limiter["waited_seconds"] <= 0.4 + 1e-9
+
+
+def test_rate_limit_does_not_delay_at_time_scale_zero():
+    bucket = TokenBucket(rate=1.0, burst=1)
+
+    async def scenario():
+        for _ in range(100):
+            await bucket.acquire()
+
+    asyncio.run(scenario())
+    assert bucket.granted == 100 and bucket.waited == 0.0
+
+
+def test_registry_limits_only_profiled_services():
+    registry = ServiceRegistry.from_profiles(TOOL_PROFILES, size=4)
+    assert registry.pool("news_api").limiter.rate == TOOL_PROFILES["news_api"]["rate"]
+    assert registry.pool("math_calculator").limiter is None
+    assert registry.pool("news_api") is registry.pool("news_api")
@@ -0,0 +1,69 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from demo_timeseries import WeatherStockPipeline, correlation_strength
+
+
+def _batch_pipeline() -> WeatherStockPipeline:
+    pipeline = WeatherStockPipeline(tickers=10)
+    for stage in ("fetch_weather", "fetch_stocks", "aggregate", "normalize", "correlate"):
+        pipeline.run(stage)
+    return pipeline
+
+
+def test_correlation_strength_labels():
+    assert correlation_strength(-0.16) == "weak negative"
+    assert correlation_strength(0.05) == "negligible"
+    assert correlation_strength(0.42) == "moderate positive"
+    assert correlation_strength(-0.8) == "strong negative"
+
+
+def test_summary_is_computed_from_the_data():
+    summary = _batch_pipeline().summary()
+    assert summary["strength"] == correlation_strength(summary["mean_correlation"])
+    extreme_days, ratio = summary["extreme_weather"]
+    assert 0 < extreme_days < summary["days"] and ratio > 0
+
+
+def test_extreme_weather_needs_the_joined_data():
+    pipeline = WeatherStockPipeline(tickers=10)
+    assert pipeline.extreme_weather_volatility() is None
+
+
+async def _take(stream, windows: int):
+    count = 0
+    async for batch in stream:
+        if count == windows:
+            return
+        count += 1
+        yield batch
+
+
+@pytest.mark.parametrize("short", ["returns", "weather"])
+def test_stream_length_mismatch_is_a_clear_error(short):
+    pipeline = WeatherStockPipeline(tickers=10)
+
+    async def scenario():
+        daily = pipeline.stream_daily(pipeline.stream_weather())
+        returns = pipeline.stream_returns()
+        if short == "returns":
+            returns = _take(returns, 3)
+        else:
+            daily = _take(daily, 3)
+        await pipeline.stream_correlate(daily, returns)
+
+    with pytest.raises(ValueError, match="Stream length mismatch"):
+        asyncio.run(scenario())
+
+
+def test_streamed_correlation_matches_the_batch_one():
+    pipeline = WeatherStockPipeline(tickers=10)
+
+    async def scenario():
+        daily = pipeline.stream_daily(pipeline.stream_weather())
+        await pipeline.stream_correlate(daily, pipeline.stream_returns())
+        return pipeline.correlation
+
+    assert np.allclose(asyncio.run(scenario()), _batch_pipeline().correlation)
@@ -0,0 +1,60 @@
+import asyncio
+
+from demo_checkpoint import CheckpointStore
+from demo_faults import FaultInjector
+from demo_scenarios import PLAN_STREAMING_STEPS
+from demo_timeseries import WeatherStockPipeline
+from youtube_demo_plan_failure import SESSION_ID, PlanExecutionSimulator, main_demo
+
+
+def test_recovery_time_survives_a_resume(tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoints.db")
+    monkeypatch.setenv("DEMO_CHECKPOINTS", path)
+    asyncio.run(main_demo())
+
+    store = CheckpointStore(path)
+    checkpoint = store.load(SESSION_ID)
+    uninterrupted = checkpoint.data.pop("recovery_seconds")
+    assert uninterrupted > 0 and checkpoint.data["failed_at"] < checkpoint.data["elapsed"]
+
+    # The process stopped while the recovery plan was running
+    checkpoint.phase = "recovering"
+    store.save(checkpoint)
+    store.close()
+    asyncio.run(main_demo(resume=True))
+
+    store = CheckpointStore(path)
+    resumed = store.load(SESSION_ID).data["recovery_seconds"]
+    store.close()
+    assert resumed >= uninterrupted
+
+
+def _pending_tasks():
+    return {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+
+
+def test_failed_stream_consumer_releases_its_streams():
+    async def scenario():
+        # daily_stream fails and streamed_correlation is cancelled: nobody reads the streams
+        faults = FaultInjector.failing({"data_processing"})
+        simulator = PlanExecutionSimulator(pipeline=WeatherStockPipeline(), faults=faults)
+        nodes = await simulator.execute_plan(PLAN_STREAMING_STEPS)
+        await asyncio.sleep(0)  # Let cancelled producers finish
+        return nodes, _pending_tasks()
+
+    nodes, pending = asyncio.run(scenario())
+    assert not nodes["daily_stream"].result["success"]
+    assert nodes["streamed_correlation"].result is None
+    assert pending == set()
+
+
+def test_streamed_plan_completes():
+    async def scenario():
+        simulator = PlanExecutionSimulator(pipeline=WeatherStockPipeline())
+        nodes = await simulator.execute_plan(PLAN_STREAMING_STEPS)
+        await asyncio.sleep(0)
+        return nodes, _pending_tasks()
+
+    nodes, pending = asyncio.run(scenario())
+    assert all(node.result["success"] for node in nodes.values())
+    assert pending == set()
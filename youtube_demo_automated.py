@@ -6,123 +6,146 @@ This version runs completely automated for easy video recording.
 No keyboard input required - perfect for screen recording!
 
 Run with: python3 youtube_demo_automated.py
+Instant replay (CI): DEMO_TIME_SCALE=0 python3 youtube_demo_automated.py
 """
 
 import asyncio
-import time
-from typing import Dict, Any, List
+import os
+from collections import deque
+from typing import Dict, Any, List, Optional
+from demo_clock import SessionTimer, clock
+from demo_deadline import TIMEOUT_PER_STEP, bounded, deadline
+from demo_events import bus, EventKind
+from demo_faults import Fault, FaultInjector
+from demo_journal import InterventionJournal
+from demo_metrics import tool_metrics
+from demo_scenarios import ARXIV_TIMEOUT_FAILURE
+from demo_suggestions import suggestion_engine, history_note
+from demo_tracing import install_from_env, tracer
 
 
 class AutomatedHumanResponse:
     """Simulates human responses automatically for demo purposes"""
     
-    def __init__(self):
+    def __init__(self, journal: Optional[Any] = None, keep_last: int = 100):
         self.response_delay = 2.0  # Seconds to simulate thinking time
-        self.responses = []
+        self.responses = deque(maxlen=keep_last)  # Full history goes to the journal
+        self.journal = journal
     
-    async def get_response(self, prompt: str, response_value: str) -> str:
-        """Simulate human thinking and responding"""
+    async def get_response(self, prompt: str, response_value: str,
+                           entry_id: Optional[int] = None) -> str:
+        """Simulate human thinking and responding
+
+        With a journal, the response resolves intervention ``entry_id``.
+        """
         print(f"\n⏰ Simulating human decision-making...")
-        await asyncio.sleep(self.response_delay)
+        await clock.sleep(self.response_delay)
         print(f"👤 Human Response: {response_value}")
         self.responses.append(response_value)
+        if self.journal is not None and entry_id is not None:
+            await self.journal.arecord_response(entry_id, response_value, {"prompt": prompt})
         return response_value
 
 
 async def show_banner(title: str):
     """Display a styled banner"""
-    border = "🎬 " * 30
-    print(f"\n{border}")
-    print(f"{title.center(180)}")
-    print(f"{border}\n")
+    bus.emit(EventKind.BANNER, title=title)
 
 
 async def show_section(section_name: str):
     """Display a section header"""
-    print(f"\n{'='*60}")
-    print(f"📋 {section_name}")
-    print(f"{'='*60}\n")
+    bus.emit(EventKind.SECTION, name=section_name)
 
 
-async def simulate_tool_execution(tool_name: str, will_fail: bool = False):
-    """Simulate tool execution with visual feedback"""
-    print(f"{'='*60}")
-    print(f"🔧 EXECUTING TOOL: {tool_name}")
-    print(f"{'='*60}")
-    
-    # Show processing animation
-    for i in range(3):
-        print(f"{'.'* (i+1)} Processing", end='\r')
-        await asyncio.sleep(0.5)
-    
-    print(" " * 50, end='\r')  # Clear line
-    
-    if will_fail:
-        print("❌ TOOL EXECUTION FAILED!")
-        print(f"Error: Network timeout - Unable to connect to {tool_name} service")
-        print(f"Error Code: NETWORK_TIMEOUT")
-        return False
-    else:
-        print("✅ TOOL EXECUTION SUCCESSFUL!")
-        print(f"Result: Successfully executed {tool_name}")
-        return True
+async def simulate_tool_execution(tool_name: str, faults: Optional[FaultInjector] = None,
+                                  timeout: Optional[float] = TIMEOUT_PER_STEP):
+    """Simulate tool execution with visual feedback, bounded by ``timeout``
 
+    The outcome and latency jitter come from ``faults``; without one the
+    call always succeeds.
+    """
+    fault = faults.draw(tool_name) if faults is not None else Fault(tool_name)
+    with tracer.span(tool_name, "tool"), tool_metrics.track(tool_name) as timer:
+        bus.emit(EventKind.TOOL_STARTED, tool=tool_name)
+        
+        # Show processing animation
+        try:
+            with deadline(timeout):
+                async with bounded():
+                    for i in range(3):
+                        bus.emit(EventKind.TOOL_PROGRESS, tool=tool_name, tick=i + 1)
+                        await clock.sleep(0.5 * fault.latency_factor)
+        except TimeoutError:
+            timer.success = False
+            bus.emit(EventKind.TOOL_FAILED, tool=tool_name,
+                     error=f"{tool_name} did not finish before its deadline", error_code="TIMEOUT")
+            return False
+        
+        if fault.failed:
+            timer.success = False
+            bus.emit(EventKind.TOOL_FAILED, tool=tool_name, error=fault.error, error_code=fault.error_code)
+            return False
+        else:
+            bus.emit(EventKind.TOOL_SUCCEEDED, tool=tool_name, result=f"Successfully executed {tool_name}")
+            return True
 
-async def show_human_intervention_screen(query: str, failed_tool: str, error: str):
-    """Display the human intervention screen"""
-    print("\n" + "🚨 "*30)
-    print("TOOL FAILURE - HUMAN INTERVENTION REQUIRED".center(180))
-    print("🚨 "*30)
-    
-    print(f"\nSession ID: demo-session-youtube-001")
-    print(f"Original Query: {query}")
-    print(f"Failed Step: {failed_tool}")
-    print(f"Error: {error}")
-    
-    await asyncio.sleep(1)
-    
-    print("\n💡 SUGGESTED ALTERNATIVES:")
-    suggestions = [
-        "Try different search terms or API endpoints",
-        "Use broader or more specific search criteria",
-        "Search in different sources or databases",
-        "Use a fallback service (Google Scholar instead of arXiv)",
-        "Gather cached data if available"
-    ]
+
+async def show_human_intervention_screen(query: str, failed_tool: str, error: str,
+                                         tool: Optional[str] = None,
+                                         journal: Optional[InterventionJournal] = None) -> List[str]:
+    """Display the human intervention screen; returns the suggestions, best first
+    
+    With a journal, suggestions are ranked by how past choices worked out.
+    """
+    bus.emit(
+        EventKind.INTERVENTION_REQUESTED,
+        session_id="demo-session-youtube-001",
+        intervention_type="tool_failure",
+        query=query,
+        failed_step=failed_tool,
+        error=error
+    )
+    
+    await clock.sleep(1)
+    
+    suggestions = suggestion_engine.suggest(
+        error, step_type="TOOL_CALL", tool=tool, description=failed_tool, limit=5, stats=journal
+    )
+    history = {}
+    if journal is not None:
+        history = journal.suggestion_stats(
+            suggestion_engine.signature(error, "TOOL_CALL", tool, failed_tool))
     
     for i, suggestion in enumerate(suggestions, 1):
-        print(f"  {i}. {suggestion}")
-        await asyncio.sleep(0.3)
-    
-    await asyncio.sleep(1)
-    
-    print("\n📝 AVAILABLE ACTIONS:")
-    print("  1. Provide alternative approach")
-    print("  2. Skip this step and continue")
-    print("  3. Abort execution")
-    print("  4. Retry with modifications")
+        bus.emit(EventKind.SUGGESTION_OFFERED, index=i, text=suggestion,
+                 history=history_note(history.get(suggestion)))
+        await clock.sleep(0.3)
+    
+    await clock.sleep(1)
+    
+    bus.emit(EventKind.ACTIONS_OFFERED, actions=[
+        "Provide alternative approach",
+        "Skip this step and continue",
+        "Abort execution",
+        "Retry with modifications"
+    ])
+    return suggestions
 
 
 async def show_human_decision(choice: str, description: str):
     """Display human decision with thinking simulation"""
-    print("\n" + "👤 "*30)
-    print("HUMAN DECISION PROCESS".center(180))
-    print("👤 "*30)
+    with tracer.span("human_decision", "human"):
+        bus.emit(EventKind.HUMAN_DECIDING, message="Analyzing options...")
+        await clock.sleep(1.5)
     
-    print("\n⏰ Analyzing options...")
-    await asyncio.sleep(1.5)
+    bus.emit(EventKind.HUMAN_DECIDED, choice=choice, rationale=description)
     
-    print(f"\n✅ Human Selected: Option {choice}")
-    print(f"💭 Rationale: {description}")
-    
-    await asyncio.sleep(1)
+    await clock.sleep(1)
 
 
 async def show_recovery_process():
     """Display the recovery and continuation process"""
-    print("\n" + "🔄 "*30)
-    print("RECOVERY PROCESS INITIATED".center(180))
-    print("🔄 "*30)
+    bus.emit(EventKind.RECOVERY_STARTED, title="RECOVERY PROCESS INITIATED")
     
     steps = [
         "Validating alternative approach...",
@@ -132,8 +155,8 @@ async def show_recovery_process():
     ]
     
     for step in steps:
-        print(f"\n⚙️  {step}")
-        await asyncio.sleep(0.8)
+        bus.emit(EventKind.RECOVERY_STEP, text=step)
+        await clock.sleep(0.8)
 
 
 async def main_demo():
@@ -150,7 +173,7 @@ async def main_demo():
     ╚════════════════════════════════════════════════════════════════════════╝
     """)
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Introduction
     await show_banner("DEMO: INTELLIGENT FAILURE RECOVERY")
@@ -166,65 +189,85 @@ async def main_demo():
     
     """)
     
-    await asyncio.sleep(3)
+    await clock.sleep(3)
     
     # Scenario Setup
     await show_section("SCENARIO: Searching Academic Papers")
     
+    tracer.stage("Perception")
     query = "Search for the latest AI research papers on arXiv"
     print(f"🎯 User Query: {query}")
+    tracer.stage("Decision")
     print(f"📋 Execution Plan:")
     print(f"   Step 1: Search arXiv database for AI papers")
     print(f"   Step 2: Filter results by relevance")
     print(f"   Step 3: Extract titles and abstracts")
     print(f"   Step 4: Format and present results")
     
-    await asyncio.sleep(3)
+    await clock.sleep(3)
     
     # Step 1: Normal execution starts
+    tracer.stage("Action")
     await show_section("EXECUTION PHASE")
     
     print("⏳ Starting Step 1: Search arXiv database...")
-    await asyncio.sleep(1)
+    await clock.sleep(1)
+    
+    # Journaled outcomes rank the suggestions; DEMO_JOURNAL keeps them across runs
+    journal = InterventionJournal(os.environ.get("DEMO_JOURNAL", ":memory:"))
+    failure = ARXIV_TIMEOUT_FAILURE
+    signature = suggestion_engine.signature(**failure)
+    recovery_seconds = None
+    timer = SessionTimer()
+    # arXiv times out on every call; its alternatives are healthy
+    faults = FaultInjector.failing({"arxiv_search_api"})
     
     # Tool fails
-    success = await simulate_tool_execution("arxiv_search_api", will_fail=True)
+    success = await simulate_tool_execution("arxiv_search_api", faults=faults)
     
     if not success:
-        await asyncio.sleep(2)
+        failed_at = timer.elapsed()
+        await clock.sleep(2)
         
         # Human intervention triggered
-        await show_human_intervention_screen(
+        tracer.stage("Human Intervention", "human")
+        suggestions = await show_human_intervention_screen(
             query=query,
-            failed_tool="Search arXiv database for AI research papers",
-            error="Network timeout: Unable to connect to arxiv_search service after 3 retries"
+            failed_tool=failure["description"],
+            error=failure["error"],
+            tool=failure["tool"],
+            journal=journal
         )
         
-        await asyncio.sleep(3)
+        await clock.sleep(3)
         
-        # Human makes decision
+        # Human takes the top-ranked suggestion
+        chosen = suggestions[0]
         await show_human_decision(
             choice="1",
-            description="Use Google Scholar API as alternative - it's more stable and provides similar academic search capabilities"
+            description=f"{chosen} - the option most likely to resolve this failure quickly"
         )
         
-        await asyncio.sleep(2)
+        await clock.sleep(2)
         
         # Recovery process
+        tracer.stage("Recovery")
         await show_recovery_process()
         
-        await asyncio.sleep(2)
+        await clock.sleep(2)
         
         # Execute alternative approach
         print("\n" + "="*60)
         print("🔄 EXECUTING ALTERNATIVE APPROACH")
         print("="*60)
-        await asyncio.sleep(1)
+        await clock.sleep(1)
         
-        success = await simulate_tool_execution("google_scholar_api", will_fail=False)
+        success = await simulate_tool_execution("google_scholar_api", faults=faults)
+        recovery_seconds = timer.elapsed() - failed_at
+        await journal.arecord_suggestion_outcome(signature, chosen, success, recovery_seconds)
         
         if success:
-            await asyncio.sleep(1)
+            await clock.sleep(1)
             
             print("\n" + "🎉 "*30)
             print("SUCCESS! QUERY COMPLETED VIA ALTERNATIVE APPROACH".center(180))
@@ -236,9 +279,10 @@ async def main_demo():
             print("   - Abstracts extracted successfully")
             print("   - Results formatted for presentation")
             
-            await asyncio.sleep(2)
+            await clock.sleep(2)
     
     # Show workflow visualization
+    tracer.end_stage()
     await show_section("COMPLETE WORKFLOW VISUALIZATION")
     
     workflow_steps = [
@@ -260,10 +304,10 @@ async def main_demo():
     for i, (status, stage, message) in enumerate(workflow_steps, 1):
         print(f"\n[{i:02d}] {status} {stage}")
         print(f"     └─ {message}")
-        await asyncio.sleep(0.7)
+        await clock.sleep(0.7)
     
     # Key Benefits
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     await show_section("KEY BENEFITS OF HUMAN-IN-LOOP")
     
     benefits = [
@@ -277,21 +321,26 @@ async def main_demo():
     
     for icon, title, description in benefits:
         print(f"\n{icon} {title}: {description}")
-        await asyncio.sleep(0.8)
+        await clock.sleep(0.8)
     
     # Statistics
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     await show_section("SESSION STATISTICS")
     
     print("📊 Intervention Summary:")
     print(f"   • Total Interventions: 1")
     print(f"   • Intervention Type: Tool Failure")
     print(f"   • Success Rate: 100%")
-    print(f"   • Recovery Time: ~8 seconds")
+    if recovery_seconds is not None:
+        chosen_count, resolved, total_seconds = journal.suggestion_stats(signature)[chosen]
+        print(f"   • Recovery Time: {recovery_seconds:.0f} seconds "
+              f"(journaled runs of this choice: {resolved}/{chosen_count} resolved, "
+              f"mean {total_seconds / chosen_count:.0f}s)")
     print(f"   • Alternative Approaches Used: 1")
     print(f"   • Final Status: ✅ SUCCESSFUL")
+    journal.close()
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Conclusion
     print("\n\n" + "🎬 "*30)
@@ -324,6 +373,7 @@ async def main_demo():
 if __name__ == "__main__":
     print("\n🎥 Starting automated YouTube demo in 3 seconds...")
     print("📹 Recording tip: Start your screen recording now!\n")
-    time.sleep(3)
+    clock.sleep_sync(3)
     
+    install_from_env()
     asyncio.run(main_demo())
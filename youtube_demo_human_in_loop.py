@@ -9,48 +9,42 @@ This demo script demonstrates the human-in-loop feature by:
 4. Showing the recovery process
 
 Run with: python3 youtube_demo_human_in_loop.py
+Instant replay (CI): DEMO_TIME_SCALE=0 python3 youtube_demo_human_in_loop.py
 """
 
 import asyncio
+import os
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from agent.human_in_loop import HumanInLoopHandler, InterventionContext, InterventionType
+from demo_channel import HumanChannel, HandlerResponder, ainput
+from demo_clock import clock
+from demo_deadline import TIMEOUT_PER_STEP
+from demo_executor import ConcurrentToolExecutor
+from demo_faults import FaultInjector
+from demo_journal import InterventionJournal
+from demo_policy import POLICY_RULES, ResolutionPolicy
+from demo_records import ContextRecord, InterventionKind
+from demo_retry import RetryScheduler, apply_modifications
+from demo_scenarios import FAILURE_SCENARIOS, TOOL_FALLBACKS
+from demo_suggestions import suggestion_engine
+from demo_tracing import install_from_env, tracer
 
 
-class DemoToolExecutor:
+class DemoToolExecutor(ConcurrentToolExecutor):
     """Simulates tool execution with controlled failures for demo purposes"""
     
-    def __init__(self, force_failure: bool = False):
-        self.force_failure = force_failure
-        self.execution_count = 0
-    
-    async def execute_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a tool - can be forced to fail for demo"""
-        self.execution_count += 1
-        
-        print(f"\n{'='*60}")
-        print(f"🔧 EXECUTING TOOL: {tool_name}")
-        print(f"{'='*60}")
-        print(f"Parameters: {params}")
-        
-        # Simulate processing time
-        await asyncio.sleep(1)
-        
-        if self.force_failure:
-            print("❌ TOOL EXECUTION FAILED!")
-            return {
-                "success": False,
-                "error": f"Network timeout: Unable to connect to {tool_name} service",
-                "error_code": "NETWORK_TIMEOUT",
-                "retry_count": 2
-            }
-        else:
-            print("✅ TOOL EXECUTION SUCCESSFUL!")
-            return {
-                "success": True,
-                "result": f"Successfully executed {tool_name}",
-                "data": {"value": 42}
-            }
+    def __init__(self, faults: Optional[FaultInjector] = None, max_concurrency_per_tool: int = 10,
+                 retry: Optional[RetryScheduler] = None,
+                 fallbacks: Optional[Dict[str, List[str]]] = None):
+        super().__init__(
+            tool_latency=1.0,
+            max_concurrency_per_tool=max_concurrency_per_tool,
+            faults=faults or FaultInjector(),
+            fallbacks=fallbacks,
+            retry=retry,
+            call_timeout=TIMEOUT_PER_STEP
+        )
 
 
 async def demo_scenario_1_tool_failure():
@@ -73,102 +67,165 @@ async def demo_scenario_1_tool_failure():
     
     # Initialize components
     human_handler = HumanInLoopHandler(timeout_seconds=300, enable_suggestions=True)
-    tool_executor = DemoToolExecutor(force_failure=True)  # Force failure for demo
-    
-    # Demo query
-    query = "Search for the latest AI research papers on arXiv"
-    session_id = "demo-session-001"
+    # DEMO_JOURNAL=interventions.db keeps the journal across runs
+    journal = InterventionJournal(os.environ.get("DEMO_JOURNAL", ":memory:"))
+    # Known failure signatures skip the human; the demo loads no configured
+    # rules unless DEMO_AUTO_RESOLVE=1, so this novel failure escalates
+    policy = ResolutionPolicy(rules=POLICY_RULES if os.environ.get("DEMO_AUTO_RESOLVE") else [])
+    human_channel = HumanChannel(HandlerResponder(human_handler), timeout_seconds=300,
+                                 journal=journal, policy=policy)
+    # arXiv and its fallback, Google Scholar, time out on every call for the demo.
+    # Transient errors are retried, then the circuit breakers route along
+    # TOOL_FALLBACKS; only an exhausted (or open) chain reaches the human
+    tool_executor = DemoToolExecutor(faults=FaultInjector.failing({"arxiv_search", "google_scholar_search"}),
+                                     retry=RetryScheduler(max_retries=3), fallbacks=TOOL_FALLBACKS)
     
-    print(f"\n🎯 User Query: {query}")
-    print(f"🆔 Session ID: {session_id}")
-    
-    # Simulate executing a step that will fail
-    print("\n" + "⏳ "*30)
-    print("STEP 1: Attempting to search arXiv database...")
-    print("⏳ "*30)
-    
-    failed_step = {
-        "type": "TOOL_CALL",
-        "description": "Search arXiv database for AI research papers",
-        "tool": "arxiv_search",
-        "params": {
-            "query": "artificial intelligence",
-            "max_results": 10,
-            "sort_by": "submittedDate"
+    try:
+        # Demo query
+        tracer.stage("Perception")
+        query = "Search for the latest AI research papers on arXiv"
+        session_id = "demo-session-001"
+    
+        print(f"\n🎯 User Query: {query}")
+        print(f"🆔 Session ID: {session_id}")
+    
+        # Simulate executing a step that will fail
+        tracer.stage("Decision")
+        print("\n" + "⏳ "*30)
+        print("STEP 1: Attempting to search arXiv database...")
+        print("⏳ "*30)
+    
+        failed_step = {
+            "type": "TOOL_CALL",
+            "description": "Search arXiv database for AI research papers",
+            "tool": "arxiv_search",
+            "params": {
+                "query": "artificial intelligence",
+                "max_results": 10,
+                "sort_by": "submittedDate"
+            }
         }
-    }
-    
-    # Execute the tool (will fail)
-    result = await tool_executor.execute_tool("arxiv_search", failed_step["params"])
     
-    if not result["success"]:
-        print("\n🚨 TOOL FAILURE DETECTED!")
-        print(f"Error: {result['error']}")
-        print(f"Error Code: {result['error_code']}")
+        # Execute the tool and its fallback chain (both will fail)
+        tracer.stage("Action")
+        result = await tool_executor.execute_tool("arxiv_search", failed_step["params"], session_id=session_id)
+    
+        if result.get("fallback_used"):
+            print(f"\n⚡ arXiv failed; routed to {result['fallback_used']} without a human round-trip")
+            print(f"Result: {result['result']}")
+        elif not result["success"]:
+            print("\n🚨 TOOL FAILURE DETECTED!")
+            print(f"Error: {result['error']} after {result.get('retry_count', 0)} retries")
+            print(f"Error Code: {result['error_code']}")
+            for attempt in result.get("attempted", []):
+                state = tool_executor.breaker(attempt["tool"]).state.value
+                print(f"   ↳ {attempt['tool']}: {attempt.get('error_code') or attempt.get('skipped')} "
+                      f"(circuit {state})")
+            print("Every fallback is exhausted - escalating to a human")
         
-        # Create intervention context
-        context = InterventionContext(
-            intervention_type=InterventionType.TOOL_FAILURE,
-            original_query=query,
-            failed_step=failed_step,
-            error_message=result['error'],
-            current_plan=[
-                "Search arXiv database for AI research papers",
-                "Filter results by relevance score",
-                "Extract paper titles and abstracts",
-                "Format results for presentation"
-            ],
-            completed_steps=[],
-            session_id=session_id
-        )
+            # Create intervention context
+            context = InterventionContext(
+                intervention_type=InterventionType.TOOL_FAILURE,
+                original_query=query,
+                failed_step=failed_step,
+                error_message=result['error'],
+                current_plan=[
+                    "Search arXiv database for AI research papers",
+                    "Filter results by relevance score",
+                    "Extract paper titles and abstracts",
+                    "Format results for presentation"
+                ],
+                completed_steps=[],
+                session_id=session_id
+            )
         
-        # Trigger human intervention
-        print("\n" + "🤝 "*30)
-        print("TRIGGERING HUMAN-IN-LOOP INTERVENTION...")
-        print("🤝 "*30)
+            # Trigger human intervention
+            print("\n" + "🤝 "*30)
+            print("TRIGGERING HUMAN-IN-LOOP INTERVENTION...")
+            print("🤝 "*30)
         
-        intervention_result = human_handler.handle_tool_failure(context)
+            tracer.stage("Human Intervention", "human")
+            intervention_result = await human_channel.request_intervention(
+                context, error_code=result["error_code"]
+            )
         
-        # Process the human's decision
-        print("\n" + "📊 "*30)
-        print("PROCESSING HUMAN DECISION...")
-        print("📊 "*30)
+            # Process the human's decision
+            tracer.stage("Recovery")
+            print("\n" + "📊 "*30)
+            print("PROCESSING HUMAN DECISION...")
+            print("📊 "*30)
         
-        print(f"\n✅ Human Decision: {intervention_result['action']}")
+            if intervention_result.get('auto_resolved'):
+                print(f"\n⚡ Auto-resolved by {intervention_result['policy']} policy rule: "
+                      f"{intervention_result['action']}")
+            else:
+                print(f"\n✅ Human Decision: {intervention_result['action']}")
+            if intervention_result.get('timed_out'):
+                print(f"⏰ No response within {human_channel.timeout_seconds}s - applying default action")
         
-        if intervention_result['action'] == "alternative":
-            print(f"💡 Alternative Approach: {intervention_result['alternative_approach']}")
-            print("\n🔄 Continuing execution with alternative approach...")
+            if intervention_result['action'] == "alternative":
+                print(f"💡 Alternative Approach: {intervention_result['alternative_approach']}")
+                print("\n🔄 Continuing execution with alternative approach...")
             
-            # Simulate successful execution with alternative
-            tool_executor.force_failure = False
-            new_result = await tool_executor.execute_tool(
-                "google_scholar_search", 
-                {"query": "AI research papers"}
-            )
+                # Simulate successful execution with alternative
+                tool_executor.faults.heal()
+                new_result = await tool_executor.execute_tool(
+                    intervention_result.get('alternative_tool', "google_scholar_search"),
+                    {"query": "AI research papers"},
+                    session_id=session_id
+                )
             
-            if new_result["success"]:
-                print("\n🎉 SUCCESS! Query completed with alternative approach.")
-                print(f"Result: {new_result['result']}")
+                await journal.amark_outcome(intervention_result['journal_id'], new_result["success"])
+                if new_result["success"]:
+                    print("\n🎉 SUCCESS! Query completed with alternative approach.")
+                    print(f"Result: {new_result['result']}")
         
-        elif intervention_result['action'] == "retry":
-            print(f"🔄 Retrying with modifications: {intervention_result['modifications']}")
-            print("\n🔄 Attempting retry...")
+            elif intervention_result['action'] == "retry":
+                modifications = intervention_result.get('modifications')
+                print(f"🔄 Retrying with modifications: {modifications}")
+                print("\n🔄 Attempting retry...")
+            
+                # Re-dispatch the failed step with the human's parameter changes
+                tool_executor.faults.heal()
+                new_result = await tool_executor.execute_tool(
+                    failed_step["tool"],
+                    apply_modifications(failed_step["params"], modifications),
+                    session_id=session_id
+                )
+            
+                await journal.amark_outcome(intervention_result['journal_id'], new_result["success"])
+                if new_result["success"]:
+                    print("\n🎉 SUCCESS! Query completed after retry.")
+                    print(f"Result: {new_result['result']}")
+                else:
+                    print(f"\n❌ Retry failed: {new_result['error']}")
+        
+            elif intervention_result['action'] == "skip":
+                print("\n⏭️  Skipping failed step and continuing with next step...")
         
-        elif intervention_result['action'] == "skip":
-            print("\n⏭️  Skipping failed step and continuing with next step...")
+            elif intervention_result['action'] == "abort":
+                print("\n🛑 Execution aborted by human decision.")
         
-        elif intervention_result['action'] == "abort":
-            print("\n🛑 Execution aborted by human decision.")
+            # Show intervention summary
+            tracer.end_stage()
+            print("\n" + "📈 "*30)
+            print("INTERVENTION SUMMARY")
+            print("📈 "*30)
+            summary = human_handler.get_intervention_summary()
+            print(f"Total Interventions: {summary['total_interventions']}")
+            print(f"Intervention Types: {summary['intervention_types']}")
+            print(f"Success Rate: {summary['success_rate']*100:.1f}%")
         
-        # Show intervention summary
-        print("\n" + "📈 "*30)
-        print("INTERVENTION SUMMARY")
-        print("📈 "*30)
-        summary = human_handler.get_intervention_summary()
-        print(f"Total Interventions: {summary['total_interventions']}")
-        print(f"Intervention Types: {summary['intervention_types']}")
-        print(f"Success Rate: {summary['success_rate']*100:.1f}%")
+            journal_summary = journal.summary()
+            print(f"Journal ({journal.path}): {journal_summary['total_interventions']} interventions, "
+                  f"{journal_summary['success_rate']*100:.1f}% successful, by tool {journal_summary['tools']}, "
+                  f"{journal_summary['auto_resolved']} auto-resolved")
+            policy_stats = policy.stats()
+            print(f"Policy: {policy_stats['auto_resolved']} auto-resolved, {policy_stats['escalated']} escalated, "
+                  f"{policy_stats['rules']} rules")
+    finally:
+        await human_channel.close()
+        journal.close()  # Flushes queued writes and stops the journal thread
 
 
 async def demo_scenario_2_automated_suggestions():
@@ -185,49 +242,22 @@ async def demo_scenario_2_automated_suggestions():
     print("SCENARIO 2: Intelligent Suggestion System")
     print("🎬 "*30)
     
-    human_handler = HumanInLoopHandler(enable_suggestions=True)
-    
-    failure_scenarios = [
-        {
-            "name": "Code Execution Failure",
-            "step": {
-                "type": "CODE",
-                "description": "Execute Python code to analyze data"
-            },
-            "error": "SyntaxError: invalid syntax on line 42"
-        },
-        {
-            "name": "Search Tool Failure",
-            "step": {
-                "type": "TOOL_CALL",
-                "description": "Search for scientific papers in database"
-            },
-            "error": "SearchError: Database connection timeout"
-        },
-        {
-            "name": "Calculation Failure",
-            "step": {
-                "type": "CALCULATION",
-                "description": "Calculate statistical metrics for dataset"
-            },
-            "error": "ValueError: Input data format mismatch"
-        }
-    ]
-    
-    for scenario in failure_scenarios:
+    for scenario in FAILURE_SCENARIOS:
         print(f"\n{'='*60}")
         print(f"🔍 Testing: {scenario['name']}")
         print(f"{'='*60}")
         
-        context = InterventionContext(
-            intervention_type=InterventionType.TOOL_FAILURE,
+        # Only read by the suggestion engine, so the compact record suffices
+        context = ContextRecord.build(
+            intervention_type=InterventionKind.TOOL_FAILURE,
             original_query="Demo query for suggestion testing",
             failed_step=scenario["step"],
             error_message=scenario["error"],
             session_id="demo-suggestions"
         )
         
-        suggestions = human_handler._generate_tool_failure_suggestions(context)
+        # Rule index compiled once at import; repeated failures are memoized
+        suggestions = suggestion_engine.suggest_for(context, limit=5)
         
         print(f"Step Type: {scenario['step']['type']}")
         print(f"Error: {scenario['error']}")
@@ -235,7 +265,7 @@ async def demo_scenario_2_automated_suggestions():
         for i, suggestion in enumerate(suggestions, 1):
             print(f"  {i}. {suggestion}")
         
-        await asyncio.sleep(0.5)
+        await clock.sleep(0.5)
 
 
 async def demo_scenario_3_visual_flow():
@@ -271,7 +301,7 @@ async def demo_scenario_3_visual_flow():
     for i, step in enumerate(steps_to_visualize, 1):
         print(f"\n[{i:02d}] {step['status']} {step['name']}")
         print(f"     └─ {step['message']}")
-        await asyncio.sleep(0.8)
+        await clock.sleep(0.8)
     
     print("\n" + "🎉 "*30)
     print("WORKFLOW COMPLETE - HUMAN-IN-LOOP SUCCESSFUL!")
@@ -292,7 +322,7 @@ async def interactive_demo():
     print("\nThis will trigger a real tool failure and ask for your input.")
     print("You'll see exactly what happens during human intervention.")
     
-    proceed = input("\n▶️  Press Enter to start interactive demo (or 'skip' to skip): ")
+    proceed = await ainput("\n▶️  Press Enter to start interactive demo (or 'skip' to skip): ")
     
     if proceed.lower() == 'skip':
         print("⏭️  Skipping interactive demo...")
@@ -322,19 +352,19 @@ async def main():
     print("  4. 🔄 Recovery and continuation")
     print("  5. 📊 Performance tracking")
     
-    input("\n▶️  Press Enter to begin demo...")
+    await ainput("\n▶️  Press Enter to begin demo...")
     
     # Run demo scenarios
     try:
         # Scenario 1: Main tool failure demo
         await demo_scenario_1_tool_failure()
         
-        input("\n▶️  Press Enter to continue to Scenario 2...")
+        await ainput("\n▶️  Press Enter to continue to Scenario 2...")
         
         # Scenario 2: Show different suggestion types
         await demo_scenario_2_automated_suggestions()
         
-        input("\n▶️  Press Enter to continue to Scenario 3...")
+        await ainput("\n▶️  Press Enter to continue to Scenario 3...")
         
         # Scenario 3: Visual workflow
         await demo_scenario_3_visual_flow()
@@ -366,4 +396,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_from_env()
     asyncio.run(main())
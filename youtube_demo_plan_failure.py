@@ -9,138 +9,286 @@ This is more common with complex queries and shows the full power
 of human-in-loop intervention for strategic decision-making.
 
 Run with: python3 youtube_demo_plan_failure.py
+Instant replay (CI): DEMO_TIME_SCALE=0 python3 youtube_demo_plan_failure.py
+Streamed analysis only: python3 youtube_demo_plan_failure.py --stream
+Survive a restart: DEMO_CHECKPOINTS=checkpoints.db python3 youtube_demo_plan_failure.py,
+interrupt it, then rerun with --resume to continue from the last step boundary
 """
 
 import asyncio
-import time
-from typing import Dict, Any, List
+import os
+import sys
+from typing import Dict, Any, List, Optional
+from demo_checkpoint import CheckpointStore, SessionCheckpoint
+from demo_clock import SessionTimer, clock
+from demo_dag import PlanNode, PlanScheduler, ResultStore
+from demo_deadline import TIMEOUT_PER_STEP, bounded, deadline
+from demo_events import bus, EventKind
+from demo_faults import FaultInjector
+from demo_journal import InterventionJournal
+from demo_metrics import tool_metrics
+from demo_stream import open_stream, is_stream
+from demo_suggestions import suggestion_engine, history_note
+from demo_timeseries import WeatherStockPipeline
+from demo_tracing import install_from_env, tracer
+from demo_scenarios import (
+    PLAN_FAILURE_QUERY, INITIAL_PLAN, PLAN_FAILURE_STEPS, RECOVERY_PLAN, PLAN_RECOVERY_STEPS,
+    PLAN_STREAMING_STEPS, DATA_FORMAT_PLAN_FAILURE
+)
+
+
+SESSION_ID = "demo-plan-failure-001"
 
 
 class PlanExecutionSimulator:
-    """Simulates plan execution with ability to fail at the plan level"""
-    
-    def __init__(self):
+    """Simulates plan execution with ability to fail at the plan level
+    
+    A stage may return an async iterator of record batches instead of a
+    whole result. The step then completes with a bounded "stream" that
+    its dependents consume while the producer keeps running, so large
+    payloads never sit in memory in full.
+    
+    With a CheckpointStore, the session checkpoint is saved after every
+    step (see demo_checkpoint.py).
+    
+    A FaultInjector decides which steps fail (see demo_faults.py); by
+    default only steps scripted with ``will_fail`` do.
+    """
+    
+    def __init__(self, max_parallel: Optional[int] = None,
+                 pipeline: Optional[WeatherStockPipeline] = None, stream_buffer: int = 2,
+                 step_timeout: Optional[float] = TIMEOUT_PER_STEP,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 checkpoint: Optional[SessionCheckpoint] = None,
+                 faults: Optional[FaultInjector] = None):
         self.steps_completed = []
         self.steps_failed = []
-    
-    async def execute_step(self, step: Dict[str, Any], will_succeed: bool = True) -> Dict[str, Any]:
-        """Execute a single step"""
-        step_num = len(self.steps_completed) + len(self.steps_failed) + 1
-        
-        print(f"\n{'='*60}")
-        print(f"⚙️  EXECUTING STEP {step_num}: {step['description']}")
-        print(f"{'='*60}")
-        print(f"Type: {step['type']}")
-        print(f"Details: {step.get('details', 'N/A')}")
-        
-        # Simulate processing
-        for i in range(3):
-            print(f"{'.'* (i+1)} Processing", end='\r')
-            await asyncio.sleep(0.5)
+        self.steps_cancelled = []
+        self.steps_reused = []
+        self.results = ResultStore()
+        self.scheduler = PlanScheduler(max_parallel=max_parallel)
+        self.pipeline = pipeline or WeatherStockPipeline()
+        self.stream_buffer = stream_buffer
+        self.step_timeout = step_timeout
+        self.checkpoints = checkpoints
+        self.checkpoint = checkpoint or SessionCheckpoint(SESSION_ID)
+        self.restored_steps: List[str] = []
+        self.faults = faults or FaultInjector()
+        self.timer = SessionTimer()
+    
+    def restore(self, checkpoint: SessionCheckpoint, arrays: Dict[str, Any]):
+        """Continue from a checkpoint: its step results are bound, not re-run"""
+        self.checkpoint = checkpoint
+        self.results.update(checkpoint.results)
+        self.pipeline.restore(arrays)
+        self.restored_steps = list(checkpoint.completed_steps)
+        self.timer = SessionTimer(checkpoint.data.get("elapsed", 0.0))
+    
+    def save_checkpoint(self, phase: Optional[str] = None, **changes: Any):
+        """Save progress so far, optionally moving the session to a new phase"""
+        if self.checkpoints is None:
+            return
+        checkpoint = self.checkpoint
+        if phase is not None:
+            checkpoint.phase = phase
+        for name, value in changes.items():
+            setattr(checkpoint, name, value)
+        checkpoint.data["elapsed"] = self.timer.elapsed()  # Session time continues from here on resume
+        checkpoint.results = self.results.to_dict()
+        checkpoint.completed_steps = self.restored_steps + [
+            step['description'] for step in self.steps_completed
+            if step['description'] not in self.restored_steps
+        ]
+        self.checkpoints.save(checkpoint, arrays=self.pipeline.state())
+    
+    async def execute_step(self, step: Dict[str, Any], step_num: Optional[int] = None,
+                           inputs: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Execute a single step; ``inputs`` are upstream step results"""
+        if step_num is None:
+            step_num = len(self.steps_completed) + len(self.steps_failed) + 1
         
-        print(" " * 50, end='\r')  # Clear line
+        tool = str(step.get('tool', step['type']))
+        fault = self.faults.draw(tool, step)
+        will_succeed = not fault.failed
+        with tracer.span(tool, "tool", step=step['description']), tool_metrics.track(tool) as timer:
+            bus.emit(
+                EventKind.STEP_STARTED,
+                step_num=step_num,
+                description=step['description'],
+                type=step['type'],
+                details=step.get('details', 'N/A')
+            )
+            
+            output = None
+            stream = None
+            error_code = fault.error_code
+            failure_reason = fault.error or 'Unknown error'
+            streams = [r['stream'] for r in inputs or () if r and 'stream' in r]
+            with deadline(self.step_timeout):
+                try:
+                    async with bounded():
+                        # Simulate processing
+                        for i in range(3):
+                            bus.emit(EventKind.STEP_PROGRESS, step_num=step_num, tick=i + 1)
+                            await clock.sleep(0.5 * fault.latency_factor)
+                        
+                        # Steps with a "stage" run the real NumPy computation
+                        if step.get('stage'):
+                            output = await self.pipeline.arun(step['stage'], *streams)
+                except ValueError as e:
+                    will_succeed = False
+                    failure_reason = str(e)
+                except TimeoutError:
+                    will_succeed = False
+                    error_code = "TIMEOUT"
+                    failure_reason = "Step did not finish before its deadline"
+                except asyncio.CancelledError:
+                    await self._release(output, streams)
+                    raise
+            if not will_succeed:
+                # A failed step reads none of its streams: stop their producers
+                await self._release(output, streams)
+            elif is_stream(output):
+                stream = open_stream(output, maxsize=self.stream_buffer)
+                output = f"Streaming record batches (up to {self.stream_buffer} buffered)"
+            
+            timer.success = will_succeed
         
         if will_succeed:
-            print(f"✅ Step {step_num} COMPLETED")
+            bus.emit(EventKind.STEP_COMPLETED, step_num=step_num, description=step['description'],
+                     output=output)
             self.steps_completed.append(step)
-            return {"success": True, "result": step.get('expected_result', 'Success')}
+            result = {"success": True, "result": output or step.get('expected_result', 'Success')}
+            if stream is not None:
+                # A stream is consumed once, so it is never reused
+                result["stream"] = stream
+            else:
+                self.results.put(step, result)
+            self.save_checkpoint()
+            return result
         else:
-            print(f"❌ Step {step_num} FAILED")
-            print(f"Reason: {step.get('failure_reason', 'Unknown error')}")
+            bus.emit(EventKind.STEP_FAILED, step_num=step_num, description=step['description'],
+                     reason=failure_reason)
             self.steps_failed.append(step)
-            return {"success": False, "error": step.get('failure_reason', 'Step failed')}
+            result = {"success": False, "error": failure_reason}
+            if error_code:
+                result["error_code"] = error_code
+            self.save_checkpoint()
+            return result
+    
+    @staticmethod
+    async def _release(output: Any, streams: List[Any]):
+        """Stop upstream producers and close a stream output nobody will read"""
+        for upstream in streams:
+            upstream.cancel()
+        if hasattr(output, "aclose"):
+            await output.aclose()
+    
+    async def execute_plan(self, steps: List[Dict[str, Any]],
+                           timeout: Optional[float] = None) -> Dict[str, PlanNode]:
+        """Run a plan's steps as their dependencies allow (see demo_dag.py)
+        
+        Steps whose output is already in the result store are bound to
+        that output instead of being executed again. ``timeout`` is a
+        deadline for the whole plan; steps still running when it passes
+        fail with TIMEOUT and their dependents are cancelled.
+        """
+        async def run_node(node: PlanNode) -> Dict[str, Any]:
+            stored = self.results.get(node.step)
+            if stored is not None:
+                self.steps_reused.append(node.step)
+                bus.emit(EventKind.STEP_REUSED, step_num=node.step_num,
+                         description=node.step['description'], result=stored['result'])
+                return dict(stored, reused=True)
+            return await self.execute_step(node.step, step_num=node.step_num, inputs=node.inputs)
+        
+        def cancel_node(node: PlanNode):
+            self.steps_cancelled.append(node.step)
+            bus.emit(EventKind.STEP_CANCELLED, step_num=node.step_num,
+                     description=node.step['description'],
+                     failed_step_num=node.cancelled_by.step_num)
+        
+        with deadline(timeout):
+            nodes = await self.scheduler.run(steps, run_node, on_cancel=cancel_node)
+        for node in nodes.values():
+            # Streams whose consumers were cancelled (or never existed) are closed here
+            stream = (node.result or {}).get("stream")
+            if stream is not None:
+                stream.cancel()
+        return nodes
 
 
 async def show_banner(title: str):
     """Display a styled banner"""
-    border = "🎬 " * 30
-    print(f"\n{border}")
-    print(f"{title.center(180)}")
-    print(f"{border}\n")
+    bus.emit(EventKind.BANNER, title=title)
 
 
 async def show_section(section_name: str):
     """Display a section header"""
-    print(f"\n{'='*60}")
-    print(f"📋 {section_name}")
-    print(f"{'='*60}\n")
+    bus.emit(EventKind.SECTION, name=section_name)
 
 
-async def show_plan_failure_screen(query: str, current_plan: List[str], completed_steps: List[str], failure_reason: str):
-    """Display the plan failure intervention screen"""
-    print("\n" + "🚨 "*30)
-    print("PLAN FAILURE - HUMAN INTERVENTION REQUIRED".center(180))
-    print("🚨 "*30)
-    
-    print(f"\nSession ID: demo-plan-failure-001")
-    print(f"Original Query: {query}")
-    print(f"Failure Reason: {failure_reason}")
-    
-    await asyncio.sleep(1)
-    
-    print("\n📋 CURRENT PLAN (FAILED):")
-    for i, step in enumerate(current_plan, 1):
-        status = "✅" if i <= len(completed_steps) else "❌"
-        print(f"  {status} Step {i}: {step}")
-    
-    await asyncio.sleep(1)
-    
-    print(f"\n✅ COMPLETED STEPS: {len(completed_steps)}/{len(current_plan)}")
-    if completed_steps:
-        for step in completed_steps[-3:]:
-            print(f"  • {step}")
-    
-    await asyncio.sleep(1)
-    
-    print("\n💡 SUGGESTED ALTERNATIVE PLANS:")
-    suggestions = [
-        "Break the problem into smaller, more manageable sub-queries",
-        "Use a completely different approach with simpler tools",
-        "Gather prerequisite information first, then proceed",
-        "Switch to a hybrid manual-automated workflow"
-    ]
+async def show_plan_failure_screen(query: str, current_plan: List[str], completed_steps: List[str], failure_reason: str,
+                                   journal: Optional[InterventionJournal] = None) -> List[str]:
+    """Display the plan failure intervention screen; returns the suggestions, best first"""
+    bus.emit(
+        EventKind.INTERVENTION_REQUESTED,
+        session_id=SESSION_ID,
+        intervention_type="plan_failure",
+        query=query,
+        error=failure_reason
+    )
     
-    for i, suggestion in enumerate(suggestions, 1):
-        print(f"  {i}. {suggestion}")
-        await asyncio.sleep(0.3)
+    await clock.sleep(1)
+    
+    bus.emit(EventKind.PLAN_STATUS, current_plan=current_plan, completed_steps=completed_steps)
     
-    await asyncio.sleep(1)
+    await clock.sleep(2)
     
-    print("\n📝 AVAILABLE ACTIONS:")
-    print("  1. Provide completely new plan")
-    print("  2. Use suggested alternative plan")
-    print("  3. Modify current plan")
-    print("  4. Abort execution")
+    suggestions = suggestion_engine.suggest(failure_reason, intervention="plan_failure",
+                                            limit=4, stats=journal)
+    history = {}
+    if journal is not None:
+        history = journal.suggestion_stats(
+            suggestion_engine.signature(failure_reason, intervention="plan_failure"))
+    
+    for i, suggestion in enumerate(suggestions, 1):
+        bus.emit(EventKind.SUGGESTION_OFFERED, index=i, text=suggestion,
+                 heading="SUGGESTED ALTERNATIVE PLANS", history=history_note(history.get(suggestion)))
+        await clock.sleep(0.3)
+    
+    await clock.sleep(1)
+    
+    bus.emit(EventKind.ACTIONS_OFFERED, actions=[
+        "Provide completely new plan",
+        "Use suggested alternative plan",
+        "Modify current plan",
+        "Abort execution"
+    ])
+    return suggestions
 
 
-async def show_human_decision(choice: str, new_plan: List[str]):
+async def show_human_decision(choice: str, new_plan: List[str],
+                              rationale: str = "Simplify approach and break into atomic steps"):
     """Display human decision with thinking simulation"""
-    print("\n" + "👤 "*30)
-    print("HUMAN DECISION PROCESS".center(180))
-    print("👤 "*30)
-    
-    print("\n⏰ Analyzing failed plan...")
-    await asyncio.sleep(1.5)
+    with tracer.span("human_decision", "human"):
+        bus.emit(EventKind.HUMAN_DECIDING, message="Analyzing failed plan...")
+        await clock.sleep(1.5)
     
-    print(f"\n✅ Human Selected: Option {choice}")
-    print(f"💭 New Strategy: Simplify approach and break into atomic steps")
+    bus.emit(EventKind.HUMAN_DECIDED, choice=choice, label="New Strategy", rationale=rationale)
     
-    await asyncio.sleep(1)
+    await clock.sleep(1)
     
-    print("\n📋 NEW EXECUTION PLAN:")
-    for i, step in enumerate(new_plan, 1):
-        print(f"  {i}. {step}")
-        await asyncio.sleep(0.4)
+    bus.emit(EventKind.PLAN_REPLACED, new_plan=new_plan)
+    await clock.sleep(0.4 * len(new_plan))
 
 
-async def show_recovery_process():
+async def show_recovery_process(reusable_results: int = 0):
     """Display the recovery and continuation process"""
-    print("\n" + "🔄 "*30)
-    print("PLAN RECOVERY PROCESS INITIATED".center(180))
-    print("🔄 "*30)
+    bus.emit(EventKind.RECOVERY_STARTED, title="PLAN RECOVERY PROCESS INITIATED")
     
     steps = [
-        "Discarding failed plan...",
+        f"Discarding failed plan (keeping {reusable_results} completed step results)...",
         "Validating new approach...",
         "Simplifying complexity...",
         "Breaking into atomic steps...",
@@ -148,12 +296,12 @@ async def show_recovery_process():
     ]
     
     for step in steps:
-        print(f"\n⚙️  {step}")
-        await asyncio.sleep(0.8)
+        bus.emit(EventKind.RECOVERY_STEP, text=step)
+        await clock.sleep(0.8)
 
 
-async def main_demo():
-    """Main automated demo for plan failure"""
+async def show_introduction():
+    """Banner, scenario and the initial plan"""
     
     # Banner
     print("""
@@ -166,7 +314,7 @@ async def main_demo():
     ╚════════════════════════════════════════════════════════════════════════╝
     """)
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Introduction
     await show_banner("DEMO: COMPLEX QUERY WITH PLAN FAILURE")
@@ -185,12 +333,13 @@ async def main_demo():
     
     """)
     
-    await asyncio.sleep(3)
+    await clock.sleep(3)
     
     # Scenario Setup
+    tracer.stage("Perception")
     await show_section("SCENARIO: Complex Multi-Source Data Analysis")
     
-    query = "Analyze the correlation between weather patterns and stock market performance for tech companies in Q4 2024"
+    query = PLAN_FAILURE_QUERY
     
     print(f"🎯 User Query: {query}")
     print(f"\n🧠 This is a COMPLEX query requiring:")
@@ -199,153 +348,169 @@ async def main_demo():
     print(f"   • Time series processing")
     print(f"   • Statistical computation")
     
-    await asyncio.sleep(3)
+    await clock.sleep(3)
     
     # Initial Plan
+    tracer.stage("Decision")
     await show_section("INITIAL EXECUTION PLAN")
     
-    initial_plan = [
-        "Fetch weather data for all major tech company locations (Q4 2024)",
-        "Retrieve stock prices for top 50 tech companies (Q4 2024)",
-        "Perform correlation analysis between weather and stock movements",
-        "Generate statistical significance tests",
-        "Create visualization and summary report"
-    ]
+    initial_plan = INITIAL_PLAN
     
     print("📋 Agent Generated Plan:")
     for i, step in enumerate(initial_plan, 1):
         print(f"   Step {i}: {step}")
-        await asyncio.sleep(0.5)
-    
-    await asyncio.sleep(2)
-    
-    # Execution Phase
-    await show_section("EXECUTION PHASE")
-    
-    simulator = PlanExecutionSimulator()
-    
-    # Step 1 - Succeeds
-    step1 = {
-        "description": "Fetch weather data for major tech hubs",
-        "type": "API_CALL",
-        "details": "Querying weather APIs for SF, Seattle, Austin, NYC",
-        "expected_result": "Weather data retrieved for 4 locations"
-    }
-    await simulator.execute_step(step1, will_succeed=True)
-    await asyncio.sleep(1.5)
-    
-    # Step 2 - Succeeds
-    step2 = {
-        "description": "Retrieve stock prices for tech companies",
-        "type": "API_CALL",
-        "details": "Fetching Q4 2024 data for 50 companies",
-        "expected_result": "Stock price data retrieved"
-    }
-    await simulator.execute_step(step2, will_succeed=True)
-    await asyncio.sleep(1.5)
-    
-    # Step 3 - FAILS (Complex correlation analysis)
-    step3 = {
-        "description": "Perform correlation analysis",
-        "type": "COMPUTATION",
-        "details": "Cross-correlating weather patterns with stock movements",
-        "failure_reason": "Data dimensionality mismatch - weather data is hourly, stock data is daily. Cannot directly correlate without preprocessing."
-    }
-    result3 = await simulator.execute_step(step3, will_succeed=False)
-    await asyncio.sleep(2)
-    
-    # Plan Failure Detected
-    print("\n" + "⚠️ "*30)
-    print("CRITICAL: PLAN FAILURE DETECTED".center(180))
-    print("⚠️ "*30)
-    
-    print("\n❌ The current plan cannot continue:")
-    print("   • Step 3 failed due to data incompatibility")
-    print("   • Remaining steps depend on Step 3")
-    print("   • The ENTIRE PLAN strategy is flawed")
-    print("   • Simple retry won't work - need NEW APPROACH")
-    
-    await asyncio.sleep(3)
-    
-    # Human Intervention
-    await show_plan_failure_screen(
-        query=query,
-        current_plan=initial_plan,
-        completed_steps=[
+        await clock.sleep(0.5)
+    
+    await clock.sleep(2)
+
+
+async def main_demo(resume: bool = False):
+    """Main automated demo for plan failure
+    
+    With ``resume``, continues session SESSION_ID from its last
+    checkpoint in DEMO_CHECKPOINTS instead of starting over.
+    """
+    # DEMO_CHECKPOINTS=checkpoints.db keeps the session across restarts
+    checkpoints = CheckpointStore(os.environ.get("DEMO_CHECKPOINTS", ":memory:"))
+    checkpoint = checkpoints.load(SESSION_ID) if resume else None
+    if resume and checkpoint is None:
+        print(f"❌ No checkpoint for {SESSION_ID} in {checkpoints.path} (set DEMO_CHECKPOINTS)")
+        return
+    
+    simulator = PlanExecutionSimulator(checkpoints=checkpoints)
+    if checkpoint is None:
+        await show_introduction()
+        checkpoint = SessionCheckpoint(SESSION_ID, query=PLAN_FAILURE_QUERY, plan=list(INITIAL_PLAN))
+        simulator.checkpoint = checkpoint
+    else:
+        simulator.restore(checkpoint, checkpoints.arrays(SESSION_ID))
+        await show_section("RESUMING SESSION FROM CHECKPOINT")
+        print(f"♻️  {SESSION_ID}: phase '{checkpoint.phase}', "
+              f"{len(checkpoint.results)} completed step results restored")
+        for step in checkpoint.completed_steps:
+            print(f"   ✅ {step}")
+        await clock.sleep(2)
+    
+    query = checkpoint.query
+    initial_plan = INITIAL_PLAN
+    
+    if not checkpoint.reached("awaiting_human"):
+        # Execution Phase
+        tracer.stage("Action")
+        await show_section("EXECUTION PHASE")
+        simulator.save_checkpoint()
+        
+        # Steps 1-2 are independent and run in parallel; Step 3 FAILS
+        # (complex correlation analysis) and cancels Steps 4-5 that depend on it.
+        # After a restart, steps that already completed are bound, not re-run
+        print("⚡ Steps 1 and 2 are independent - running them in parallel")
+        await simulator.execute_plan(PLAN_FAILURE_STEPS)
+        await clock.sleep(2)
+        
+        # Plan Failure Detected
+        print("\n" + "⚠️ "*30)
+        print("CRITICAL: PLAN FAILURE DETECTED".center(180))
+        print("⚠️ "*30)
+        
+        print("\n❌ The current plan cannot continue:")
+        print("   • Step 3 failed due to data incompatibility")
+        print("   • Remaining steps depend on Step 3")
+        print("   • The ENTIRE PLAN strategy is flawed")
+        print("   • Simple retry won't work - need NEW APPROACH")
+        
+        await clock.sleep(3)
+    
+    # Human Intervention; journaled outcomes rank the suggested strategies
+    journal = InterventionJournal(os.environ.get("DEMO_JOURNAL", ":memory:"))
+    signature = suggestion_engine.signature(**DATA_FORMAT_PLAN_FAILURE)
+    # Session time (not this process's clock), so it still holds after a resume
+    failed_at = checkpoint.data.get("failed_at")
+    if failed_at is None:
+        failed_at = simulator.timer.elapsed()
+    
+    new_plan = RECOVERY_PLAN
+    if not checkpoint.reached("recovering"):
+        # A decision still pending when the process stopped is asked again
+        completed_steps = [
             "Weather data fetched (4 locations, hourly data)",
             "Stock prices retrieved (50 companies, daily data)"
-        ],
-        failure_reason="Data format incompatibility - cannot correlate hourly weather with daily stock data"
-    )
-    
-    await asyncio.sleep(3)
-    
-    # Human Decision
-    new_plan = [
-        "Aggregate hourly weather data to daily averages",
-        "Normalize both datasets to same time granularity",
-        "Perform simplified correlation on daily aggregates",
-        "Focus on major weather events vs stock volatility",
-        "Generate summary with caveats about data limitations"
-    ]
-    
-    await show_human_decision(choice="2", new_plan=new_plan)
-    
-    await asyncio.sleep(2)
-    
-    # Recovery
-    await show_recovery_process()
-    
-    await asyncio.sleep(2)
-    
-    # Execute New Plan
-    await show_section("EXECUTING NEW PLAN")
-    
-    print("🔄 Resuming with simplified, compatible approach...\n")
-    await asyncio.sleep(1)
-    
-    # New Step 1
-    new_step1 = {
-        "description": "Aggregate hourly weather to daily",
-        "type": "DATA_PROCESSING",
-        "details": "Converting hourly weather to daily averages",
-        "expected_result": "Daily weather aggregates created"
-    }
-    await simulator.execute_step(new_step1, will_succeed=True)
-    await asyncio.sleep(1)
-    
-    # New Step 2
-    new_step2 = {
-        "description": "Normalize datasets to daily granularity",
-        "type": "DATA_PROCESSING",
-        "details": "Aligning weather and stock data by date",
-        "expected_result": "Datasets normalized"
-    }
-    await simulator.execute_step(new_step2, will_succeed=True)
-    await asyncio.sleep(1)
-    
-    # New Step 3
-    new_step3 = {
-        "description": "Simplified correlation analysis",
-        "type": "COMPUTATION",
-        "details": "Daily correlation between weather and stock volatility",
-        "expected_result": "Correlation coefficients computed"
-    }
-    await simulator.execute_step(new_step3, will_succeed=True)
-    await asyncio.sleep(1)
+        ]
+        tracer.stage("Human Intervention", "human")
+        suggestions = await show_plan_failure_screen(
+            query=query,
+            current_plan=initial_plan,
+            completed_steps=completed_steps,
+            failure_reason=DATA_FORMAT_PLAN_FAILURE["error"],
+            journal=journal
+        )
+        simulator.save_checkpoint("awaiting_human", intervention={
+            "intervention_type": "plan_failure",
+            "failure_reason": DATA_FORMAT_PLAN_FAILURE["error"],
+            "completed_steps": completed_steps,
+            "suggestions": suggestions
+        }, data=dict(checkpoint.data, failed_at=failed_at))
+        
+        await clock.sleep(3)
+        
+        # Human Decision
+        chosen = suggestions[0]
+        await show_human_decision(choice="2", new_plan=new_plan, rationale=chosen)
+        simulator.save_checkpoint("recovering", plan=list(new_plan),
+                                  intervention=dict(checkpoint.intervention, decision=chosen))
+        
+        await clock.sleep(2)
+        
+        # Recovery
+        tracer.stage("Recovery")
+        await show_recovery_process(reusable_results=len(simulator.results))
+        
+        await clock.sleep(2)
+    else:
+        chosen = checkpoint.intervention["decision"]
+        print(f"👤 Human decision restored from checkpoint: {chosen}")
+    
+    if not checkpoint.reached("complete"):
+        # Execute New Plan
+        tracer.stage("Recovery")
+        await show_section("EXECUTING NEW PLAN")
+        
+        print("🔄 Resuming with simplified, compatible approach...\n")
+        await clock.sleep(1)
+        
+        # The data fetches are bound to their stored results; only the
+        # new preprocessing and analysis steps execute
+        nodes = await simulator.execute_plan(PLAN_RECOVERY_STEPS)
+        recovery_seconds = simulator.timer.elapsed() - failed_at
+        succeeded = sum(1 for node in nodes.values() if (node.result or {}).get("success"))
+        recovery_success_rate = succeeded / len(nodes)
+        await journal.arecord_suggestion_outcome(signature, chosen, succeeded == len(nodes), recovery_seconds)
+        simulator.save_checkpoint("complete", data=dict(checkpoint.data, recovery_seconds=recovery_seconds,
+                                                        recovery_success_rate=recovery_success_rate))
+        await clock.sleep(1)
+    else:
+        recovery_seconds = checkpoint.data["recovery_seconds"]
+        recovery_success_rate = checkpoint.data["recovery_success_rate"]
     
     # Success!
+    tracer.end_stage()
     print("\n" + "🎉 "*30)
     print("SUCCESS! QUERY COMPLETED WITH NEW PLAN".center(180))
     print("🎉 "*30)
     
+    analysis = simulator.pipeline.summary()
     print("\n✅ Analysis Results:")
-    print("   • Weak negative correlation (-0.23) found")
-    print("   • Extreme weather events show 15% higher volatility")
+    print(f"   • {analysis['strength'].capitalize()} correlation ({analysis['mean_correlation']:+.2f}) found "
+          f"across {analysis['pairs']} location/ticker pairs")
+    print(f"   • Strongest pair: {analysis['strongest_pair'][0]} / {analysis['strongest_pair'][1]} "
+          f"(r = {analysis['min_correlation']:+.2f}), computed in {analysis['compute_ms']:.1f} ms")
+    if analysis['extreme_weather'] is not None:
+        extreme_days, ratio = analysis['extreme_weather']
+        print(f"   • Extreme weather days ({extreme_days} of {analysis['days']}) show "
+              f"{abs(ratio - 1) * 100:.1f}% {'higher' if ratio >= 1 else 'lower'} return volatility")
     print("   • Results include data limitation caveats")
     print("   • Summary report generated successfully")
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Comparison
     await show_section("PLAN COMPARISON")
@@ -356,7 +521,7 @@ async def main_demo():
     print("   • Would have required complex interpolation")
     print("   • High risk of statistical errors")
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     print("\n✅ NEW PLAN (SUCCEEDED):")
     print("   • Preprocessed data to compatible format")
@@ -364,7 +529,7 @@ async def main_demo():
     print("   • Acknowledged limitations upfront")
     print("   • Achieved core objective with caveats")
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Workflow Visualization
     await show_section("COMPLETE WORKFLOW")
@@ -395,10 +560,10 @@ async def main_demo():
     for i, (status, stage, message) in enumerate(workflow_steps, 1):
         print(f"\n[{i:02d}] {status} {stage}")
         print(f"     └─ {message}")
-        await asyncio.sleep(0.6)
+        await clock.sleep(0.6)
     
     # Key Differences
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     await show_section("PLAN FAILURE vs TOOL FAILURE")
     
     print("🔧 TOOL FAILURE (Previous Demo):")
@@ -407,7 +572,7 @@ async def main_demo():
     print("   • Plan stays the same")
     print("   • Tactical decision")
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     print("\n📋 PLAN FAILURE (This Demo):")
     print("   • Entire strategy doesn't work")
@@ -415,21 +580,26 @@ async def main_demo():
     print("   • Requires strategic rethinking")
     print("   • More complex, happens with complex queries")
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Statistics
     await show_section("SESSION STATISTICS")
     
     print("📊 Intervention Summary:")
     print(f"   • Intervention Type: PLAN FAILURE")
-    print(f"   • Initial Plan Steps: 5")
-    print(f"   • Steps Completed Before Failure: 2")
-    print(f"   • New Plan Steps: 5")
-    print(f"   • New Plan Success Rate: 100%")
-    print(f"   • Total Recovery Time: ~15 seconds")
+    print(f"   • Initial Plan Steps: {len(initial_plan)}")
+    print(f"   • Steps Completed Before Failure: {len(checkpoint.intervention['completed_steps'])}")
+    print(f"   • New Plan Steps: {len(checkpoint.plan)}")
+    print(f"   • New Plan Success Rate: {recovery_success_rate * 100:.0f}%")
+    chosen_count, resolved, total_seconds = journal.suggestion_stats(signature)[chosen]
+    print(f"   • Total Recovery Time: {recovery_seconds:.0f} seconds "
+          f"(journaled runs of this strategy: {resolved}/{chosen_count} resolved, "
+          f"mean {total_seconds / chosen_count:.0f}s)")
     print(f"   • Final Status: ✅ SUCCESSFUL")
+    journal.close()
+    checkpoints.close()
     
-    await asyncio.sleep(2)
+    await clock.sleep(2)
     
     # Conclusion
     print("\n\n" + "🎬 "*30)
@@ -461,9 +631,29 @@ async def main_demo():
     """)
 
 
-if __name__ == "__main__":
-    print("\n🎥 Starting Plan Failure demo in 3 seconds...")
-    print("📹 Recording tip: This demo shows MORE COMMON failure scenario!\n")
-    time.sleep(3)
+async def streaming_demo():
+    """Run the recovery analysis as streamed record batches"""
+    await show_section("STREAMED ANALYSIS (bounded memory)")
+    
+    pipeline = WeatherStockPipeline()
+    simulator = PlanExecutionSimulator(pipeline=pipeline)
+    await simulator.execute_plan(PLAN_STREAMING_STEPS)
     
-    asyncio.run(main_demo())
+    analysis = pipeline.summary()
+    print(f"\n✅ {analysis['pairs']} location/ticker pairs over {analysis['days']} trading days, "
+          f"mean r = {analysis['mean_correlation']:+.2f} ({analysis['strength']})")
+
+
+if __name__ == "__main__":
+    install_from_env()
+    if "--stream" in sys.argv:
+        asyncio.run(streaming_demo())
+        sys.exit(0)
+    
+    resume = "--resume" in sys.argv
+    if not resume:
+        print("\n🎥 Starting Plan Failure demo in 3 seconds...")
+        print("📹 Recording tip: This demo shows MORE COMMON failure scenario!\n")
+        clock.sleep_sync(3)
+    
+    asyncio.run(main_demo(resume=resume))